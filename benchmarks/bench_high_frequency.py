@@ -0,0 +1,199 @@
+"""high-frequency polling benchmark for the sma_data_manager package.
+
+runs a fake SMA Data Manager in a separate process and polls it with the high-frequency poller
+for a while, reporting the achieved poll rate, the jitter of the poll times, skipped ticks
+and the CPU time used by the polling process.
+the CPU time per poll of the prepared query is compared with the regular live measurements query.
+
+usage: python3 benchmarks/bench_high_frequency.py [--interval S] [--duration S] [--channels N] [--polls N]
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from custom_components.sma_data_manager.sma.client import SMAApiClient  # noqa: E402
+from custom_components.sma_data_manager.sma.model import LiveMeasurementQueryItem  # noqa: E402
+from custom_components.sma_data_manager.sma.poller import HighFrequencyPoller  # noqa: E402
+
+
+def run_fake_device(port: int) -> None:
+    """Serve the token and live measurements endpoints of a SMA Data Manager."""
+
+    async def token(request: web.Request) -> web.Response:
+        response = web.json_response(
+            {
+                "access_token": "access-token",
+                "refresh_token": "refresh-token",
+                "token_type": "bearer",
+                "expires_in": 3600,
+            }
+        )
+        response.set_cookie("JSESSIONID", "session-id")
+        return response
+
+    async def live(request: web.Request) -> web.Response:
+        query = await request.json()
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return web.json_response(
+            [
+                {
+                    "channelId": item["channelId"],
+                    "componentId": item["componentId"],
+                    "values": [{"time": now, "value": time.time() % 1000}],
+                }
+                for item in query
+            ]
+        )
+
+    app = web.Application()
+    app.router.add_post("/api/v1/token", token)
+    app.router.add_post("/api/v1/measurements/live", live)
+    web.run_app(app, host="127.0.0.1", port=port, print=None)
+
+
+def start_fake_device() -> tuple[subprocess.Popen, int]:
+    """Start the fake device in a subprocess and wait until it accepts connections."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen([sys.executable, __file__, "--serve", str(port)])
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return (process, port)
+        except OSError:
+            time.sleep(0.1)
+
+    process.kill()
+    raise RuntimeError("fake device did not start")
+
+
+def create_query(channels: int) -> list[LiveMeasurementQueryItem]:
+    """Create a query of grid channels."""
+    return [
+        LiveMeasurementQueryItem(
+            component_id="Plant:1", channel_id=f"Measurement.GridMs.W.phs{i}"
+        )
+        for i in range(channels)
+    ]
+
+
+async def measure_poller(
+    client: SMAApiClient, query: list, interval: float, duration: float
+) -> dict:
+    """Run the high-frequency poller for a while."""
+    arrivals = []
+    poller = HighFrequencyPoller(
+        client=client,
+        query=query,
+        interval=interval,
+        on_values=lambda values: arrivals.append(time.monotonic()),
+    )
+
+    wall_start = time.monotonic()
+    cpu_start = time.process_time()
+    poller.start()
+    await asyncio.sleep(duration)
+    await poller.stop()
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    gaps = [b - a for (a, b) in zip(arrivals, arrivals[1:])]
+    return {
+        "polls": poller.polls,
+        "rate": poller.polls / wall,
+        "jitter": statistics.pstdev(gaps) if len(gaps) > 1 else 0,
+        "skipped": poller.skipped_ticks,
+        "errors": poller.errors,
+        "cpu": cpu / wall,
+    }
+
+
+async def measure_poll_cpu(client: SMAApiClient, query: list, polls: int) -> dict:
+    """Measure the CPU time per poll of the regular and the prepared query, polling back to back."""
+    prepared = client.prepare_live_measurements(query)
+
+    async def _regular() -> None:
+        await client.login()
+        await client.get_live_measurements(query)
+
+    async def _prepared() -> None:
+        if client.needs_login:
+            await client.login()
+        await client.get_prepared_live_measurements(prepared)
+
+    results = {}
+    for name, poll in (("regular", _regular), ("prepared", _prepared)):
+        await poll()
+        start = time.process_time()
+        for _ in range(polls):
+            await poll()
+        results[name] = (time.process_time() - start) / polls
+    return results
+
+
+async def run(args: argparse.Namespace, port: int) -> None:
+    """Run the benchmark against the fake device."""
+    async with aiohttp.ClientSession() as session:
+        client = SMAApiClient(
+            host=f"127.0.0.1:{port}",
+            username="user",
+            password="password",
+            session=session,
+            use_ssl=False,
+        )
+        await client.login()
+        query = create_query(args.channels)
+
+        result = await measure_poller(client, query, args.interval, args.duration)
+        cpu = await measure_poll_cpu(client, query, args.polls)
+
+    print(  # noqa: T201
+        f"high-frequency poller, {args.channels} channels every {args.interval} s for {args.duration} s:"
+    )
+    print(f"  polls:              {result['polls']:8d} ({result['errors']} errors)")  # noqa: T201
+    print(f"  achieved rate:      {result['rate']:8.2f} Hz")  # noqa: T201
+    print(f"  jitter (stdev):     {result['jitter'] * 1000:8.2f} ms")  # noqa: T201
+    print(f"  skipped ticks:      {result['skipped']:8d}")  # noqa: T201
+    print(f"  process CPU:        {result['cpu'] * 100:8.2f} %")  # noqa: T201
+    print(f"CPU time per poll, {args.polls} back-to-back polls:")  # noqa: T201
+    print(f"  regular query:      {cpu['regular'] * 1_000_000:8.0f} us")  # noqa: T201
+    print(f"  prepared query:     {cpu['prepared'] * 1_000_000:8.0f} us")  # noqa: T201
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve is not None:
+        run_fake_device(args.serve)
+        return
+
+    (process, port) = start_fake_device()
+    try:
+        asyncio.run(run(args, port))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
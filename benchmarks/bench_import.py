@@ -0,0 +1,164 @@
+"""import-time benchmark for the sma_data_manager package.
+
+measures, in fresh interpreters, how long importing the integration package takes
+and how much of that is spent in the known channels module.
+loading the known channels table is measured separately, since it is deferred
+to the first lookup and no longer part of the import path.
+
+as a baseline, the known channels module of the last revision that defined the table
+as a python dict literal is taken from git and imported the same way.
+
+usage: python3 benchmarks/bench_import.py [--runs N] [--baseline REV]
+"""
+import argparse
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PACKAGE = "custom_components.sma_data_manager"
+KNOWN_CHANNELS_MODULE = f"{PACKAGE}.sma.known_channels"
+KNOWN_CHANNELS_PATH = "custom_components/sma_data_manager/sma/known_channels.py"
+
+# last revision with the known channels table as a python dict literal
+BASELINE_REV = "988d920^"
+BASELINE_MODULE = "baseline_known_channels"
+
+
+def run_python(
+    code: str, *args: str, env: dict[str, str] | None = None
+) -> subprocess.CompletedProcess:
+    """Run python code in a fresh interpreter in the repository root."""
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+
+def parse_import_us(stderr: str, prefix: str) -> dict[str, tuple[int, int]]:
+    """Parse the output of -X importtime.
+
+    :return: dict of module name to (self_us, cumulative_us) for all modules starting with prefix
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [part.strip() for part in line[len("import time:") :].split("|")]
+        if len(parts) != 3 or not parts[0].isdigit():
+            continue
+        module = parts[2].strip()
+        if module.startswith(prefix):
+            times[module] = (int(parts[0]), int(parts[1]))
+    return times
+
+
+def measure_import_us() -> dict[str, tuple[int, int]]:
+    """Import the package once with -X importtime.
+
+    :return: dict of module name to (self_us, cumulative_us) for all modules of the package
+    """
+    result = run_python(f"import {PACKAGE}.sensor", "-X", "importtime")
+    return parse_import_us(result.stderr, PACKAGE)
+
+
+def measure_baseline_import_us(baseline_dir: Path) -> int:
+    """Import the baseline known channels module once with -X importtime.
+
+    :return: self time of the module import
+    """
+    env = dict(os.environ, PYTHONPATH=str(baseline_dir))
+    result = run_python(f"import {BASELINE_MODULE}", "-X", "importtime", env=env)
+    return parse_import_us(result.stderr, BASELINE_MODULE)[BASELINE_MODULE][0]
+
+
+def measure_table_load_us() -> int:
+    """Measure the first (lazy) load of the known channels table."""
+    result = run_python(
+        f"""
+import time
+from {KNOWN_CHANNELS_MODULE} import get_known_channel
+start = time.perf_counter()
+get_known_channel("Measurement.GridMs.TotW")
+print(int((time.perf_counter() - start) * 1_000_000))
+"""
+    )
+    return int(result.stdout.strip())
+
+
+def write_baseline_module(rev: str, directory: Path) -> None:
+    """Write the known channels module of a revision as a standalone module, and compile it.
+
+    the baseline module only depends on the standard library, so it can be imported on its own.
+    it is compiled once, so the measured imports load the cached bytecode like the package does.
+    """
+    source = subprocess.run(
+        ["git", "show", f"{rev}:{KNOWN_CHANNELS_PATH}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    (directory / f"{BASELINE_MODULE}.py").write_text(source, encoding="utf-8")
+    env = dict(os.environ, PYTHONPATH=str(directory))
+    run_python(f"import {BASELINE_MODULE}", env=env)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_REV,
+        help="git revision with the dict literal known channels module",
+    )
+    args = parser.parse_args()
+
+    package_us = []
+    known_channels_us = []
+    table_load_us = []
+    baseline_us = []
+    with tempfile.TemporaryDirectory() as baseline_dir:
+        write_baseline_module(args.baseline, Path(baseline_dir))
+        for _ in range(args.runs):
+            times = measure_import_us()
+            package_us.append(times[PACKAGE][1])
+            known_channels_us.append(times[KNOWN_CHANNELS_MODULE][0])
+            table_load_us.append(measure_table_load_us())
+            baseline_us.append(measure_baseline_import_us(Path(baseline_dir)))
+
+    def _median_ms(values: list[int]) -> float:
+        return statistics.median(values) / 1000
+
+    def _ms(values: list[int]) -> str:
+        return f"{_median_ms(values):8.2f} ms"
+
+    saving_ms = _median_ms(baseline_us) - _median_ms(known_channels_us)
+    package_ms = _median_ms(package_us)
+
+    print(f"median of {args.runs} runs:")  # noqa: T201
+    print(f"  import {PACKAGE} (cumulative):      {_ms(package_us)}")  # noqa: T201
+    print(f"  import known_channels (self):       {_ms(known_channels_us)}")  # noqa: T201
+    print(f"  known channels table load (lazy):   {_ms(table_load_us)}")  # noqa: T201
+    print(f"baseline ({args.baseline}, dict literal):")  # noqa: T201
+    print(f"  import known_channels (self):       {_ms(baseline_us)}")  # noqa: T201
+    print(  # noqa: T201
+        f"  saved at import: {saving_ms:.2f} ms, "
+        f"{saving_ms / package_ms:.2%} of the package import."
+    )
+    print(  # noqa: T201
+        f"  saved including the first lookup: {saving_ms - _median_ms(table_load_us):.2f} ms."
+    )
+
+
+if __name__ == "__main__":
+    main()
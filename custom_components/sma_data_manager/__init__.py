@@ -1,10 +1,12 @@
 """SMA Data Manager M integration for Home Assistant."""
 from __future__ import annotations
+import asyncio
+from collections.abc import Awaitable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import device_registry as dr
 
 from .const import (
     LOGGER,
@@ -14,24 +16,92 @@ from .const import (
     CONF_PASSWORD,
     CONF_USE_SSL,
     CONF_VERIFY_SSL,
+    LOGOUT_TIMEOUT,
     OPT_SENSOR_CHANNELS,
     OPT_REQUEST_TIMEOUT,
     OPT_UPDATE_INTERVAL,
     OPT_REQUEST_RETIRES,
+    OPT_RESTORE_ON_STARTUP,
+    OPT_CATALOGUE_TTL,
+    OPT_SLOW_UPDATE_INTERVAL,
+    OPT_CHANNEL_TIERS,
+    OPT_ADAPTIVE_POLLING,
+    OPT_MIN_UPDATE_INTERVAL,
+    OPT_MAX_UPDATE_INTERVAL,
+    OPT_SUN_AWARE_POLLING,
+    OPT_SUN_ELEVATION_MARGIN,
+    OPT_NIGHT_UPDATE_INTERVAL,
+    OPT_ALIGNED_POLLING,
+    OPT_HIGH_FREQUENCY_CHANNELS,
+    OPT_HIGH_FREQUENCY_INTERVAL,
+    OPT_HEDGED_REQUESTS,
+    OPT_RATE_LIMIT,
+    OPT_RATE_LIMIT_BURST,
     DEFAULT_UPDATE_INTERVAL,
     DEFAULT_REQUEST_TIMEOUT,
     DEFAULT_REQUEST_RETIRES,
+    DEFAULT_RESTORE_ON_STARTUP,
+    DEFAULT_CATALOGUE_TTL,
+    DEFAULT_SLOW_UPDATE_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_SUN_AWARE_POLLING,
+    DEFAULT_SUN_ELEVATION_MARGIN,
+    DEFAULT_NIGHT_UPDATE_INTERVAL,
+    DEFAULT_ALIGNED_POLLING,
+    DEFAULT_HIGH_FREQUENCY_INTERVAL,
+    DEFAULT_HEDGED_REQUESTS,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST,
 )
 from .coordinator import SMAUpdateCoordinator
-from .util import SMAEntryData
+from .session import (
+    async_get_host_limiter,
+    async_get_host_session,
+    async_release_host,
+)
+from .storage import SMASessionStore, SMASnapshotStore, SMATopologyStore
+from .util import SMAEntryData, component_device_id
 
+from .sma.adaptive import ChangeRateAdapter
+from .sma.catalogue import ChannelCatalogueCache
 from .sma.client import SMAApiClient
+from .sma.deadline import deadline
+from .sma.hedging import RequestHedger
+from .sma.known_channels import load_known_channels
+from .sma.model import ComponentInfo, SMAApiClientError, SMAApiParsingError
+from .sma.sun import DaylightWindow
 
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
 ]
 
+# options that can be applied to a running entry without reloading it
+INCREMENTAL_OPTIONS = {
+    OPT_SENSOR_CHANNELS,
+    OPT_UPDATE_INTERVAL,
+    OPT_REQUEST_TIMEOUT,
+    OPT_REQUEST_RETIRES,
+    OPT_RESTORE_ON_STARTUP,
+    OPT_CATALOGUE_TTL,
+    OPT_SLOW_UPDATE_INTERVAL,
+    OPT_CHANNEL_TIERS,
+    OPT_ADAPTIVE_POLLING,
+    OPT_MIN_UPDATE_INTERVAL,
+    OPT_MAX_UPDATE_INTERVAL,
+    OPT_SUN_AWARE_POLLING,
+    OPT_SUN_ELEVATION_MARGIN,
+    OPT_NIGHT_UPDATE_INTERVAL,
+    OPT_ALIGNED_POLLING,
+    OPT_HIGH_FREQUENCY_CHANNELS,
+    OPT_HIGH_FREQUENCY_INTERVAL,
+    OPT_HEDGED_REQUESTS,
+    OPT_RATE_LIMIT,
+    OPT_RATE_LIMIT_BURST,
+}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Integration entry setup."""
@@ -45,43 +115,128 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         host=entry.data[CONF_HOST],
         username=entry.data[CONF_USERNAME],
         password=entry.data[CONF_PASSWORD],
-        session=async_get_clientsession(
-            hass=hass, verify_ssl=entry.data[CONF_VERIFY_SSL]
+        session=async_get_host_session(
+            hass, entry.data[CONF_HOST], entry.data[CONF_VERIFY_SSL]
         ),
         use_ssl=entry.data[CONF_USE_SSL],
         request_timeout=entry.options.get(OPT_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT),
         request_retries=entry.options.get(OPT_REQUEST_RETIRES, DEFAULT_REQUEST_RETIRES),
         logger=LOGGER,
+        rate_limiter=async_get_host_limiter(hass, entry.data[CONF_HOST]),
     )
+    _set_request_hedging(client, entry.options)
+    _configure_rate_limit(client, entry.options)
 
-    # get component info from SMA client once
-    await client.login()
-    all_components = await client.get_all_components()
-    #await client.logout()
+    # continue the device session of the last run, so startup can refresh the token
+    # instead of logging in with username and password
+    session_store = SMASessionStore(hass, entry.entry_id)
+    if (session := await session_store.async_load()) is not None:
+        try:
+            client.restore_session(session)
+        except SMAApiParsingError as exception:
+            LOGGER.warning("ignoring invalid stored session: %s", exception)
+    client.on_session_changed = lambda: session_store.async_delay_save(
+        client.export_session
+    )
+
+    # log out when the entry is unloaded, reloaded or its setup fails, so no session is left behind.
+    # on_unload callbacks run last-in first-out, so this runs after everything else using the client stopped
+    entry.async_on_unload(
+        lambda: entry.async_create_task(hass, _async_close_client(hass, client))
+    )
+
+    # get component info from the topology cache.
+    # cached component info is revalidated in the background once setup is done
+    topology_store = SMATopologyStore(hass, entry.entry_id)
+    all_components = await topology_store.async_load()
+    revalidate_topology = all_components is not None
 
     # initialize coordinator
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+    # default poll tiers come from the known channels, load them outside the event loop
+    await hass.async_add_executor_job(load_known_channels)
+    channel_fqids = entry.options.get(OPT_SENSOR_CHANNELS, [])
+    snapshot_store = (
+        SMASnapshotStore(hass, entry.entry_id)
+        if entry.options.get(OPT_RESTORE_ON_STARTUP, DEFAULT_RESTORE_ON_STARTUP)
+        else None
+    )
     coordinator = SMAUpdateCoordinator(
         hass=hass,
         client=client,
-        channel_fqids=entry.options.get(OPT_SENSOR_CHANNELS, []),
+        channel_fqids=channel_fqids,
         update_interval_seconds=entry.options.get(
             OPT_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
         ),
+        snapshot_store=snapshot_store,
+        slow_update_interval_seconds=entry.options.get(
+            OPT_SLOW_UPDATE_INTERVAL, DEFAULT_SLOW_UPDATE_INTERVAL
+        ),
+        channel_tier_overrides=entry.options.get(OPT_CHANNEL_TIERS, {}),
+        change_rate_adapter=_create_change_rate_adapter(entry.options),
+        daylight_window=_create_daylight_window(hass, entry.options),
+        night_update_interval=entry.options.get(
+            OPT_NIGHT_UPDATE_INTERVAL, DEFAULT_NIGHT_UPDATE_INTERVAL
+        ),
+        aligned_polling=entry.options.get(
+            OPT_ALIGNED_POLLING, DEFAULT_ALIGNED_POLLING
+        ),
+        high_frequency_fqids=entry.options.get(OPT_HIGH_FREQUENCY_CHANNELS, []),
+        high_frequency_interval=entry.options.get(
+            OPT_HIGH_FREQUENCY_INTERVAL, DEFAULT_HIGH_FREQUENCY_INTERVAL
+        ),
+    )
+
+    # restore the last-known values if enabled and available, and fetch live data in the background.
+    # otherwise, fetch initial data so we have data when entities initialize
+    snapshot = (
+        await snapshot_store.async_load(channel_fqids)
+        if snapshot_store is not None
+        else None
     )
+    if snapshot is not None:
+        coordinator.restore_snapshot(snapshot)
+        refresh_task = hass.async_create_task(coordinator.async_refresh())
+        entry.async_on_unload(refresh_task.cancel)
+
+        if all_components is None:
+            all_components = await _async_discover_topology(client, topology_store)
+    elif all_components is None:
+        # nothing cached, discover topology while fetching initial data.
+        # both share a single login, the first refresh only needs the selected channel fqids
+        await client.login()
+        (all_components, _) = await _async_gather_or_cancel(
+            _async_discover_topology(client, topology_store),
+            coordinator.async_config_entry_first_refresh(),
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     # store coordinator in hass data
     hass.data[DOMAIN][entry.entry_id] = SMAEntryData(
+        client=client,
         coordinator=coordinator,
         all_components=all_components,
+        applied_data=dict(entry.data),
+        applied_options=dict(entry.options),
+        catalogue_cache=ChannelCatalogueCache(
+            ttl=entry.options.get(OPT_CATALOGUE_TTL, DEFAULT_CATALOGUE_TTL)
+        ),
     )
 
-    # fetch initial data so we have data when entities initialize
-    await coordinator.async_config_entry_first_refresh()
-
     # setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    # poll high-frequency channels once their entities exist
+    coordinator.async_start_high_frequency()
+    entry.async_on_unload(coordinator.async_stop_high_frequency)
+
+    if revalidate_topology:
+        revalidate_task = hass.async_create_task(
+            _async_revalidate_topology(hass, entry, client, topology_store)
+        )
+        entry.async_on_unload(revalidate_task.cancel)
     return True
 
 
@@ -93,7 +248,207 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle removal of integration entry, remove persisted data."""
+    await SMATopologyStore(hass, entry.entry_id).async_remove()
+    await SMASnapshotStore(hass, entry.entry_id).async_remove()
+    await SMASessionStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload integration entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Apply changed options to the running entry, or reload integration entry if that is not possible."""
+    entry_data: SMAEntryData | None = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is not None and await _async_apply_options(hass, entry, entry_data):
+        return
+
+    LOGGER.info("reloading SMA data manager integration")
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_apply_options(
+    hass: HomeAssistant, entry: ConfigEntry, entry_data: SMAEntryData
+) -> bool:
+    """Apply changed options in place, keeping the authenticated client and existing entities.
+
+    :return: True if all changes were applied, False if the entry has to be reloaded.
+    """
+    if dict(entry.data) != entry_data.applied_data:
+        return False
+
+    new_options = dict(entry.options)
+    old_options = entry_data.applied_options
+    changed_options = {
+        key
+        for key in old_options.keys() | new_options.keys()
+        if old_options.get(key) != new_options.get(key)
+    }
+    if not changed_options.issubset(INCREMENTAL_OPTIONS):
+        return False
+
+    LOGGER.info("applying changed options in place: %s", ", ".join(changed_options))
+    entry_data.applied_options = new_options
+
+    client = entry_data.client
+    client.request_timeout = new_options.get(
+        OPT_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+    )
+    client.request_retries = new_options.get(
+        OPT_REQUEST_RETIRES, DEFAULT_REQUEST_RETIRES
+    )
+    _set_request_hedging(client, new_options)
+    _configure_rate_limit(client, new_options)
+
+    entry_data.catalogue_cache.ttl = new_options.get(
+        OPT_CATALOGUE_TTL, DEFAULT_CATALOGUE_TTL
+    )
+
+    coordinator = entry_data.coordinator
+    coordinator.snapshot_store = (
+        SMASnapshotStore(hass, entry.entry_id)
+        if new_options.get(OPT_RESTORE_ON_STARTUP, DEFAULT_RESTORE_ON_STARTUP)
+        else None
+    )
+
+    # the sensor platform adds and removes entities on the coordinator update
+    # following the refresh with the new channel selection
+    if OPT_SENSOR_CHANNELS in changed_options:
+        coordinator.set_channels(new_options.get(OPT_SENSOR_CHANNELS, []))
+    coordinator.set_tiers(
+        new_options.get(OPT_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        new_options.get(OPT_SLOW_UPDATE_INTERVAL, DEFAULT_SLOW_UPDATE_INTERVAL),
+        new_options.get(OPT_CHANNEL_TIERS, {}),
+    )
+    coordinator.set_change_rate_adapter(_create_change_rate_adapter(new_options))
+    coordinator.set_daylight_window(
+        _create_daylight_window(hass, new_options),
+        new_options.get(OPT_NIGHT_UPDATE_INTERVAL, DEFAULT_NIGHT_UPDATE_INTERVAL),
+    )
+    coordinator.set_aligned_polling(
+        new_options.get(OPT_ALIGNED_POLLING, DEFAULT_ALIGNED_POLLING)
+    )
+    coordinator.set_high_frequency(
+        new_options.get(OPT_HIGH_FREQUENCY_CHANNELS, []),
+        new_options.get(OPT_HIGH_FREQUENCY_INTERVAL, DEFAULT_HIGH_FREQUENCY_INTERVAL),
+    )
+    await coordinator.async_refresh()
+    coordinator.async_start_high_frequency()
+    return True
+
+
+async def _async_close_client(hass: HomeAssistant, client: SMAApiClient) -> None:
+    """Log the client out of the device, without waiting long for an unreachable device.
+
+    afterwards, the HTTP session of the host is closed if no other entry uses it.
+    """
+    with deadline(LOGOUT_TIMEOUT):
+        await client.close()
+    await async_release_host(hass, client.host)
+
+
+def _set_request_hedging(client: SMAApiClient, options: dict) -> None:
+    """Enable or disable hedging of live measurement requests, keeping the learned latency if it stays enabled."""
+    if not options.get(OPT_HEDGED_REQUESTS, DEFAULT_HEDGED_REQUESTS):
+        client.hedger = None
+    elif client.hedger is None:
+        client.hedger = RequestHedger()
+
+
+def _configure_rate_limit(client: SMAApiClient, options: dict) -> None:
+    """Configure the rate limiter of the host, which is shared with all other clients of the host."""
+    client.rate_limiter.configure(
+        rate=options.get(OPT_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        burst=options.get(OPT_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_BURST),
+    )
+
+
+def _create_change_rate_adapter(options: dict) -> ChangeRateAdapter | None:
+    """Create the change rate adapter for adaptive polling, or None if it is disabled."""
+    if not options.get(OPT_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+        return None
+    return ChangeRateAdapter(
+        min_interval=options.get(OPT_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL),
+        max_interval=options.get(OPT_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+    )
+
+
+def _create_daylight_window(
+    hass: HomeAssistant, options: dict
+) -> DaylightWindow | None:
+    """Create the daylight window of sun-aware polling at the home location, or None if it is disabled."""
+    if not options.get(OPT_SUN_AWARE_POLLING, DEFAULT_SUN_AWARE_POLLING):
+        return None
+    return DaylightWindow(
+        latitude=hass.config.latitude,
+        longitude=hass.config.longitude,
+        margin=options.get(OPT_SUN_ELEVATION_MARGIN, DEFAULT_SUN_ELEVATION_MARGIN),
+    )
+
+
+async def _async_discover_topology(
+    client: SMAApiClient, topology_store: SMATopologyStore
+) -> list[ComponentInfo]:
+    """Discover the plant topology and save it to the topology cache."""
+    await client.login()
+    all_components = await client.get_all_components()
+    await topology_store.async_save(all_components)
+    return all_components
+
+
+async def _async_gather_or_cancel(*awaitables: Awaitable) -> list:
+    """Run awaitables concurrently, cancelling the remaining ones if one fails.
+
+    :return: the results, in the order of the awaitables
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except Exception:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def _async_revalidate_topology(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    client: SMAApiClient,
+    topology_store: SMATopologyStore,
+) -> None:
+    """Re-discover the plant topology and update cache and devices if it changed."""
+    entry_data: SMAEntryData = hass.data[DOMAIN][entry.entry_id]
+
+    try:
+        await client.login()
+        all_components = await client.get_all_components()
+    except SMAApiClientError as exception:
+        LOGGER.warning("failed to revalidate cached plant topology: %s", exception)
+        return
+
+    cached = {c.component_id: c.to_dict() for c in entry_data.all_components}
+    discovered = {c.component_id: c.to_dict() for c in all_components}
+    if cached == discovered:
+        LOGGER.debug("cached plant topology is up to date")
+        return
+
+    LOGGER.info("plant topology or firmware changed, updating cached components")
+    entry_data.all_components = all_components
+    await topology_store.async_save(all_components)
+
+    # update device info of devices whose component changed
+    device_registry = dr.async_get(hass)
+    for component in all_components:
+        if cached.get(component.component_id) == discovered[component.component_id]:
+            continue
+
+        device = device_registry.async_get_device(
+            identifiers={
+                (DOMAIN, component_device_id(entry.entry_id, component.component_id))
+            }
+        )
+        if device is not None:
+            device_registry.async_update_device(
+                device.id,
+                name=component.name,
+                model=component.serial_number,
+                sw_version=component.firmware_version,
+            )
@@ -11,6 +11,7 @@ from .const import (
     DEVICE_MANUFACTURER,
 )
 from .coordinator import SMAUpdateCoordinator
+from .util import component_device_id
 
 from .sma.model import ComponentInfo
 
@@ -32,11 +33,8 @@ class SMAEntity(CoordinatorEntity):
         super().__init__(coordinator)
 
         # generate component (=device) id
-        device_id = str(
-            uuid.uuid5(
-                uuid.NAMESPACE_X500,
-                f"{coordinator.config_entry.entry_id}{component_id}",
-            )
+        device_id = component_device_id(
+            coordinator.config_entry.entry_id, component_id
         )
 
         # create entity id from device id and channel id
@@ -1,6 +1,7 @@
 """SMA integration config and options flow."""
 from __future__ import annotations
-from typing import Any, TypedDict
+import asyncio
+from typing import Any
 from urllib.parse import urlparse
 
 import voluptuous as vol
@@ -19,9 +20,12 @@ from homeassistant.helpers.selector import (
     NumberSelector,
     NumberSelectorConfig,
     NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
 )
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .const import (
     DOMAIN,
@@ -35,14 +39,70 @@ from .const import (
     OPT_REQUEST_TIMEOUT,
     OPT_UPDATE_INTERVAL,
     OPT_REQUEST_RETIRES,
+    OPT_RESTORE_ON_STARTUP,
+    OPT_CATALOGUE_TTL,
+    OPT_REFRESH_CHANNELS,
+    OPT_FILTER_COMPONENT,
+    OPT_FILTER_DEVICE_KIND,
+    OPT_FILTER_PREFIX,
+    OPT_SELECT_MORE_CHANNELS,
+    OPT_SLOW_CHANNELS,
+    OPT_SLOW_UPDATE_INTERVAL,
+    OPT_CHANNEL_TIERS,
+    OPT_ADAPTIVE_POLLING,
+    OPT_MIN_UPDATE_INTERVAL,
+    OPT_MAX_UPDATE_INTERVAL,
+    OPT_SUN_AWARE_POLLING,
+    OPT_SUN_ELEVATION_MARGIN,
+    OPT_NIGHT_UPDATE_INTERVAL,
+    OPT_ALIGNED_POLLING,
+    OPT_HIGH_FREQUENCY_CHANNELS,
+    OPT_HIGH_FREQUENCY_INTERVAL,
+    OPT_HEDGED_REQUESTS,
+    OPT_RATE_LIMIT,
+    OPT_RATE_LIMIT_BURST,
+    FILTER_ALL,
     DEFAULT_REQUEST_TIMEOUT,
     DEFAULT_UPDATE_INTERVAL,
     DEFAULT_REQUEST_RETIRES,
+    DEFAULT_RESTORE_ON_STARTUP,
+    DEFAULT_CATALOGUE_TTL,
+    DEFAULT_SLOW_UPDATE_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_SUN_AWARE_POLLING,
+    DEFAULT_SUN_ELEVATION_MARGIN,
+    DEFAULT_NIGHT_UPDATE_INTERVAL,
+    DEFAULT_ALIGNED_POLLING,
+    DEFAULT_HIGH_FREQUENCY_INTERVAL,
+    DEFAULT_HEDGED_REQUESTS,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST,
+    CATALOGUE_DISCOVERY_TIMEOUT,
+    MAX_CHANNELS_PER_STEP,
+    MAX_HIGH_FREQUENCY_CHANNELS,
+    POLL_TIME_WARNING_FRACTION,
 )
 
-from .util import channel_parts_to_fqid
+from .session import (
+    async_get_host_limiter,
+    async_get_host_session,
+    async_release_host,
+)
+from .util import (
+    SMAEntryData,
+    channel_fqid_to_parts,
+    channel_fqids_to_query,
+    channel_parts_to_fqid,
+)
 
+from .sma.catalogue import ChannelCatalogue, fetch_channel_catalogue
 from .sma.client import SMAApiClient
+from .sma.cost import measure_polling_cost
+from .sma.known_channels import load_known_channels
+from .sma.ratelimit import PRIORITY_INTERACTIVE, request_priority
+from .sma.scheduler import POLL_TIER_FAST, POLL_TIER_SLOW, default_poll_tier
 from .sma.model import (
     SMAApiAuthenticationError,
     SMAApiCommunicationError,
@@ -154,19 +214,23 @@ class SMAConfigFlow(ConfigFlow, domain=DOMAIN):
             host=host,
             username=username,
             password=password,
-            session=async_create_clientsession(
-                hass=self.hass,
-                verify_ssl=verify_ssl,
-            ),
+            session=async_get_host_session(self.hass, host, verify_ssl),
             use_ssl=use_ssl,
             request_timeout=DEFAULT_REQUEST_TIMEOUT,
             request_retries=DEFAULT_REQUEST_RETIRES,
             logger=LOGGER,
+            rate_limiter=async_get_host_limiter(self.hass, host),
         )
 
-        await sma.login()
-        all_components = await sma.get_all_components()
-        await sma.logout()
+        # the entry is not created yet, so the session of the temporary client is logged out
+        # even if the request fails
+        with request_priority(PRIORITY_INTERACTIVE):
+            try:
+                await sma.login()
+                all_components = await sma.get_all_components()
+            finally:
+                await sma.close()
+                await async_release_host(self.hass, host)
 
         # plant name is stored in the first component of type "Plant"
         plant_component = next(
@@ -199,42 +263,334 @@ class SMAOptionsFlow(OptionsFlow):
 
     VERSION = 1
 
+    # options shown in the form, initialized from the config entry
+    _options: dict[str, Any]
+
+    # selected channel fqids, in selection order.
+    # channels not shown in a selection step keep their selection state
+    _selected_channels: dict[str, None]
+
+    # poll tier of channels that do not use their default tier, by channel fqid
+    _channel_tiers: dict[str, str]
+
+    # channel fqids polled in high-frequency mode, in selection order
+    _high_frequency_channels: dict[str, None]
+
+    # channels selected in the last channels step, as labels by channel fqid. assigned to tiers in the tiers step
+    _tier_channels: dict[str, str]
+
+    # whether to select channels from another group after the tiers step
+    _select_more_channels: bool = False
+
+    # filters of the current channel selection step
+    _filter: dict[str, Any]
+
+    # catalogue of available channels shown in the form
+    _catalogue: ChannelCatalogue | None = None
+
+    # background task discovering available channels
+    _discovery_task: asyncio.Task | None = None
+
     def __init__(self, config_entry: ConfigEntry):
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._options = dict(config_entry.options)
+        self._selected_channels = dict.fromkeys(
+            self._options.get(OPT_SENSOR_CHANNELS, [])
+        )
+        self._channel_tiers = dict(self._options.get(OPT_CHANNEL_TIERS, {}))
+        self._high_frequency_channels = dict.fromkeys(
+            self._options.get(OPT_HIGH_FREQUENCY_CHANNELS, [])
+        )
+        self._tier_channels = {}
+        self._filter = {
+            OPT_FILTER_COMPONENT: FILTER_ALL,
+            OPT_FILTER_DEVICE_KIND: FILTER_ALL,
+            OPT_FILTER_PREFIX: "",
+        }
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Manage enabled sensor channels."""
+        """Show the options, discovering available channels first if none are cached."""
+        self._catalogue = self._get_cached_channel_catalogue()
+        if self._catalogue is None:
+            return await self.async_step_discover()
+        return await self.async_step_filter()
+
+    async def async_step_discover(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Discover available channels in the background while showing progress."""
+        if self._discovery_task is None:
+            self._discovery_task = self.hass.async_create_task(
+                self._async_discover_channels()
+            )
+            return self.async_show_progress(
+                step_id="discover",
+                progress_action="discover_channels",
+            )
+
+        discovery_task = self._discovery_task
+        self._discovery_task = None
+        try:
+            self._catalogue = await discovery_task
+        except SMAApiClientError as exception:
+            LOGGER.error("failed to discover available channels: %s", exception)
+            return self.async_show_progress_done(next_step_id="discovery_failed")
+
+        return self.async_show_progress_done(next_step_id="filter")
+
+    async def async_step_discovery_failed(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Abort if no channels could be discovered."""
+        return self.async_abort(reason="discovery_failed")
+
+    async def async_step_filter(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Choose which group of channels to show in the channel selection step."""
+        _errors = {}
         if user_input is not None:
-            return self.async_create_entry(
-                data=user_input,
+            if user_input.pop(OPT_REFRESH_CHANNELS, False):
+                entry_data = self._get_entry_data()
+                if entry_data is not None:
+                    entry_data.catalogue_cache.invalidate()
+                return await self.async_step_discover()
+
+            self._filter = {
+                OPT_FILTER_COMPONENT: user_input.get(OPT_FILTER_COMPONENT, FILTER_ALL),
+                OPT_FILTER_DEVICE_KIND: user_input.get(
+                    OPT_FILTER_DEVICE_KIND, FILTER_ALL
+                ),
+                OPT_FILTER_PREFIX: user_input.get(OPT_FILTER_PREFIX, "").strip(),
+            }
+            channel_count = len(self._get_filtered_channels())
+            if channel_count == 0:
+                _errors["base"] = "no_channels"
+            elif channel_count > MAX_CHANNELS_PER_STEP:
+                _errors["base"] = "too_many_channels"
+            else:
+                return await self.async_step_channels()
+        elif not self._catalogue.is_complete:
+            _errors["base"] = "catalogue_incomplete"
+
+        # build group options, with the number of channels in each group
+        component_options = [SelectOptionDict(value=FILTER_ALL, label="All")]
+        for component_id, count in self._catalogue.count_by_component().items():
+            name = self._catalogue.component_names.get(component_id) or component_id
+            component_options.append(
+                SelectOptionDict(value=component_id, label=f"{name} ({count})")
             )
 
-        # build multi select options
-        available_channels = await self._fetch_available_channels()
-        available_channels_opt = {}
-        for channel in available_channels:
-            fqid = channel_parts_to_fqid(channel["component_id"], channel["channel_id"])
-            available_channels_opt[
-                fqid
-            ] = f"{channel['channel_id']} @ {channel['component_name']}"
+        device_kind_options = [SelectOptionDict(value=FILTER_ALL, label="All")]
+        for device_kind, count in self._catalogue.count_by_device_kind().items():
+            device_kind_options.append(
+                SelectOptionDict(value=device_kind, label=f"{device_kind} ({count})")
+            )
 
-        # show options form
         return self.async_show_form(
-            step_id="init",
+            step_id="filter",
+            errors=_errors,
+            description_placeholders={
+                "channel_count": str(len(self._catalogue.entries)),
+                "selected_count": str(len(self._selected_channels)),
+                "max_channels": str(MAX_CHANNELS_PER_STEP),
+            },
             data_schema=vol.Schema(
                 {
-                    # channels
+                    # component
                     vol.Required(
+                        OPT_FILTER_COMPONENT,
+                        default=self._filter[OPT_FILTER_COMPONENT],
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=component_options,
+                            mode=SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    # device kind
+                    vol.Required(
+                        OPT_FILTER_DEVICE_KIND,
+                        default=self._filter[OPT_FILTER_DEVICE_KIND],
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=device_kind_options,
+                            mode=SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    # channel id prefix
+                    vol.Optional(
+                        OPT_FILTER_PREFIX,
+                        default=self._filter[OPT_FILTER_PREFIX],
+                    ): TextSelector(
+                        TextSelectorConfig(type=TextSelectorType.TEXT),
+                    ),
+                    # refresh channel list
+                    vol.Optional(
+                        OPT_REFRESH_CHANNELS,
+                        default=False,
+                    ): BooleanSelector(),
+                }
+            ),
+        )
+
+    async def async_step_channels(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Select sensor channels out of the filtered channels."""
+        channels = self._get_filtered_channels()
+        if user_input is not None:
+            # replace the selection of the shown channels, keep all others
+            selected = set(user_input.get(OPT_SENSOR_CHANNELS, []))
+            for fqid in channels:
+                if fqid in selected:
+                    self._selected_channels.setdefault(fqid, None)
+                else:
+                    self._selected_channels.pop(fqid, None)
+
+            self._select_more_channels = user_input.get(OPT_SELECT_MORE_CHANNELS, False)
+
+            # assign the poll tiers of the selected channels in the next step
+            self._tier_channels = {
+                fqid: label for (fqid, label) in channels.items() if fqid in selected
+            }
+            if len(self._tier_channels) > 0:
+                return await self.async_step_tiers()
+            return await self._async_step_after_channels()
+
+        return self.async_show_form(
+            step_id="channels",
+            description_placeholders={
+                "channel_count": str(len(channels)),
+            },
+            data_schema=vol.Schema(
+                {
+                    # channels
+                    vol.Optional(
                         OPT_SENSOR_CHANNELS,
-                        default=self.config_entry.options.get(OPT_SENSOR_CHANNELS),
-                    ): cv.multi_select(available_channels_opt),
+                        default=[
+                            fqid for fqid in channels if fqid in self._selected_channels
+                        ],
+                    ): cv.multi_select(channels),
+                    # go back to the filter step
+                    vol.Optional(
+                        OPT_SELECT_MORE_CHANNELS,
+                        default=False,
+                    ): BooleanSelector(),
+                }
+            ),
+        )
+
+    async def async_step_tiers(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Assign the channels selected in the channels step to poll tiers."""
+        channels = self._tier_channels
+        _errors = {}
+        if user_input is not None:
+            slow = set(user_input.get(OPT_SLOW_CHANNELS, []))
+            high_frequency = set(user_input.get(OPT_HIGH_FREQUENCY_CHANNELS, []))
+            if not slow.isdisjoint(high_frequency):
+                # a channel is polled in exactly one tier
+                _errors["base"] = "channel_in_multiple_tiers"
+            else:
+                # only keep tiers that differ from the default tier of the channel
+                for fqid in channels:
+                    tier = POLL_TIER_SLOW if fqid in slow else POLL_TIER_FAST
+                    if tier == self._get_default_tier(fqid):
+                        self._channel_tiers.pop(fqid, None)
+                    else:
+                        self._channel_tiers[fqid] = tier
+
+                for fqid in channels:
+                    if fqid in high_frequency:
+                        self._high_frequency_channels.setdefault(fqid, None)
+                    else:
+                        self._high_frequency_channels.pop(fqid, None)
+                return await self._async_step_after_channels()
+
+        return self.async_show_form(
+            step_id="tiers",
+            errors=_errors,
+            description_placeholders={
+                "channel_count": str(len(channels)),
+            },
+            data_schema=vol.Schema(
+                {
+                    # channels polled at the slow update interval
+                    vol.Optional(
+                        OPT_SLOW_CHANNELS,
+                        default=[
+                            fqid
+                            for fqid in channels
+                            if fqid not in self._high_frequency_channels
+                            and self._channel_tiers.get(
+                                fqid, self._get_default_tier(fqid)
+                            )
+                            == POLL_TIER_SLOW
+                        ],
+                    ): cv.multi_select(channels),
+                    # channels polled in high-frequency mode
+                    vol.Optional(
+                        OPT_HIGH_FREQUENCY_CHANNELS,
+                        default=[
+                            fqid
+                            for fqid in channels
+                            if fqid in self._high_frequency_channels
+                        ],
+                    ): cv.multi_select(channels),
+                }
+            ),
+        )
+
+    async def _async_step_after_channels(self) -> FlowResult:
+        """Continue with the next group of channels or the settings."""
+        if self._select_more_channels:
+            return await self.async_step_filter()
+        return await self.async_step_settings()
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage runtime settings."""
+        _errors = {}
+        if user_input is not None:
+            self._options.update(user_input)
+            if self._options.get(
+                OPT_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+            ) > self._options.get(OPT_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL):
+                _errors["base"] = "invalid_interval_bounds"
+            elif (
+                len(self._get_selected_high_frequency_channels())
+                > MAX_HIGH_FREQUENCY_CHANNELS
+            ):
+                _errors["base"] = "too_many_high_frequency_channels"
+            else:
+                self._options[OPT_SENSOR_CHANNELS] = list(self._selected_channels)
+                self._options[OPT_CHANNEL_TIERS] = {
+                    fqid: tier
+                    for (fqid, tier) in self._channel_tiers.items()
+                    if fqid in self._selected_channels
+                }
+                self._options[
+                    OPT_HIGH_FREQUENCY_CHANNELS
+                ] = self._get_selected_high_frequency_channels()
+                return await self.async_step_estimate()
+
+        return self.async_show_form(
+            step_id="settings",
+            errors=_errors,
+            description_placeholders={
+                "max_high_frequency_channels": str(MAX_HIGH_FREQUENCY_CHANNELS),
+            },
+            data_schema=vol.Schema(
+                {
                     # refresh interval
                     vol.Required(
                         OPT_UPDATE_INTERVAL,
-                        default=self.config_entry.options.get(
+                        default=self._options.get(
                             OPT_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
                         ),
                     ): NumberSelector(
@@ -245,10 +601,114 @@ class SMAOptionsFlow(OptionsFlow):
                             mode=NumberSelectorMode.BOX,
                         )
                     ),
+                    # refresh interval of slow channels
+                    vol.Required(
+                        OPT_SLOW_UPDATE_INTERVAL,
+                        default=self._options.get(
+                            OPT_SLOW_UPDATE_INTERVAL, DEFAULT_SLOW_UPDATE_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=1,
+                            step=1,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # adapt channel poll intervals to how often values change
+                    vol.Required(
+                        OPT_ADAPTIVE_POLLING,
+                        default=self._options.get(
+                            OPT_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                        ),
+                    ): BooleanSelector(),
+                    # bounds of adaptive poll intervals
+                    vol.Required(
+                        OPT_MIN_UPDATE_INTERVAL,
+                        default=self._options.get(
+                            OPT_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=1,
+                            step=1,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        OPT_MAX_UPDATE_INTERVAL,
+                        default=self._options.get(
+                            OPT_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=1,
+                            step=1,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # poll interval of high-frequency channels
+                    vol.Required(
+                        OPT_HIGH_FREQUENCY_INTERVAL,
+                        default=self._options.get(
+                            OPT_HIGH_FREQUENCY_INTERVAL, DEFAULT_HIGH_FREQUENCY_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0.5,
+                            max=5,
+                            step=0.5,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # poll just after the device updates its values
+                    vol.Required(
+                        OPT_ALIGNED_POLLING,
+                        default=self._options.get(
+                            OPT_ALIGNED_POLLING, DEFAULT_ALIGNED_POLLING
+                        ),
+                    ): BooleanSelector(),
+                    # slow down or pause PV channels at night
+                    vol.Required(
+                        OPT_SUN_AWARE_POLLING,
+                        default=self._options.get(
+                            OPT_SUN_AWARE_POLLING, DEFAULT_SUN_AWARE_POLLING
+                        ),
+                    ): BooleanSelector(),
+                    vol.Required(
+                        OPT_SUN_ELEVATION_MARGIN,
+                        default=self._options.get(
+                            OPT_SUN_ELEVATION_MARGIN, DEFAULT_SUN_ELEVATION_MARGIN
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=18,
+                            step=1,
+                            unit_of_measurement="°",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        OPT_NIGHT_UPDATE_INTERVAL,
+                        default=self._options.get(
+                            OPT_NIGHT_UPDATE_INTERVAL, DEFAULT_NIGHT_UPDATE_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
                     # request timeout
                     vol.Required(
                         OPT_REQUEST_TIMEOUT,
-                        default=self.config_entry.options.get(
+                        default=self._options.get(
                             OPT_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
                         ),
                     ): NumberSelector(
@@ -260,10 +720,42 @@ class SMAOptionsFlow(OptionsFlow):
                             mode=NumberSelectorMode.BOX,
                         )
                     ),
+                    # requests per second to the device, shared by everything talking to it
+                    vol.Required(
+                        OPT_RATE_LIMIT,
+                        default=self._options.get(OPT_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            unit_of_measurement="requests/s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        OPT_RATE_LIMIT_BURST,
+                        default=self._options.get(
+                            OPT_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_BURST
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=1,
+                            step=1,
+                            unit_of_measurement="requests",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # send a duplicate of slow live measurement requests
+                    vol.Required(
+                        OPT_HEDGED_REQUESTS,
+                        default=self._options.get(
+                            OPT_HEDGED_REQUESTS, DEFAULT_HEDGED_REQUESTS
+                        ),
+                    ): BooleanSelector(),
                     # request retries
                     vol.Required(
                         OPT_REQUEST_RETIRES,
-                        default=self.config_entry.options.get(
+                        default=self._options.get(
                             OPT_REQUEST_RETIRES, DEFAULT_REQUEST_RETIRES
                         ),
                     ): NumberSelector(
@@ -274,28 +766,218 @@ class SMAOptionsFlow(OptionsFlow):
                             mode=NumberSelectorMode.BOX,
                         )
                     ),
+                    # restore last-known values on startup
+                    vol.Required(
+                        OPT_RESTORE_ON_STARTUP,
+                        default=self._options.get(
+                            OPT_RESTORE_ON_STARTUP, DEFAULT_RESTORE_ON_STARTUP
+                        ),
+                    ): BooleanSelector(),
+                    # channel catalogue cache ttl
+                    vol.Required(
+                        OPT_CATALOGUE_TTL,
+                        default=self._options.get(
+                            OPT_CATALOGUE_TTL, DEFAULT_CATALOGUE_TTL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
                 }
             ),
         )
 
-    async def _fetch_available_channels(
-        self,
-    ) -> list[
-        TypedDict(
-            "ChannelInfo",
-            {"component_name": str, "component_id": str, "channel_id": str},
+    async def async_step_estimate(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Show the estimated cost of polling the selected channels before saving."""
+        if user_input is not None:
+            return self.async_create_entry(data=self._options)
+
+        # a sample query needs the running client
+        entry_data = self._get_entry_data()
+        channel_fqids = self._options[OPT_SENSOR_CHANNELS]
+        if entry_data is None or len(channel_fqids) == 0:
+            return self.async_create_entry(data=self._options)
+
+        # high-frequency channels are polled by their own poller, not by the regular query
+        high_frequency_fqids = self._options.get(OPT_HIGH_FREQUENCY_CHANNELS, [])
+        high_frequency_interval = self._options.get(
+            OPT_HIGH_FREQUENCY_INTERVAL, DEFAULT_HIGH_FREQUENCY_INTERVAL
         )
-    ]:
-        """Get a list of all available channels and their ids."""
+        regular_fqids = [
+            fqid for fqid in channel_fqids if fqid not in high_frequency_fqids
+        ]
+
+        # regular polls happen at the update interval, slow tier channels are merged into some of them
+        update_interval = self._options[OPT_UPDATE_INTERVAL]
+        slow_update_interval = self._options[OPT_SLOW_UPDATE_INTERVAL]
+        fast_fqids = []
+        slow_fqids = []
+        for fqid in regular_fqids:
+            tier = self._options[OPT_CHANNEL_TIERS].get(
+                fqid, self._get_default_tier(fqid)
+            )
+            (slow_fqids if tier == POLL_TIER_SLOW else fast_fqids).append(fqid)
+        _errors = {}
+        placeholders = {
+            "channel_count": str(len(fast_fqids)),
+            "update_interval": str(update_interval),
+            "slow_channel_count": str(len(slow_fqids)),
+            "slow_update_interval": str(slow_update_interval),
+            "high_frequency_channel_count": str(len(high_frequency_fqids)),
+            "high_frequency_interval": str(high_frequency_interval),
+            "requests_per_hour": "-",
+            "high_frequency_requests_per_hour": "-",
+            "request_size": "-",
+            "response_size": "-",
+            "latency": "-",
+        }
+        try:
+            with request_priority(PRIORITY_INTERACTIVE):
+                await entry_data.client.login()
+                cost = await measure_polling_cost(
+                    entry_data.client,
+                    channel_fqids_to_query(fast_fqids),
+                    update_interval,
+                    channel_fqids_to_query(high_frequency_fqids),
+                    high_frequency_interval,
+                    slow_query=channel_fqids_to_query(slow_fqids),
+                    slow_update_interval=slow_update_interval,
+                )
+        except SMAApiClientError as exception:
+            LOGGER.warning("failed to measure query cost: %s", exception)
+            _errors["base"] = "estimate_failed"
+        else:
+            LOGGER.debug(
+                "polling cost: %s requests/h, %s bytes/h",
+                cost.requests_per_hour,
+                cost.bytes_per_hour,
+            )
+            placeholders.update(
+                requests_per_hour=f"{cost.requests_per_hour:.0f}",
+                high_frequency_requests_per_hour=(
+                    f"{cost.high_frequency.requests_per_hour:.0f}"
+                    if cost.high_frequency is not None
+                    else "0"
+                ),
+            )
+            if cost.regular is not None:
+                placeholders.update(
+                    request_size=f"{cost.regular.request_size / 1024:.1f}",
+                    response_size=f"{cost.regular.response_size / 1024:.1f}",
+                    latency=f"{cost.regular.latency * 1000:.0f}",
+                )
+            if cost.exceeds(POLL_TIME_WARNING_FRACTION):
+                _errors["base"] = "poll_time_exceeds_interval"
+
+        return self.async_show_form(
+            step_id="estimate",
+            errors=_errors,
+            description_placeholders=placeholders,
+            data_schema=vol.Schema({}),
+        )
+
+    def _get_default_tier(self, fqid: str) -> str:
+        """Get the default poll tier of a channel."""
+        (_, channel_id) = channel_fqid_to_parts(fqid)
+        return default_poll_tier(channel_id)
+
+    def _get_selected_high_frequency_channels(self) -> list[str]:
+        """Get the high-frequency channels that are also selected as sensor channels."""
+        return [
+            fqid
+            for fqid in self._high_frequency_channels
+            if fqid in self._selected_channels
+        ]
+
+    def _get_filtered_channels(self) -> dict[str, str]:
+        """Get the channels matching the current filters, as labels by channel fqid."""
+        component_id = self._filter[OPT_FILTER_COMPONENT]
+        device_kind = self._filter[OPT_FILTER_DEVICE_KIND]
+        entries = self._catalogue.filter(
+            component_id=None if component_id == FILTER_ALL else component_id,
+            device_kind=None if device_kind == FILTER_ALL else device_kind,
+            prefix=self._filter[OPT_FILTER_PREFIX] or None,
+        )
+        return {
+            channel_parts_to_fqid(
+                entry.component_id, entry.channel_id
+            ): f"{entry.channel_id} @ {entry.component_name}"
+            for entry in entries
+        }
+
+    def _get_entry_data(self) -> SMAEntryData | None:
+        """Get the data of the config entry, or None if the entry is not loaded."""
+        return self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+
+    def _get_cached_channel_catalogue(self) -> ChannelCatalogue | None:
+        """Get the cached catalogue of available channels, if the config entry is loaded."""
+        entry_data = self._get_entry_data()
+        if entry_data is None:
+            return None
+
+        cache = entry_data.catalogue_cache
+        cache.ttl = self._options.get(OPT_CATALOGUE_TTL, DEFAULT_CATALOGUE_TTL)
+        catalogue = cache.get()
+        if catalogue is not None:
+            LOGGER.debug("using cached channel catalogue (age %.0f s)", catalogue.age)
+        return catalogue
+
+    async def _async_discover_channels(self) -> ChannelCatalogue:
+        """Fetch the catalogue of available channels, then continue the flow.
+
+        if the config entry is loaded, its authenticated client and discovered components are used,
+        and a complete catalogue is cached. otherwise, a temporary client is used.
+        requests of the flow overtake background polls waiting for the rate limiter.
+        """
+        try:
+            with request_priority(PRIORITY_INTERACTIVE):
+                return await self._fetch_channel_catalogue()
+        finally:
+            self.hass.async_create_task(
+                self.hass.config_entries.options.async_configure(flow_id=self.flow_id)
+            )
+
+    async def _fetch_channel_catalogue(self) -> ChannelCatalogue:
+        """Fetch the catalogue of available channels, see _async_discover_channels()."""
+        # catalogue entries are grouped by known channel, load them outside the event loop
+        await self.hass.async_add_executor_job(load_known_channels)
+
+        entry_data = self._get_entry_data()
+        if entry_data is None:
+            return await self._fetch_channel_catalogue_temporary()
+
+        LOGGER.debug("fetching channel catalogue for host=%s", entry_data.client.host)
+        await entry_data.client.login()
+        catalogue = await fetch_channel_catalogue(
+            entry_data.client,
+            entry_data.all_components,
+            timeout=CATALOGUE_DISCOVERY_TIMEOUT,
+        )
+        LOGGER.debug(
+            "found %s available channels, %s components missing",
+            len(catalogue.entries),
+            len(catalogue.missing_component_ids),
+        )
+        if catalogue.is_complete:
+            entry_data.catalogue_cache.set(catalogue)
+        return catalogue
+
+    async def _fetch_channel_catalogue_temporary(self) -> ChannelCatalogue:
+        """Get the catalogue of available channels using a temporary client."""
         host = self.config_entry.data[CONF_HOST]
         LOGGER.debug("attempting to fetch available channels for host=%s", host)
         sma = SMAApiClient(
             host=host,
             username=self.config_entry.data[CONF_USERNAME],
             password=self.config_entry.data[CONF_PASSWORD],
-            session=async_create_clientsession(
-                hass=self.hass,
-                verify_ssl=self.config_entry.data[CONF_VERIFY_SSL],
+            session=async_get_host_session(
+                self.hass, host, self.config_entry.data[CONF_VERIFY_SSL]
             ),
             use_ssl=self.config_entry.data[CONF_USE_SSL],
             request_timeout=self.config_entry.options.get(
@@ -305,37 +987,18 @@ class SMAOptionsFlow(OptionsFlow):
                 OPT_REQUEST_RETIRES, DEFAULT_REQUEST_RETIRES
             ),
             logger=LOGGER,
+            rate_limiter=async_get_host_limiter(self.hass, host),
         )
 
-        await sma.login()
-
-        # get components
-        all_components = await sma.get_all_components()
+        try:
+            await sma.login()
+            all_components = await sma.get_all_components()
+            catalogue = await fetch_channel_catalogue(
+                sma, all_components, timeout=CATALOGUE_DISCOVERY_TIMEOUT
+            )
+        finally:
+            await sma.close()
+            await async_release_host(self.hass, host)
 
-        # fetch live data for all components
-        all_live_data = await sma.get_all_live_measurements(
-            component_ids=[component.component_id for component in all_components]
-        )
-        await sma.logout()
-
-        # return a dict for each live measurement
-        LOGGER.debug("found %s available channels before filtering", len(all_live_data))
-        result = [
-            {
-                "component_name": next(
-                    (
-                        component.name
-                        for component in all_components
-                        if component.component_id == ld.component_id
-                    ),
-                    None,
-                ),
-                "component_id": ld.component_id,
-                "channel_id": ld.channel_id,
-            }
-            for ld in all_live_data
-            # ignore all entries that have no value in the latest measurement
-            if ld.latest_value().value is not None
-        ]
-        LOGGER.debug("found %s available channels after filtering", len(result))
-        return result
+        LOGGER.debug("found %s available channels", len(catalogue.entries))
+        return catalogue
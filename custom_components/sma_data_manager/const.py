@@ -8,6 +8,9 @@ LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "sma_data_manager"
 
+# storage constants
+STORAGE_VERSION = 1
+
 # device constants
 DEVICE_MANUFACTURER = "SMA"
 
@@ -23,9 +26,98 @@ OPT_SENSOR_CHANNELS = "sensor_channels"
 OPT_REQUEST_TIMEOUT = "request_timeout"
 OPT_UPDATE_INTERVAL = "update_interval"
 OPT_REQUEST_RETIRES = "request_retries"
+OPT_RESTORE_ON_STARTUP = "restore_on_startup"
+OPT_CATALOGUE_TTL = "catalogue_ttl"
+OPT_SLOW_UPDATE_INTERVAL = "slow_update_interval"
+OPT_CHANNEL_TIERS = "channel_tiers"
+OPT_ADAPTIVE_POLLING = "adaptive_polling"
+OPT_MIN_UPDATE_INTERVAL = "min_update_interval"
+OPT_MAX_UPDATE_INTERVAL = "max_update_interval"
+OPT_SUN_AWARE_POLLING = "sun_aware_polling"
+OPT_SUN_ELEVATION_MARGIN = "sun_elevation_margin"
+OPT_NIGHT_UPDATE_INTERVAL = "night_update_interval"
+OPT_ALIGNED_POLLING = "aligned_polling"
+OPT_HIGH_FREQUENCY_CHANNELS = "high_frequency_channels"
+OPT_HIGH_FREQUENCY_INTERVAL = "high_frequency_interval"
+OPT_HEDGED_REQUESTS = "hedged_requests"
+OPT_RATE_LIMIT = "rate_limit"
+OPT_RATE_LIMIT_BURST = "rate_limit_burst"
+
+# options flow only fields (not stored in options)
+OPT_REFRESH_CHANNELS = "refresh_channels"
+OPT_FILTER_COMPONENT = "filter_component"
+OPT_FILTER_DEVICE_KIND = "filter_device_kind"
+OPT_FILTER_PREFIX = "filter_prefix"
+OPT_SELECT_MORE_CHANNELS = "select_more_channels"
+OPT_SLOW_CHANNELS = "slow_channels"
+
+# options flow filter value matching everything
+FILTER_ALL = "*"
 
 
 # configuration defaults
 DEFAULT_REQUEST_TIMEOUT = 10
 DEFAULT_UPDATE_INTERVAL = 60
 DEFAULT_REQUEST_RETIRES = 3
+DEFAULT_RESTORE_ON_STARTUP = False
+DEFAULT_CATALOGUE_TTL = 3600
+DEFAULT_SLOW_UPDATE_INTERVAL = 300
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_MIN_UPDATE_INTERVAL = 10
+DEFAULT_MAX_UPDATE_INTERVAL = 600
+DEFAULT_SUN_AWARE_POLLING = False
+DEFAULT_SUN_ELEVATION_MARGIN = 5
+DEFAULT_NIGHT_UPDATE_INTERVAL = 0
+DEFAULT_ALIGNED_POLLING = False
+DEFAULT_HIGH_FREQUENCY_INTERVAL = 1
+DEFAULT_HEDGED_REQUESTS = False
+DEFAULT_RATE_LIMIT = 10
+DEFAULT_RATE_LIMIT_BURST = 20
+
+# time to wait for the channel catalogue in the options flow, in seconds.
+# components that take longer are left out of the catalogue
+CATALOGUE_DISCOVERY_TIMEOUT = 30
+
+# maximum number of channels shown in a single channel selection step of the options flow.
+# larger selections have to be narrowed down using the filters
+MAX_CHANNELS_PER_STEP = 250
+
+# fraction of the update interval a poll may take before the options flow warns about it
+POLL_TIME_WARNING_FRACTION = 0.5
+
+# maximum fraction of time spent polling the device.
+# if polls take longer, the time between polls is stretched
+MAX_POLL_DUTY_CYCLE = 0.5
+
+# fraction of the update interval a poll may take, including login, re-auth and retries,
+# but at least the request timeout. each request only gets the time left of this budget as its timeout
+POLL_DEADLINE_FRACTION = 0.8
+
+# time logging out of the device may take when an entry is unloaded, in seconds
+LOGOUT_TIMEOUT = 5
+
+# time to wait after an expected device update before polling, in seconds.
+# covers device processing time, clock differences and the whole-second rounding of the refresh schedule
+POLL_ALIGNMENT_LAG = 1.5
+
+# maximum number of channels polled in high-frequency mode.
+# every channel adds to the load of each high-frequency poll
+MAX_HIGH_FREQUENCY_CHANNELS = 10
+
+# maximum number of connections to a single SMA host, shared by all clients of the host
+HOST_CONNECTION_LIMIT = 4
+
+# time idle connections to a SMA host are kept open, in seconds.
+# polls more frequent than this reuse the connection of the previous poll
+HOST_KEEPALIVE_TIMEOUT = 30
+
+# time resolved addresses of a SMA host are used before resolving it again, in seconds.
+# if resolving fails, the last known addresses are used until it succeeds again
+DNS_CACHE_TTL = 300
+
+# delay for writing the last-known values snapshot, in seconds.
+# saves are coalesced, so the snapshot is written at most once per delay
+SNAPSHOT_SAVE_DELAY = 60
+
+# entity state attributes
+ATTR_STALE = "stale"
@@ -1,19 +1,54 @@
 """DataUpdateCoordinator for SMA integration."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
 from datetime import timedelta
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed
+import homeassistant.util.dt as dt_util
 
-from .const import DOMAIN, LOGGER
-from .util import channel_fqid_to_parts, channel_parts_to_fqid
+from .const import (
+    DOMAIN,
+    LOGGER,
+    MAX_POLL_DUTY_CYCLE,
+    POLL_DEADLINE_FRACTION,
+    POLL_ALIGNMENT_LAG,
+    SNAPSHOT_SAVE_DELAY,
+)
+from .storage import SMASnapshotStore
+from .util import (
+    channel_fqid_to_parts,
+    channel_fqids_to_query,
+    channel_parts_to_fqid,
+)
 
 from .sma.client import SMAApiClient
+from .sma.adaptive import ChangeRateAdapter
+from .sma.alignment import DeviceCadence
+from .sma.deadline import deadline
+from .sma.known_channels import (
+    DEVICE_KIND_PV,
+    get_known_channel,
+    normalize_channel_id,
+)
+from .sma.latency import LatencyTracker
+from .sma.poller import HighFrequencyPoller
+from .sma.scheduler import (
+    POLL_TIER_FAST,
+    POLL_TIER_SLOW,
+    POLL_TIERS,
+    MIN_POLL_DELAY,
+    PollScheduler,
+    default_poll_tier,
+)
+from .sma.sun import DaylightWindow
 from .sma.model import (
     LiveMeasurementQueryItem,
     ChannelValues,
@@ -32,26 +67,255 @@ class SMAUpdateCoordinator(DataUpdateCoordinator):
     query: list[LiveMeasurementQueryItem]
     data: list[ChannelValues]
 
+    channel_fqids: list[str]
+    _selected_channels: set[str]
+    snapshot_store: SMASnapshotStore | None
+
+    # ChannelValues in data, by channel fqid
+    _data_index: dict[str, ChannelValues]
+
+    # True while data holds values restored from a snapshot,
+    # until the first successful live update
+    is_stale: bool = False
+
+    # poll interval of each tier, in seconds
+    tier_intervals: dict[str, float]
+
+    # poll tier of channels that do not use their default tier, by channel fqid
+    channel_tier_overrides: dict[str, str]
+
+    # schedules the channel fqids in the query.
+    # each update polls the due channels, then the next update is scheduled for the next due channel
+    scheduler: PollScheduler
+
+    # adapts the poll interval of each channel to how often it changes, None if disabled
+    change_rate_adapter: ChangeRateAdapter | None = None
+
+    # outside of this window, PV channels are polled at the night update interval, None if disabled
+    daylight_window: DaylightWindow | None = None
+
+    # poll interval of PV channels at night, in seconds. 0 pauses them
+    night_update_interval: float = 0
+
+    # True while outside of the daylight window
+    is_night: bool = False
+
+    # PV channels, which are slowed down or paused at night
+    _pv_fqids: set[str]
+
+    # durations of recent polls
+    poll_latency: LatencyTracker
+
+    # time between the start of the last poll and the start of the next poll, in seconds.
+    # longer than the update interval if polls are slow
+    effective_interval: float | None = None
+
+    # number of updates skipped because a poll was still running
+    skipped_polls: int = 0
+
+    # held while polling
+    _poll_lock: asyncio.Lock
+
+    # update cadence of the device, inferred from the value timestamps. None if polls are not aligned
+    device_cadence: DeviceCadence | None = None
+
+    # channels polled by the high-frequency poller instead of the scheduler
+    high_frequency_fqids: list[str]
+
+    # poll interval of high-frequency channels, in seconds
+    high_frequency_interval: float
+
+    # polls the high-frequency channels while running, None if there are none
+    high_frequency_poller: HighFrequencyPoller | None = None
+
+    # channels polled by the running high-frequency poller
+    _high_frequency_poll_fqids: list[str]
+
+    # callbacks of single channels, by channel fqid.
+    # high-frequency updates only call the callbacks of changed channels
+    _channel_listeners: dict[str, list[CALLBACK_TYPE]]
+
     def __init__(
         self,
         hass: HomeAssistant,
         client: SMAApiClient,
         channel_fqids: list[str],
         update_interval_seconds: int = 60,
+        snapshot_store: SMASnapshotStore | None = None,
+        slow_update_interval_seconds: int | None = None,
+        channel_tier_overrides: dict[str, str] | None = None,
+        change_rate_adapter: ChangeRateAdapter | None = None,
+        daylight_window: DaylightWindow | None = None,
+        night_update_interval: float = 0,
+        aligned_polling: bool = False,
+        high_frequency_fqids: list[str] | None = None,
+        high_frequency_interval: float = 1,
     ) -> None:
         """Init."""
         self.client = client
+        self.high_frequency_fqids = list(high_frequency_fqids or [])
+        self.high_frequency_interval = high_frequency_interval
+        self._channel_listeners = {}
+        self._high_frequency_poll_fqids = []
+        self.device_cadence = DeviceCadence() if aligned_polling else None
+        self.change_rate_adapter = change_rate_adapter
+        self.daylight_window = daylight_window
+        self.night_update_interval = night_update_interval
+        self.is_night = self._check_night()
+        self.snapshot_store = snapshot_store
+        self._data_index = {}
+        self.scheduler = PollScheduler()
+        self.tier_intervals = {}
+        self._pv_fqids = set()
+        self.poll_latency = LatencyTracker()
+        self.effective_interval = None
+        self.skipped_polls = 0
+        self._poll_lock = asyncio.Lock()
+        self.channel_tier_overrides = {}
+        self.set_channels(channel_fqids)
+        self.set_tiers(
+            update_interval_seconds,
+            slow_update_interval_seconds,
+            channel_tier_overrides,
+        )
 
-        # prepare query
-        self.query = []
+        # init
+        super().__init__(
+            hass=hass,
+            logger=LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=update_interval_seconds),
+        )
+
+    async def _async_update_data(self) -> list[ChannelValues]:
+        """Update data of the due channels, keeping the last values of all others."""
+        # never poll concurrently. a refresh requested while a poll is running is skipped,
+        # the running poll delivers the data
+        if self._poll_lock.locked():
+            self.skipped_polls += 1
+            LOGGER.debug("poll for %s still running, skipping update", self.client.host)
+            return self.data
+
+        async with self._poll_lock:
+            start = time.monotonic()
+            try:
+                # login, re-auth and retries of a poll share a single time budget.
+                # it is never shorter than a single request, so short intervals do not cut off slow devices
+                with deadline(
+                    max(
+                        self.tier_intervals[POLL_TIER_FAST] * POLL_DEADLINE_FRACTION,
+                        self.client.request_timeout,
+                    )
+                ):
+                    return await self._async_poll_due_channels()
+            except SMAApiAuthenticationError as exception:
+                raise ConfigEntryAuthFailed(exception) from exception
+            except SMAApiCommunicationError as exception:
+                raise UpdateFailed(exception) from exception
+            except SMAApiParsingError as exception:
+                raise UpdateFailed(exception) from exception
+            except SMAApiClientError as exception:
+                raise UpdateFailed(exception) from exception
+            finally:
+                # schedule the next update for the next due channel,
+                # but leave the device at least the gap required by the recent poll durations
+                end = time.monotonic()
+                delay = max(
+                    self.scheduler.next_due(end, self.tier_intervals[POLL_TIER_FAST]),
+                    self.poll_latency.min_gap(MAX_POLL_DUTY_CYCLE),
+                )
+
+                # move the next update to just after the next expected device update
+                if self.device_cadence is not None:
+                    wall_now = time.time()
+                    aligned = self.device_cadence.align(
+                        wall_now + delay, POLL_ALIGNMENT_LAG
+                    )
+                    if aligned is not None:
+                        delay = aligned - wall_now
+
+                # while the device is offline, update when its next probe is due instead.
+                # the probe is part of the update, so polling resumes as soon as it succeeds
+                probe_delay = self.client.health.time_until_probe(end)
+                if probe_delay is not None:
+                    delay = max(probe_delay, MIN_POLL_DELAY)
+
+                self.update_interval = timedelta(seconds=delay)
+                self.effective_interval = (end - start) + delay
+
+    async def _async_poll_due_channels(self) -> list[ChannelValues]:
+        """Poll the due channels and merge their values into data."""
+        if self._check_night() != self.is_night:
+            self.is_night = not self.is_night
+            LOGGER.debug(
+                "%s, updating PV channel schedule",
+                "night" if self.is_night else "day",
+            )
+            self._update_schedule()
+
+        now = time.monotonic()
+        due_fqids = self.scheduler.due(now)
+        LOGGER.debug(
+            "updating %s of %s channels for %s",
+            len(due_fqids),
+            len(self.channel_fqids),
+            self.client.host,
+        )
+
+        if len(due_fqids) > 0:
+            await self.client.login()
+            measurements = await self.client.get_live_measurements(
+                query=channel_fqids_to_query(due_fqids)
+            )
+            self.poll_latency.add(time.monotonic() - now)
+            if self.device_cadence is not None:
+                self._observe_device_cadence(measurements)
+
+            self.scheduler.mark_polled(due_fqids, now)
+            if self.change_rate_adapter is not None:
+                self._adapt_intervals(due_fqids, measurements)
+            self._merge_data_index(measurements)
+            self.is_stale = False
+
+        data = list(self._data_index.values())
+        if self.snapshot_store is not None and len(due_fqids) > 0:
+            self.snapshot_store.async_delay_save(
+                self.channel_fqids, data, SNAPSHOT_SAVE_DELAY
+            )
+
+        return data
+
+    def restore_snapshot(self, snapshot: list[ChannelValues]) -> None:
+        """Use values from a snapshot until the first live update, marking them stale."""
+        LOGGER.debug("restoring %s channel values from snapshot", len(snapshot))
+        self._update_data_index(snapshot)
+        self.data = snapshot
+        self.is_stale = True
+
+    def set_channels(self, channel_fqids: list[str]) -> None:
+        """Set the channels to query. takes effect on the next update."""
+        self.channel_fqids = channel_fqids
+
+        # selected channel fqids, including the array channel fqid ('Vol[]') of array channels
+        self._selected_channels = set()
         for fqid in channel_fqids:
             (component_id, channel_id) = channel_fqid_to_parts(fqid)
-            self.query.append(
-                LiveMeasurementQueryItem(
-                    component_id=component_id, channel_id=channel_id
-                )
+            self._selected_channels.add(fqid)
+            self._selected_channels.add(
+                channel_parts_to_fqid(component_id, normalize_channel_id(channel_id))
             )
 
+        # prepare query
+        self.query = channel_fqids_to_query(channel_fqids)
+
+        # drop values of channels no longer selected
+        self._data_index = {
+            fqid: cv
+            for (fqid, cv) in self._data_index.items()
+            if self.is_channel_selected(cv.component_id, cv.channel_id)
+        }
+        self._update_schedule()
+
         LOGGER.debug(
             "setup coordinator with query: %s",
             (
@@ -64,29 +328,364 @@ class SMAUpdateCoordinator(DataUpdateCoordinator):
             ),
         )
 
-        # init
-        super().__init__(
-            hass=hass,
-            logger=LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=update_interval_seconds),
+    def set_tiers(
+        self,
+        update_interval_seconds: float,
+        slow_update_interval_seconds: float | None = None,
+        channel_tier_overrides: dict[str, str] | None = None,
+    ) -> None:
+        """Set the poll interval of each tier and the channels not in their default tier.
+
+        :param slow_update_interval_seconds: interval of the slow tier, None to poll it at the update interval
+        """
+        self.tier_intervals = {
+            POLL_TIER_FAST: update_interval_seconds,
+            POLL_TIER_SLOW: (
+                slow_update_interval_seconds
+                if slow_update_interval_seconds is not None
+                else update_interval_seconds
+            ),
+        }
+        self.channel_tier_overrides = dict(channel_tier_overrides or {})
+        self._update_schedule()
+
+    def set_change_rate_adapter(
+        self, change_rate_adapter: ChangeRateAdapter | None
+    ) -> None:
+        """Set the adapter for channel poll intervals, None to poll channels at their tier interval."""
+        self.change_rate_adapter = change_rate_adapter
+        self._update_schedule()
+
+    def set_daylight_window(
+        self, daylight_window: DaylightWindow | None, night_update_interval: float = 0
+    ) -> None:
+        """Set the daylight window for PV channels, None to poll them at the same rate day and night.
+
+        :param night_update_interval: poll interval of PV channels at night, in seconds. 0 pauses them
+        """
+        self.daylight_window = daylight_window
+        self.night_update_interval = night_update_interval
+        self.is_night = self._check_night()
+        self._update_schedule()
+
+    def set_aligned_polling(self, aligned_polling: bool) -> None:
+        """Enable or disable aligning polls to the update cadence of the device."""
+        if not aligned_polling:
+            self.device_cadence = None
+        elif self.device_cadence is None:
+            self.device_cadence = DeviceCadence()
+
+    def set_high_frequency(
+        self, high_frequency_fqids: list[str], high_frequency_interval: float
+    ) -> None:
+        """Set the channels polled in high-frequency mode and their interval.
+
+        restarts the high-frequency poller if it is running and the channels or interval changed.
+        """
+        self.high_frequency_fqids = list(high_frequency_fqids)
+        self.high_frequency_interval = high_frequency_interval
+        self._update_schedule()
+        if self.high_frequency_poller is not None and (
+            self._high_frequency_poll_fqids != self._get_high_frequency_fqids()
+            or self.high_frequency_poller.interval != high_frequency_interval
+        ):
+            self.async_stop_high_frequency()
+            self.async_start_high_frequency()
+
+    @callback
+    def async_start_high_frequency(self) -> None:
+        """Start polling the high-frequency channels, if there are any."""
+        fqids = self._get_high_frequency_fqids()
+        if self.high_frequency_poller is not None or len(fqids) == 0:
+            return
+
+        LOGGER.debug(
+            "polling %s channels every %s s for %s",
+            len(fqids),
+            self.high_frequency_interval,
+            self.client.host,
+        )
+        self._high_frequency_poll_fqids = fqids
+        self.high_frequency_poller = HighFrequencyPoller(
+            client=self.client,
+            query=channel_fqids_to_query(fqids),
+            interval=self.high_frequency_interval,
+            on_values=self._async_handle_high_frequency_values,
+            on_error=self._async_handle_high_frequency_error,
+            # do not compete with a running regular poll of the same host for the rate limiter
+            yield_tick=self._poll_lock.locked,
         )
+        self.high_frequency_poller.start()
 
-    async def _async_update_data(self) -> list[ChannelValues]:
-        """Update data."""
-        try:
-            LOGGER.debug("updating data for %s", self.client.host)
+    @callback
+    def async_stop_high_frequency(self) -> None:
+        """Stop polling the high-frequency channels."""
+        if self.high_frequency_poller is None:
+            return
 
-            await self.client.login()
-            measurements = await self.client.get_live_measurements(query=self.query)
-            #await self.client.logout()
-
-            return measurements
-        except SMAApiAuthenticationError as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
-        except SMAApiCommunicationError as exception:
-            raise UpdateFailed(exception) from exception
-        except SMAApiParsingError as exception:
-            raise UpdateFailed(exception) from exception
-        except SMAApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+        poller, self.high_frequency_poller = self.high_frequency_poller, None
+        self.hass.async_create_task(poller.stop())
+
+    @callback
+    def async_add_channel_listener(
+        self, component_id: str, channel_id: str, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for high-frequency updates of a single channel.
+
+        :return: a function that removes the listener
+        """
+        fqid = channel_parts_to_fqid(component_id, channel_id)
+        self._channel_listeners.setdefault(fqid, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners = self._channel_listeners.get(fqid, [])
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+            if len(listeners) == 0:
+                self._channel_listeners.pop(fqid, None)
+
+        return remove_listener
+
+    @callback
+    def _async_handle_high_frequency_values(
+        self, measurements: list[ChannelValues]
+    ) -> None:
+        """Merge high-frequency values into data, notifying the listeners of changed channels only."""
+        changed = []
+        added = False
+        for cv in measurements:
+            fqid = channel_parts_to_fqid(cv.component_id, cv.channel_id)
+            previous = self._data_index.get(fqid)
+            self._data_index[fqid] = cv
+            if previous is None:
+                added = True
+            elif _latest_time_value(previous) != _latest_time_value(cv):
+                changed.append(fqid)
+
+        if added:
+            # new channels need their entities created, which happens on coordinator updates
+            self.data = list(self._data_index.values())
+            self.async_update_listeners()
+            return
+
+        for fqid in changed:
+            for update_callback in list(self._channel_listeners.get(fqid, [])):
+                update_callback()
+
+    @callback
+    def _async_handle_high_frequency_error(self, exception: SMAApiClientError) -> None:
+        """Log failed high-frequency polls."""
+        LOGGER.debug("high-frequency poll of %s failed: %s", self.client.host, exception)
+
+    def _get_high_frequency_fqids(self) -> list[str]:
+        """Get the high-frequency channels that are also queried."""
+        return [fqid for fqid in self.high_frequency_fqids if fqid in self.channel_fqids]
+
+    def _observe_device_cadence(self, measurements: list[ChannelValues]) -> None:
+        """Record the timestamp of the newest value in a poll response."""
+        timestamps = [
+            timestamp
+            for cv in measurements
+            if len(cv.values) > 0
+            and (timestamp := cv.latest_value().timestamp()) is not None
+        ]
+        if len(timestamps) > 0:
+            self.device_cadence.observe(max(timestamps))
+
+    def _check_night(self) -> bool:
+        """Check if it is currently outside the daylight window."""
+        return self.daylight_window is not None and not self.daylight_window.is_daylight(
+            dt_util.utcnow()
+        )
+
+    def get_channel_tier(self, fqid: str) -> str:
+        """Get the poll tier of a channel."""
+        tier = self.channel_tier_overrides.get(fqid)
+        if tier not in POLL_TIERS:
+            (_, channel_id) = channel_fqid_to_parts(fqid)
+            tier = default_poll_tier(channel_id)
+        return tier
+
+    def _update_schedule(self) -> None:
+        """Schedule each channel at the interval of its tier."""
+        if len(self.tier_intervals) == 0:
+            # called by set_channels before tiers are set
+            return
+
+        # with adaptive polling, the tier interval is the initial interval of a channel.
+        # high-frequency channels are polled by the high-frequency poller instead
+        high_frequency_fqids = set(self.high_frequency_fqids)
+        intervals = {
+            fqid: self.tier_intervals[self.get_channel_tier(fqid)]
+            for fqid in self.channel_fqids
+            if fqid not in high_frequency_fqids
+        }
+        # at night, PV channels are slowed down or paused. grid and battery channels are not affected
+        self._pv_fqids = set()
+        for fqid in intervals:
+            (_, channel_id) = channel_fqid_to_parts(fqid)
+            known_channel = get_known_channel(channel_id)
+            if known_channel is not None and known_channel["device_kind"] == DEVICE_KIND_PV:
+                self._pv_fqids.add(fqid)
+
+        paused = set()
+        if self.is_night:
+            for fqid in self._pv_fqids:
+                if self.night_update_interval > 0:
+                    intervals[fqid] = self.night_update_interval
+                else:
+                    paused.add(fqid)
+
+        self.scheduler.set_items(intervals)
+        self.scheduler.set_paused(paused)
+
+    def _adapt_intervals(
+        self, polled_fqids: list[str], measurements: list[ChannelValues]
+    ) -> None:
+        """Adapt the poll interval of polled channels to whether their values changed.
+
+        must be called before the measurements are merged into data.
+        """
+        # array channels return multiple values, compare them by their array channel fqid.
+        # channels without previous values keep their interval
+        changed = set()
+        known = set()
+        for cv in measurements:
+            array_fqid = channel_parts_to_fqid(
+                cv.component_id, normalize_channel_id(cv.channel_id)
+            )
+            previous = self._data_index.get(
+                channel_parts_to_fqid(cv.component_id, cv.channel_id)
+            )
+            if previous is None:
+                continue
+
+            known.add(array_fqid)
+            if _latest_value(previous) != _latest_value(cv):
+                changed.add(array_fqid)
+
+        for fqid in polled_fqids:
+            (component_id, channel_id) = channel_fqid_to_parts(fqid)
+            array_fqid = channel_parts_to_fqid(
+                component_id, normalize_channel_id(channel_id)
+            )
+            if array_fqid not in known or (self.is_night and fqid in self._pv_fqids):
+                continue
+
+            self.scheduler.set_interval(
+                fqid,
+                self.change_rate_adapter.next_interval(
+                    self.scheduler.get_interval(fqid),
+                    array_fqid in changed,
+                    initial=self.tier_intervals[self.get_channel_tier(fqid)],
+                ),
+            )
+
+    def get_poll_diagnostics(self) -> dict:
+        """Get the poll tier and effective poll interval of each channel."""
+        paused = self.scheduler.paused
+        return {
+            "effective_interval": self.effective_interval,
+            "average_poll_duration": self.poll_latency.average,
+            "skipped_polls": self.skipped_polls,
+            "device_period": (
+                self.device_cadence.period if self.device_cadence is not None else None
+            ),
+            "device_last_update": (
+                self.device_cadence.last_update
+                if self.device_cadence is not None
+                else None
+            ),
+            "tier_intervals": self.tier_intervals,
+            "high_frequency": (
+                {
+                    "interval": self.high_frequency_poller.interval,
+                    "polls": self.high_frequency_poller.polls,
+                    "skipped_ticks": self.high_frequency_poller.skipped_ticks,
+                    "yielded_ticks": self.high_frequency_poller.yielded_ticks,
+                    "errors": self.high_frequency_poller.errors,
+                }
+                if self.high_frequency_poller is not None
+                else None
+            ),
+            "adaptive": (
+                {
+                    "min_interval": self.change_rate_adapter.min_interval,
+                    "max_interval": self.change_rate_adapter.max_interval,
+                }
+                if self.change_rate_adapter is not None
+                else None
+            ),
+            "daylight": (
+                {
+                    "margin": self.daylight_window.margin,
+                    "night_update_interval": self.night_update_interval,
+                    "is_night": self.is_night,
+                }
+                if self.daylight_window is not None
+                else None
+            ),
+            "channels": {
+                fqid: (
+                    {
+                        "tier": "high_frequency",
+                        "interval": self.high_frequency_interval,
+                        "paused": False,
+                    }
+                    if fqid in self.high_frequency_fqids
+                    else {
+                        "tier": self.get_channel_tier(fqid),
+                        "interval": self.scheduler.get_interval(fqid),
+                        "paused": fqid in paused,
+                    }
+                )
+                for fqid in self.channel_fqids
+            },
+        }
+
+    def is_channel_selected(self, component_id: str, channel_id: str) -> bool:
+        """Check if a channel is part of the query.
+
+        array channels (e.g. 'Vol[2]') are selected if any channel of the same array is queried,
+        since the device returns all values of an array channel.
+        """
+        return (
+            channel_parts_to_fqid(component_id, channel_id) in self._selected_channels
+            or channel_parts_to_fqid(component_id, normalize_channel_id(channel_id))
+            in self._selected_channels
+        )
+
+    def get_channel_values(
+        self, component_id: str, channel_id: str
+    ) -> ChannelValues | None:
+        """Get the ChannelValues of a channel in data, or None if not available."""
+        return self._data_index.get(channel_parts_to_fqid(component_id, channel_id))
+
+    def _merge_data_index(self, data: list[ChannelValues]) -> None:
+        """Add or replace channel values in the fqid index of data."""
+        for cv in data:
+            self._data_index[channel_parts_to_fqid(cv.component_id, cv.channel_id)] = cv
+
+    def _update_data_index(self, data: list[ChannelValues]) -> None:
+        """Rebuild the fqid index of data."""
+        self._data_index = {
+            channel_parts_to_fqid(cv.component_id, cv.channel_id): cv for cv in data
+        }
+
+
+def _latest_value(channel_values: ChannelValues) -> float | str | None:
+    """Get the latest value of a channel, or None if it has no values."""
+    if len(channel_values.values) == 0:
+        return None
+    return channel_values.latest_value().value
+
+
+def _latest_time_value(
+    channel_values: ChannelValues,
+) -> tuple[str, float | str | None] | None:
+    """Get the time and value of the latest value of a channel, or None if it has no values."""
+    if len(channel_values.values) == 0:
+        return None
+    latest = channel_values.latest_value()
+    return (latest.time, latest.value)
@@ -0,0 +1,84 @@
+"""SMA integration diagnostics."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_HOST, CONF_USERNAME, CONF_PASSWORD
+from .session import async_find_host_resolver
+from .util import SMAEntryData
+
+TO_REDACT = {CONF_HOST, CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Get diagnostics of a config entry."""
+    entry_data: SMAEntryData | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+
+    diagnostics = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+    }
+    if entry_data is not None:
+        coordinator = entry_data.coordinator
+        diagnostics["coordinator"] = {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval is not None
+                else None
+            ),
+            "is_stale": coordinator.is_stale,
+            "poll": coordinator.get_poll_diagnostics(),
+        }
+        health = entry_data.client.health
+        resolver = async_find_host_resolver(hass, entry.data[CONF_HOST])
+        diagnostics["client"] = {
+            "offline": health.offline,
+            "consecutive_errors": health.consecutive_errors,
+            "probes": health.probes,
+            "session": {
+                "logged_in": entry_data.client.has_session,
+                "sessions_opened": entry_data.client.sessions_opened,
+                "sessions_closed": entry_data.client.sessions_closed,
+            },
+            "name_resolution": (
+                {
+                    "average_time": resolver.resolution_time.average,
+                    "resolutions": resolver.resolution_time.count,
+                    "cache_hits": resolver.cache_hits,
+                    "stale_hits": resolver.stale_hits,
+                    "failures": resolver.failures,
+                }
+                if resolver is not None
+                else None
+            ),
+            "rate_limit": {
+                "rate": entry_data.client.rate_limiter.rate,
+                "burst": entry_data.client.rate_limiter.burst,
+                "throttled": entry_data.client.rate_limiter.throttled,
+                "throttle_time": entry_data.client.rate_limiter.throttle_time,
+            },
+            "hedging": (
+                {
+                    "requests": hedger.requests,
+                    "hedges": hedger.hedges,
+                    "wins": hedger.wins,
+                    "hedge_rate": hedger.hedge_rate,
+                    "hedge_delay": hedger.hedge_delay,
+                }
+                if (hedger := entry_data.client.hedger) is not None
+                else None
+            ),
+        }
+        diagnostics["components"] = [
+            component.to_dict() for component in entry_data.all_components
+        ]
+    return diagnostics
@@ -1,5 +1,7 @@
 """Sensor platform for SMA."""
 from __future__ import annotations
+from dataclasses import replace
+from functools import cache
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -8,7 +10,8 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.const import (
     UnitOfElectricPotential,
@@ -25,12 +28,14 @@ from homeassistant.const import (
 from .coordinator import SMAUpdateCoordinator
 from .base_entity import SMAEntity
 from .util import channel_parts_to_fqid, SMAEntryData
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN, LOGGER, ATTR_STALE
 
 from .sma.model import ComponentInfo
 
 from .sma.known_channels import (
     get_known_channel,
+    load_known_channels,
+    normalize_channel_id,
     UNIT_VOLT,
     UNIT_AMPERE,
     UNIT_WATT,
@@ -60,10 +65,9 @@ async def async_setup_entry(
     """Sensor entities setup."""
     entry_data: SMAEntryData = hass.data[DOMAIN][config_entry.entry_id]
     coordinator = entry_data.coordinator
-    all_components = entry_data.all_components
 
     # ensure that coordinator and all_components are available
-    if coordinator is None or all_components is None:
+    if coordinator is None or entry_data.all_components is None:
         LOGGER.error(
             "cannot create sensor entities for config entry %s: coordinator or all_components not available",
             config_entry.entry_id,
@@ -75,24 +79,57 @@ async def async_setup_entry(
         LOGGER.warning("coordinator.config_entry was None, setting to config_entry")
         coordinator.config_entry = config_entry
 
-    # create entities based on ChannelValues in coordinator.data
-    LOGGER.info("creating %s sensor entities", len(coordinator.data))
-    async_add_entities(
-        [
-            SMASensor(
+    # load the known channels table off the event loop before it is first used
+    await hass.async_add_executor_job(load_known_channels)
+
+    # sensors by channel fqid
+    sensors: dict[str, SMASensor] = {}
+
+    @callback
+    def _async_sync_sensors() -> None:
+        """Add sensors for new ChannelValues in coordinator.data, remove sensors of deselected channels."""
+        # remove sensors of channels that are no longer queried
+        entity_registry = er.async_get(hass)
+        for fqid, sensor in list(sensors.items()):
+            if coordinator.is_channel_selected(sensor.component_id, sensor.channel_id):
+                continue
+
+            LOGGER.debug("removing sensor entity for deselected channel %s", fqid)
+            sensors.pop(fqid)
+            if sensor.entity_id in entity_registry.entities:
+                entity_registry.async_remove(sensor.entity_id)
+            else:
+                hass.async_create_task(sensor.async_remove(force_remove=True))
+
+        # create entities for ChannelValues in coordinator.data that have no sensor yet
+        components = {c.component_id: c for c in entry_data.all_components}
+        new_sensors = []
+        for channel_value in coordinator.data or []:
+            fqid = channel_parts_to_fqid(
+                channel_value.component_id, channel_value.channel_id
+            )
+            if fqid in sensors or not coordinator.is_channel_selected(
+                channel_value.component_id, channel_value.channel_id
+            ):
+                continue
+
+            sensor = SMASensor(
                 coordinator=coordinator,
                 component_id=channel_value.component_id,
                 channel_id=channel_value.channel_id,
-                component_info=next(
-                    comp
-                    for comp in all_components
-                    if comp.component_id == channel_value.component_id
-                )
-                or None,
+                component_info=components.get(channel_value.component_id, None),
             )
-            for channel_value in coordinator.data
-        ]
-    )
+            sensors[fqid] = sensor
+            new_sensors.append(sensor)
+
+        if len(new_sensors) > 0:
+            LOGGER.info("creating %s sensor entities", len(new_sensors))
+            async_add_entities(new_sensors)
+
+    # create entities based on ChannelValues in coordinator.data,
+    # and keep them in sync with the channel selection on every update
+    _async_sync_sensors()
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_sync_sensors))
 
 
 class SMASensor(SMAEntity, SensorEntity):
@@ -124,18 +161,24 @@ class SMASensor(SMAEntity, SensorEntity):
         )
         self._set_description()
 
+    async def async_added_to_hass(self) -> None:
+        """Listen for high-frequency updates of the channel, in addition to coordinator updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_channel_listener(
+                self.component_id, self.channel_id, self.async_write_ha_state
+            )
+        )
+
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        data = self.coordinator.data
-
         # find the ChannelValues of this sensor
-        channel_values = next(
-            ch_val
-            for ch_val in data
-            if ch_val.component_id == self.component_id
-            and ch_val.channel_id == self.channel_id
+        channel_values = self.coordinator.get_channel_values(
+            self.component_id, self.channel_id
         )
+        if channel_values is None:
+            return None
 
         # get latest value
         value = channel_values.latest_value().value
@@ -149,62 +192,93 @@ class SMASensor(SMAEntity, SensorEntity):
         LOGGER.debug("updated %s = %s (%s)", self.entity_id, value, type(value))
         return value
 
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Mark values restored from the last-known snapshot as stale."""
+        if self.coordinator.is_stale:
+            return {ATTR_STALE: True}
+        return None
+
     def _set_description(self) -> None:
         """Set entity description using known channels."""
         fqid = channel_parts_to_fqid(self.component_id, self.channel_id)
 
-        # get entry for known channel
-        known_channel: dict = get_known_channel(self.channel_id)
+        # get the shared description template of the channel family,
+        # only key and name are specific to this entity
+        (description, enum_values) = get_description_template(
+            normalize_channel_id(self.channel_id)
+        )
+        self.enum_values = enum_values
+        self.entity_description = replace(
+            description,
+            key=fqid,
+            name=fqid,
+        )
 
-        # values set by known channel unit
-        name = self.channel_id
-        icon = None
-        device_class = None
-        unit_of_measurement = None
-        state_class = SensorStateClass.MEASUREMENT
-        if known_channel is not None:
-            name = known_channel["name"]
 
-            icon = device_kind_to_icon(known_channel["device_kind"])
+@cache
+def get_description_template(
+    channel_family_id: str,
+) -> tuple[SensorEntityDescription, dict[int, str] | None]:
+    """Get the entity description template for a channel family.
 
-            (device_class, unit_of_measurement) = channel_to_device_class_and_unit(
-                self.channel_id, known_channel["unit"]
-            )
+    templates are computed once per (normalized) channel id and shared between all entities of that family.
 
-            state_class = cumulative_mode_to_state_class(
-                known_channel.get("cumulative_mode", CUMULATIVE_MODE_NONE)
-            )
+    :param channel_family_id: normalized channel id, see normalize_channel_id()
+    :return: (description, enum_values):
+        description is a SensorEntityDescription with key and name set to the channel family id
+        enum_values is the enum value dict for UNIT_ENUM channels, None otherwise
+    """
+    # get entry for known channel
+    known_channel: dict = get_known_channel(channel_family_id)
+
+    # values set by known channel unit
+    icon = None
+    device_class = None
+    unit_of_measurement = None
+    state_class = SensorStateClass.MEASUREMENT
+    enum_values = None
+    if known_channel is not None:
+        icon = device_kind_to_icon(known_channel["device_kind"])
+
+        (device_class, unit_of_measurement) = channel_to_device_class_and_unit(
+            channel_family_id, known_channel["unit"]
+        )
 
-            # set enum_values if known channel is UNIT_ENUM
-            if known_channel["unit"] == UNIT_ENUM:
-                self.enum_values = known_channel.get("enum_values", {})
-
-            # device class ENUM requires state class to be None
-            if device_class == SensorDeviceClass.ENUM:
-                state_class = None
-
-            LOGGER.debug(
-                "configure %s using known channel:"
-                "name=%s; icon=%s, device_class=%s, unit_of_measurement=%s, state_class=%s",
-                fqid,
-                name,
-                icon,
-                device_class,
-                unit_of_measurement,
-                state_class,
-            )
-        else:
-            LOGGER.debug("configure %s as generic sensor", fqid)
+        state_class = cumulative_mode_to_state_class(
+            known_channel.get("cumulative_mode", CUMULATIVE_MODE_NONE)
+        )
 
-        # set entity description
-        self.entity_description = SensorEntityDescription(
-            key=fqid,
-            name=fqid,  # name,
-            icon=icon,
-            device_class=device_class,
-            native_unit_of_measurement=unit_of_measurement,
-            state_class=state_class,
+        # set enum_values if known channel is UNIT_ENUM
+        if known_channel["unit"] == UNIT_ENUM:
+            enum_values = known_channel.get("enum_values", {})
+
+        # device class ENUM requires state class to be None
+        if device_class == SensorDeviceClass.ENUM:
+            state_class = None
+
+        LOGGER.debug(
+            "configure %s using known channel:"
+            "name=%s; icon=%s, device_class=%s, unit_of_measurement=%s, state_class=%s",
+            channel_family_id,
+            known_channel["name"],
+            icon,
+            device_class,
+            unit_of_measurement,
+            state_class,
         )
+    else:
+        LOGGER.debug("configure %s as generic sensor", channel_family_id)
+
+    description = SensorEntityDescription(
+        key=channel_family_id,
+        name=channel_family_id,
+        icon=icon,
+        device_class=device_class,
+        native_unit_of_measurement=unit_of_measurement,
+        state_class=state_class,
+    )
+    return (description, enum_values)
 
 
 def device_kind_to_icon(device_kind: str) -> str:
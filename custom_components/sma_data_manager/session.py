@@ -0,0 +1,157 @@
+"""HTTP sessions for SMA hosts, shared by all clients of a host.
+
+sessions are closed when no loaded entry uses them any more, and when Home Assistant stops.
+"""
+from __future__ import annotations
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import ssl as ssl_util
+
+from .const import (
+    CONF_VERIFY_SSL,
+    DOMAIN,
+    DNS_CACHE_TTL,
+    HOST_CONNECTION_LIMIT,
+    HOST_KEEPALIVE_TIMEOUT,
+)
+from .sma.ratelimit import TokenBucketLimiter
+from .sma.resolver import CachingResolver
+
+# sessions by (host, verify_ssl), in hass.data
+DATA_HOST_SESSIONS = f"{DOMAIN}_host_sessions"
+
+# resolvers by host, in hass.data
+DATA_HOST_RESOLVERS = f"{DOMAIN}_host_resolvers"
+
+# rate limiters by host, in hass.data
+DATA_HOST_LIMITERS = f"{DOMAIN}_host_limiters"
+
+
+@callback
+def async_get_host_session(
+    hass: HomeAssistant, host: str, verify_ssl: bool
+) -> aiohttp.ClientSession:
+    """Get the HTTP session of a SMA host, creating it if needed.
+
+    every host gets its own connection pool, so keep-alive connections are reused between
+    setup, polls and the config and options flows, and a busy host does not use up the connections of others.
+    the session has no cookie jar, the session cookie of the device is handled by the client.
+    the session is closed by async_release_host() or when Home Assistant stops.
+    """
+    sessions = _async_get_sessions(hass)
+    session = sessions.get((host, verify_ssl))
+    if session is not None and not session.closed:
+        return session
+
+    connector = aiohttp.TCPConnector(
+        # names are cached by the host resolver
+        resolver=async_get_host_resolver(hass, host),
+        use_dns_cache=False,
+        limit=HOST_CONNECTION_LIMIT,
+        keepalive_timeout=HOST_KEEPALIVE_TIMEOUT,
+        # new connections do a full TLS handshake, only open keep-alive connections are reused
+        ssl=ssl_util.client_context() if verify_ssl else False,
+        enable_cleanup_closed=True,
+    )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        json_serialize=json_dumps,
+    )
+    sessions[(host, verify_ssl)] = session
+    return session
+
+
+@callback
+def async_get_host_limiter(hass: HomeAssistant, host: str) -> TokenBucketLimiter:
+    """Get the rate limiter of a SMA host, creating an unlimited one if needed.
+
+    all clients of a host share the limiter, it is configured by the options of the entry of the host.
+    """
+    limiters: dict[str, TokenBucketLimiter] = hass.data.setdefault(
+        DATA_HOST_LIMITERS, {}
+    )
+    limiter = limiters.get(host)
+    if limiter is None:
+        limiter = limiters[host] = TokenBucketLimiter()
+    return limiter
+
+
+async def async_release_host(hass: HomeAssistant, host: str) -> None:
+    """Close the sessions, resolver and rate limiter of a SMA host that are not used by a loaded entry any more.
+
+    call after the clients of the host using them are done, e.g. after logging out on unload.
+    """
+    in_use = {
+        (entry_data.client.host, entry_data.applied_data[CONF_VERIFY_SSL])
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+    }
+    sessions = hass.data.get(DATA_HOST_SESSIONS, {})
+    for key in [key for key in sessions if key[0] == host and key not in in_use]:
+        await sessions.pop(key).close()
+
+    if all(used_host != host for (used_host, _) in in_use):
+        hass.data.get(DATA_HOST_LIMITERS, {}).pop(host, None)
+        # all sessions of the host are closed, so their connectors no longer use the resolver
+        resolver = hass.data.get(DATA_HOST_RESOLVERS, {}).pop(host, None)
+        if resolver is not None:
+            await resolver.close()
+
+
+@callback
+def _async_get_sessions(
+    hass: HomeAssistant,
+) -> dict[tuple[str, bool], aiohttp.ClientSession]:
+    """Get the sessions by (host, verify_ssl), closing all of them when Home Assistant stops."""
+    if DATA_HOST_SESSIONS not in hass.data:
+        sessions: dict[tuple[str, bool], aiohttp.ClientSession] = {}
+        hass.data[DATA_HOST_SESSIONS] = sessions
+
+        async def _async_close_sessions(event: Event) -> None:
+            """Close all sessions and their connections."""
+            for session in sessions.values():
+                await session.close()
+            sessions.clear()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_sessions)
+    return hass.data[DATA_HOST_SESSIONS]
+
+
+@callback
+def async_get_host_resolver(hass: HomeAssistant, host: str) -> CachingResolver:
+    """Get the name resolver of a SMA host, creating it if needed.
+
+    resolved addresses are cached, and the last known addresses are used while name resolution fails.
+    """
+    resolvers = _async_get_resolvers(hass)
+    resolver = resolvers.get(host)
+    if resolver is None:
+        resolver = resolvers[host] = CachingResolver(ttl=DNS_CACHE_TTL)
+    return resolver
+
+
+@callback
+def async_find_host_resolver(hass: HomeAssistant, host: str) -> CachingResolver | None:
+    """Get the name resolver of a SMA host if it exists, without creating it."""
+    return hass.data.get(DATA_HOST_RESOLVERS, {}).get(host)
+
+
+@callback
+def _async_get_resolvers(hass: HomeAssistant) -> dict[str, CachingResolver]:
+    """Get the resolvers by host, closing all of them when Home Assistant stops."""
+    if DATA_HOST_RESOLVERS not in hass.data:
+        resolvers: dict[str, CachingResolver] = {}
+        hass.data[DATA_HOST_RESOLVERS] = resolvers
+
+        async def _async_close_resolvers(event: Event) -> None:
+            """Close all resolvers."""
+            for resolver in resolvers.values():
+                await resolver.close()
+            resolvers.clear()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_resolvers)
+    return hass.data[DATA_HOST_RESOLVERS]
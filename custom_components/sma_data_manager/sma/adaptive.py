@@ -0,0 +1,64 @@
+"""SMA adaptive polling: adapt poll intervals to how often values change."""
+from __future__ import annotations
+
+
+class ChangeRateAdapter:
+    """adapts the poll interval of an item to how often its value changes.
+
+    the interval shrinks quickly when the value changed since the last poll,
+    and grows slowly while it stays the same. intervals are kept within the bounds,
+    which are widened to include the initial interval of the item, e.g. its configured interval.
+    """
+
+    # bounds of the interval, in seconds
+    min_interval: float
+    max_interval: float
+
+    # factor applied to the interval when the value changed
+    speedup: float
+
+    # factor applied to the interval when the value did not change
+    slowdown: float
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        speedup: float = 0.5,
+        slowdown: float = 1.5,
+    ) -> None:
+        """Initialize change rate adapter."""
+        if min_interval > max_interval:
+            raise ValueError("min_interval must not be greater than max_interval")
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.speedup = speedup
+        self.slowdown = slowdown
+
+    def clamp(self, interval: float, initial: float | None = None) -> float:
+        """Clamp an interval to the bounds.
+
+        :param initial: initial interval of the item. if it is outside the bounds, the bounds are
+            widened to include it, so e.g. an item configured above the maximum is not polled more often
+            while its value stays the same
+        """
+        lower = self.min_interval
+        upper = self.max_interval
+        if initial is not None:
+            lower = min(lower, initial)
+            upper = max(upper, initial)
+        return min(max(interval, lower), upper)
+
+    def next_interval(
+        self, interval: float, changed: bool, initial: float | None = None
+    ) -> float:
+        """Get the interval to use after a poll.
+
+        :param interval: the interval used for the poll
+        :param changed: did the value change since the previous poll?
+        :param initial: initial interval of the item, see clamp()
+        """
+        return self.clamp(
+            interval * (self.speedup if changed else self.slowdown), initial
+        )
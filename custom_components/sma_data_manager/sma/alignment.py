@@ -0,0 +1,67 @@
+"""SMA poll alignment: infer when the device updates its values, and poll just after."""
+from __future__ import annotations
+
+from collections import deque
+import math
+
+
+class DeviceCadence:
+    """infers the update period and phase of the device from the timestamps of successive values.
+
+    timestamps are POSIX timestamps in seconds, as returned by TimeValuePair.timestamp().
+    """
+
+    # minimum number of distinct timestamps before a period is inferred
+    MIN_OBSERVATIONS = 3
+
+    # most recent distinct timestamps, ascending
+    _timestamps: deque[float]
+
+    def __init__(self, window: int = 10) -> None:
+        """Initialize device cadence.
+
+        :param window: number of recent distinct timestamps used to infer the period
+        """
+        self._timestamps = deque(maxlen=window)
+
+    def observe(self, timestamp: float) -> None:
+        """Record the timestamp of the latest value returned by the device.
+
+        timestamps not newer than the last recorded one are ignored.
+        """
+        if len(self._timestamps) == 0 or timestamp > self._timestamps[-1]:
+            self._timestamps.append(timestamp)
+
+    @property
+    def period(self) -> float | None:
+        """Get the update period of the device in seconds, or None if not enough timestamps were observed.
+
+        polls may miss device updates, so the differences between timestamps are multiples of the period.
+        the smallest difference is the best estimate.
+        """
+        if len(self._timestamps) < self.MIN_OBSERVATIONS:
+            return None
+
+        timestamps = list(self._timestamps)
+        return min(b - a for (a, b) in zip(timestamps, timestamps[1:]))
+
+    @property
+    def last_update(self) -> float | None:
+        """Get the time of the last observed device update, or None if nothing was observed."""
+        if len(self._timestamps) == 0:
+            return None
+        return self._timestamps[-1]
+
+    def align(self, target: float, lag: float) -> float | None:
+        """Get the time of the first expected device update at or after the target, plus the lag.
+
+        :param target: the earliest time to poll
+        :param lag: time to wait after the expected device update, in seconds
+        :return: the aligned poll time, or None if the period is not known yet
+        """
+        period = self.period
+        if period is None or period <= 0:
+            return None
+
+        periods = math.ceil((target - lag - self._timestamps[-1]) / period)
+        return self._timestamps[-1] + periods * period + lag
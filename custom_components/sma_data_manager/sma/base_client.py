@@ -8,11 +8,14 @@ import socket
 import aiohttp
 import async_timeout
 
+from .deadline import remaining_time
+from .ratelimit import TokenBucketLimiter
 from .model import (
     AuthTokenInfo,
     SMAApiAuthenticationError,
     SMAApiCommunicationError,
     SMAApiClientError,
+    SMAApiDeadlineExceededError,
 )
 
 
@@ -35,10 +38,15 @@ class SMABaseClient:
 
     _host: str
 
+    _root_url: str
+
     _base_url: str
 
     _request_timeout: int
 
+    # rate limiter of the host, shared with all other clients of the host
+    _rate_limiter: TokenBucketLimiter
+
     _logger: Logger
 
     def __init__(
@@ -48,12 +56,21 @@ class SMABaseClient:
         session: aiohttp.ClientSession,
         request_timeout: int = 10,
         logger: Logger | None = None,
+        rate_limiter: TokenBucketLimiter | None = None,
     ) -> None:
-        """Initialize the client."""
+        """Initialize the client.
+
+        :param rate_limiter: rate limiter of the host, shared with other clients of the host.
+            defaults to an unlimited limiter of this client
+        """
         self._host = host
-        self._base_url = f"http{'s' if use_ssl else ''}://{self._host}/api/v1"
+        self._root_url = f"http{'s' if use_ssl else ''}://{self._host}"
+        self._base_url = f"{self._root_url}/api/v1"
         self._session = session
         self._request_timeout = request_timeout
+        self._rate_limiter = (
+            rate_limiter if rate_limiter is not None else TokenBucketLimiter()
+        )
 
         self._logger = logger if logger is not None else DummyLogger()
 
@@ -65,15 +82,36 @@ class SMABaseClient:
         headers: dict | None = None,
         as_json: bool = True,
     ) -> aiohttp.ClientResponse:
-        """Make a request to a api endpoint."""
+        """Make a request to a api endpoint.
+
+        the request timeout is shortened to the time left until the deadline of the current operation, if any.
+        requests wait for the rate limiter of the host first, in the priority of the current context.
+        """
 
         # build full request url
         url = f"{self._base_url}/{endpoint}"
 
+        # wait for the rate limiter, but not past the deadline
+        try:
+            async with async_timeout.timeout(remaining_time()):
+                await self._rate_limiter.acquire()
+        except asyncio.TimeoutError as exception:
+            raise SMAApiDeadlineExceededError(
+                f"deadline passed while waiting to fetch {url}"
+            ) from exception
+
+        # limit the timeout to the remaining time of the operation
+        timeout = self._request_timeout
+        remaining = remaining_time()
+        if remaining is not None:
+            if remaining <= 0:
+                raise SMAApiDeadlineExceededError(f"deadline passed before fetching {url}")
+            timeout = min(timeout, remaining)
+
         # make the request
         try:
             # self._logger.debug(f"requesting {url}")
-            async with async_timeout.timeout(self._request_timeout):
+            async with async_timeout.timeout(timeout):
                 response = await self._session.request(
                     method=method,
                     url=url,
@@ -84,7 +122,8 @@ class SMABaseClient:
                     data=data if not as_json else None,
                 )
 
-                # remove any cookies set by the request, we handle them manually
+                # remove any cookies set by the request, we handle them manually.
+                # a no-op for sessions without a cookie jar
                 self._session.cookie_jar.clear_domain(self._host)
 
                 # check for 401/403 unauthorized
@@ -100,6 +139,11 @@ class SMABaseClient:
         except SMAApiClientError as exception:
             raise exception
         except asyncio.TimeoutError as exception:
+            if timeout < self._request_timeout:
+                raise SMAApiDeadlineExceededError(
+                    f"deadline passed while fetching {url}",
+                    request_timed_out=True,
+                ) from exception
             raise SMAApiCommunicationError(
                 f"timeout fetching {url}",
             ) from exception
@@ -110,6 +154,21 @@ class SMABaseClient:
         except Exception as exception:  # pylint: disable=broad-except
             raise SMAApiClientError(f"error fetching {url}") from exception
 
+    async def probe(self, timeout: float) -> bool:
+        """Check if the host responds at all, with a short timeout.
+
+        requests the web interface root, any HTTP response counts.
+        """
+        try:
+            async with async_timeout.timeout(timeout), self._session.get(
+                f"{self._root_url}/", allow_redirects=False
+            ):
+                return True
+        except (asyncio.TimeoutError, aiohttp.ClientError, socket.gaierror):
+            return False
+        finally:
+            self._session.cookie_jar.clear_domain(self._host)
+
     def update_session_id(self, response: aiohttp.ClientResponse) -> None:
         """Update the session id."""
         session_cookie = response.cookies.get("JSESSIONID")
@@ -165,3 +224,18 @@ class SMABaseClient:
     def host(self) -> str:
         """Get the host."""
         return self._host
+
+    @property
+    def rate_limiter(self) -> TokenBucketLimiter:
+        """Get the rate limiter of the host."""
+        return self._rate_limiter
+
+    @property
+    def request_timeout(self) -> int:
+        """Get the timeout of a single request, in seconds."""
+        return self._request_timeout
+
+    @request_timeout.setter
+    def request_timeout(self, request_timeout: int) -> None:
+        """Set the timeout of a single request, in seconds."""
+        self._request_timeout = request_timeout
@@ -0,0 +1,234 @@
+"""SMA channel catalogue: all channels available on a plant."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from .client import SMAApiClient
+from .known_channels import DEVICE_KIND_OTHER, get_known_channel
+from .model import ChannelValues, ComponentInfo, SMAApiClientError
+
+
+class ChannelCatalogueEntry:
+    """a channel available on a component."""
+
+    component_id: str
+    component_name: str | None
+    channel_id: str
+
+    # DEVICE_KIND_* of the known channel, DEVICE_KIND_OTHER for unknown channels
+    device_kind: str
+
+    def __init__(
+        self, component_id: str, component_name: str | None, channel_id: str
+    ) -> None:
+        """Initialize channel catalogue entry."""
+        self.component_id = component_id
+        self.component_name = component_name
+        self.channel_id = channel_id
+
+        known_channel = get_known_channel(channel_id)
+        self.device_kind = (
+            known_channel["device_kind"]
+            if known_channel is not None
+            else DEVICE_KIND_OTHER
+        )
+
+
+class ChannelCatalogue:
+    """all channels available on a plant, at the time it was fetched."""
+
+    entries: list[ChannelCatalogueEntry]
+
+    fetched_at: float
+
+    # ids of components whose channels could not be fetched.
+    # if not empty, the catalogue is incomplete
+    missing_component_ids: list[str]
+
+    # name of each component with channels in the catalogue, by component id
+    component_names: dict[str, str | None]
+
+    # entries by component id and by device kind
+    _by_component: dict[str, list[ChannelCatalogueEntry]]
+    _by_device_kind: dict[str, list[ChannelCatalogueEntry]]
+
+    def __init__(
+        self,
+        entries: list[ChannelCatalogueEntry],
+        missing_component_ids: list[str] | None = None,
+    ) -> None:
+        """Initialize channel catalogue."""
+        self.entries = entries
+        self.fetched_at = time.monotonic()
+        self.missing_component_ids = (
+            missing_component_ids if missing_component_ids is not None else []
+        )
+
+        # build indices once, so the options flow can group and filter large catalogues cheaply
+        self.component_names = {}
+        self._by_component = {}
+        self._by_device_kind = {}
+        for entry in entries:
+            self.component_names[entry.component_id] = entry.component_name
+            self._by_component.setdefault(entry.component_id, []).append(entry)
+            self._by_device_kind.setdefault(entry.device_kind, []).append(entry)
+
+    def count_by_component(self) -> dict[str, int]:
+        """Get the number of channels of each component, by component id."""
+        return {cid: len(entries) for cid, entries in self._by_component.items()}
+
+    def count_by_device_kind(self) -> dict[str, int]:
+        """Get the number of channels of each device kind."""
+        return {kind: len(entries) for kind, entries in self._by_device_kind.items()}
+
+    def filter(
+        self,
+        component_id: str | None = None,
+        device_kind: str | None = None,
+        prefix: str | None = None,
+    ) -> list[ChannelCatalogueEntry]:
+        """Get the entries matching all given filters, in catalogue order.
+
+        :param component_id: only channels of this component
+        :param device_kind: only channels of this DEVICE_KIND_*
+        :param prefix: only channels whose channel id starts with this prefix (case-insensitive)
+        """
+        if component_id is not None:
+            entries = self._by_component.get(component_id, [])
+            if device_kind is not None:
+                entries = [e for e in entries if e.device_kind == device_kind]
+        elif device_kind is not None:
+            entries = self._by_device_kind.get(device_kind, [])
+        else:
+            entries = self.entries
+
+        if prefix:
+            prefix = prefix.lower()
+            entries = [e for e in entries if e.channel_id.lower().startswith(prefix)]
+        return list(entries)
+
+    @property
+    def is_complete(self) -> bool:
+        """Check if the channels of all components are included."""
+        return len(self.missing_component_ids) == 0
+
+    @property
+    def age(self) -> float:
+        """Get the age of the catalogue, in seconds."""
+        return time.monotonic() - self.fetched_at
+
+    @classmethod
+    def from_measurements(
+        cls,
+        components: list[ComponentInfo],
+        measurements: list[ChannelValues],
+        missing_component_ids: list[str] | None = None,
+    ) -> ChannelCatalogue:
+        """Create from the live measurements of all components.
+
+        channels without a value in their latest measurement are not included.
+        """
+        component_names = {c.component_id: c.name for c in components}
+        return cls(
+            [
+                ChannelCatalogueEntry(
+                    component_id=cv.component_id,
+                    component_name=component_names.get(cv.component_id, None),
+                    channel_id=cv.channel_id,
+                )
+                for cv in measurements
+                if len(cv.values) > 0 and cv.latest_value().value is not None
+            ],
+            missing_component_ids=missing_component_ids,
+        )
+
+
+class ChannelCatalogueCache:
+    """cache for a channel catalogue, valid for a limited time."""
+
+    ttl: float
+
+    _catalogue: ChannelCatalogue | None = None
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize channel catalogue cache.
+
+        :param ttl: time in seconds a cached catalogue stays valid
+        """
+        self.ttl = ttl
+
+    def get(self) -> ChannelCatalogue | None:
+        """Get the cached catalogue, or None if nothing is cached or the cached catalogue expired."""
+        if self._catalogue is None or self._catalogue.age > self.ttl:
+            return None
+        return self._catalogue
+
+    def set(self, catalogue: ChannelCatalogue) -> None:
+        """Cache a catalogue."""
+        self._catalogue = catalogue
+
+    def invalidate(self) -> None:
+        """Drop the cached catalogue."""
+        self._catalogue = None
+
+
+async def fetch_channel_catalogue(
+    client: SMAApiClient,
+    components: list[ComponentInfo],
+    timeout: float | None = None,
+) -> ChannelCatalogue:
+    """Fetch the channel catalogue of the given components.
+
+    the live measurements of all components are fetched concurrently, and the catalogue is built
+    up as components complete. components that fail or do not complete within the timeout are
+    left out, and listed in missing_component_ids of the returned catalogue.
+
+    the client must be logged in.
+
+    :param timeout: time in seconds to wait for all components, None to wait indefinitely
+    :raises SMAApiClientError: if the channels of no component could be fetched
+    """
+    measurements_by_component: dict[str, list[ChannelValues]] = {}
+
+    async def _fetch_component(component_id: str) -> None:
+        measurements_by_component[component_id] = (
+            await client.get_all_live_measurements(component_ids=[component_id])
+        )
+
+    tasks = {
+        asyncio.create_task(_fetch_component(component.component_id)): component
+        for component in components
+    }
+    if len(tasks) == 0:
+        return ChannelCatalogue([])
+
+    (done, pending) = await asyncio.wait(tasks.keys(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    # collect failed components, raise if no component succeeded
+    first_exception = None
+    for task in done:
+        exception = task.exception()
+        if exception is not None and first_exception is None:
+            first_exception = exception
+    if len(measurements_by_component) == 0:
+        if first_exception is not None:
+            raise first_exception
+        raise SMAApiClientError("timeout fetching channel catalogue")
+
+    # assemble in component order, so the catalogue is stable between fetches
+    return ChannelCatalogue.from_measurements(
+        components,
+        [
+            measurement
+            for component in components
+            for measurement in measurements_by_component.get(component.component_id, [])
+        ],
+        missing_component_ids=[
+            component.component_id
+            for component in components
+            if component.component_id not in measurements_by_component
+        ],
+    )
@@ -1,11 +1,14 @@
 """SMA API Client."""
 from __future__ import annotations
+from collections.abc import Awaitable, Callable
 from urllib.parse import quote
 from datetime import timedelta
 import contextlib
 from logging import Logger
 from itertools import chain
 
+import asyncio
+import time
 import aiohttp
 
 from .model import (
@@ -13,17 +16,25 @@ from .model import (
     ChannelValues,
     ComponentInfo,
     LiveMeasurementQueryItem,
+    PreparedLiveMeasurementQuery,
     SMAApiAuthenticationError,
     SMAApiCommunicationError,
     SMAApiParsingError,
     SMAApiClientError,
+    SMAApiDeadlineExceededError,
 )
 from .base_client import SMABaseClient
+from .health import HostHealth
+from .hedging import RequestHedger
+from .ratelimit import TokenBucketLimiter
 
 LOGIN_RESULT_ALREADY_LOGGED_IN = "already_logged_in"
 LOGIN_RESULT_TOKEN_REFRESHED = "token_refreshed"
 LOGIN_RESULT_NEW_TOKEN = "new_token"
 
+# timeout of a probe while the host is offline, in seconds
+PROBE_TIMEOUT = 2
+
 
 class SMAApiClient(SMABaseClient):
     """API Client for SMA Data Manager M and compatible."""
@@ -33,6 +44,28 @@ class SMAApiClient(SMABaseClient):
 
     _request_retries: int
 
+    _login_lock: asyncio.Lock
+
+    # reachability of the host. while it is offline, requests fail fast
+    health: HostHealth
+
+    # hedges live measurement requests, None if disabled
+    hedger: RequestHedger | None = None
+
+    # headers of measurement requests, with the session they belong to
+    _cached_headers: tuple[tuple, dict] | None = None
+
+    # called after the session changed by a login, token refresh or logout, e.g. to persist it
+    on_session_changed: Callable[[], None] | None = None
+
+    # number of sessions opened with username and password, and number of sessions logged out.
+    # the client owns at most one session, older sessions are logged out before they are replaced
+    sessions_opened: int = 0
+    sessions_closed: int = 0
+
+    # set by close(), no new sessions are opened afterwards
+    _closed: bool = False
+
     def __init__(
         self,
         host: str,
@@ -43,6 +76,7 @@ class SMAApiClient(SMABaseClient):
         request_timeout: int = 10,
         request_retries: int = 3,
         logger: Logger | None = None,
+        rate_limiter: TokenBucketLimiter | None = None,
     ) -> None:
         """SMA Data Manager M API Client."""
         super().__init__(
@@ -51,24 +85,106 @@ class SMAApiClient(SMABaseClient):
             use_ssl=use_ssl,
             request_timeout=request_timeout,
             logger=logger,
+            rate_limiter=rate_limiter,
         )
 
         self._username = username
         self._password = password
 
         self._request_retries = request_retries
+        self._login_lock = asyncio.Lock()
+        self.health = HostHealth()
+
+    @property
+    def request_retries(self) -> int:
+        """Get the number of retries of a failed request."""
+        return self._request_retries
+
+    @request_retries.setter
+    def request_retries(self, request_retries: int) -> None:
+        """Set the number of retries of a failed request."""
+        self._request_retries = request_retries
+
+    @property
+    def has_session(self) -> bool:
+        """Check if the client holds a session on the device."""
+        return self._auth_data is not None and self._session_id is not None
+
+    @property
+    def needs_login(self) -> bool:
+        """Check if login() would have to request or refresh a token."""
+        return (
+            self._auth_data is None
+            or self._auth_data.time_until_expiration <= timedelta(minutes=5)
+        )
 
     async def login(self) -> str:
         """Login to the api.
 
+        concurrent calls are serialized, so callers running in parallel share one login.
+
         :returns: login result, one of LOGIN_RESULT_* constants
         """
+        async with self._login_lock:
+            result = await self._login()
+
+        if result != LOGIN_RESULT_ALREADY_LOGGED_IN:
+            self._notify_session_changed()
+        return result
+
+    async def _reauthenticate(self, failed_session: tuple) -> None:
+        """Replace a session that was rejected by the device.
+
+        serialized with login(), so concurrent requests rejected with the same session
+        (e.g. a request and its hedge) share one new session instead of logging out each other's.
+
+        :param failed_session: (auth data, session id) the rejected request was sent with
+        """
+        async with self._login_lock:
+            if (self._auth_data, self._session_id) == failed_session:
+                await self.logout()
+            result = await self._login()
+
+        if result != LOGIN_RESULT_ALREADY_LOGGED_IN:
+            self._notify_session_changed()
+
+    def export_session(self) -> dict | None:
+        """Export the current session and token, to restore them with restore_session().
+
+        :returns: the session, or None if not logged in
+        """
+        if self._auth_data is None or self._session_id is None:
+            return None
+        return {
+            "session_id": self._session_id,
+            "auth": self._auth_data.to_dict(),
+        }
+
+    def restore_session(self, data: dict) -> None:
+        """Restore a session exported with export_session().
+
+        the session is not verified. the next login() refreshes the token if it expired,
+        and falls back to username and password if the refresh fails.
+
+        :raises SMAApiParsingError: if the data is not a valid session
+        """
+        if not isinstance(data, dict) or not isinstance(data.get("session_id"), str):
+            raise SMAApiParsingError("missing or invalid session id in session")
+        auth_data = AuthTokenInfo.from_dict(data.get("auth"))
+
+        self._auth_data = auth_data
+        self._session_id = data["session_id"]
+        self._logger.debug(
+            "restored session, token expires in %s s", auth_data.seconds_until_expiration
+        )
+
+    async def _login(self) -> str:
+        """Login to the api, see login()."""
+        if self._closed:
+            raise SMAApiClientError("client is closed")
 
         # if already logged in and token is still valid for at least 5 minutes, do nothing
-        if (
-            self._auth_data is not None
-            and self._auth_data.time_until_expiration > timedelta(minutes=5)
-        ):
+        if not self.needs_login:
             self._logger.debug("already logged in, skipping login")
             return LOGIN_RESULT_ALREADY_LOGGED_IN
 
@@ -80,14 +196,18 @@ class SMAApiClient(SMABaseClient):
                 )
                 self._logger.debug("refreshed token successfully")
                 return LOGIN_RESULT_TOKEN_REFRESHED
-            except SMAApiClientError:
-                # refresh failed, try to re-login with username and password
-                self._logger.debug("failed to refresh token, trying to re-login")
+            except SMAApiAuthenticationError:
+                # refresh token rejected, try to re-login with username and password.
+                # the new login replaces the session, so log the old one out first.
+                # other errors (e.g. timeouts) are raised, the session may still be valid
+                self._logger.debug("refresh token rejected, trying to re-login")
+                await self.logout()
 
         # if all else fails, get a new token using username and password
         if self._username is None or self._password is None:
             raise ValueError("username and password are required for login")
         self._auth_data = await self._get_new_token(self._username, self._password)
+        self.sessions_opened += 1
         self._logger.debug("got new token successfully")
         return LOGIN_RESULT_NEW_TOKEN
 
@@ -141,8 +261,9 @@ class SMAApiClient(SMABaseClient):
         return AuthTokenInfo.from_dict(token_data)
 
     async def logout(self) -> None:
-        """Logout from the api."""
-        self.require_session()
+        """Logout from the api, ending the session on the device. does nothing if there is no session."""
+        if not self.has_session:
+            return
 
         self._logger.debug("logging out")
 
@@ -151,11 +272,24 @@ class SMAApiClient(SMABaseClient):
             await self.make_request(
                 method="DELETE",
                 endpoint=f"refreshtoken?refreshToken={quote(self._auth_data.refresh_token)}",
+                headers=self._auth_headers,
             )
 
         # clear auth data
         self._auth_data = None
         self._session_id = None
+        self.sessions_closed += 1
+        self._notify_session_changed()
+
+    async def close(self) -> None:
+        """Logout and stop opening new sessions, for a client that is no longer used."""
+        self._closed = True
+        await self.logout()
+
+    def _notify_session_changed(self) -> None:
+        """Call the session changed callback, if any."""
+        if self.on_session_changed is not None:
+            self.on_session_changed()
 
     async def get_all_components(self) -> list[ComponentInfo]:
         """Get a list of all available components and their ids."""
@@ -257,6 +391,29 @@ class SMAApiClient(SMABaseClient):
     ) -> list[ChannelValues]:
         """Get live data for the requested channels."""
         payload = [item.to_dict() for item in query]
+
+        async def _request() -> list[dict]:
+            measurements_response = await self.make_request(
+                method="POST",
+                endpoint="measurements/live",
+                data=payload,
+                headers={
+                    **self._auth_headers,
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                },
+                as_json=True,
+            )
+            return await measurements_response.json()
+
+        measurements = await self._run_hedged(_request)
+        return self._parse_measurements(measurements)
+
+    async def measure_live_measurements(
+        self, query: list[LiveMeasurementQueryItem]
+    ) -> tuple[list[ChannelValues], int]:
+        """Get live data for the requested channels, along with the size of the response body in bytes."""
+        payload = [item.to_dict() for item in query]
         measurements_response = await self.make_request(
             method="POST",
             endpoint="measurements/live",
@@ -269,8 +426,65 @@ class SMAApiClient(SMABaseClient):
             as_json=True,
         )
 
+        # read the body first, json() reuses it
+        body = await measurements_response.read()
         measurements = await measurements_response.json()
-        return self._parse_measurements(measurements)
+        return (self._parse_measurements(measurements), len(body))
+
+    def prepare_live_measurements(
+        self, query: list[LiveMeasurementQueryItem]
+    ) -> PreparedLiveMeasurementQuery:
+        """Prepare a query for get_prepared_live_measurements()."""
+        return PreparedLiveMeasurementQuery(query)
+
+    async def get_prepared_live_measurements(
+        self, query: PreparedLiveMeasurementQuery
+    ) -> list[ChannelValues]:
+        """Get the latest live data for a prepared query.
+
+        lean variant of get_live_measurements() for frequent polling: the request body is encoded once,
+        the request headers are reused while the session does not change,
+        and only the latest value of each channel is parsed.
+        """
+        async def _request() -> list[dict]:
+            measurements_response = await self.make_request(
+                method="POST",
+                endpoint="measurements/live",
+                data=query.body,
+                headers=self._live_measurements_headers,
+                as_json=False,  # body is already encoded
+            )
+            return await measurements_response.json()
+
+        measurements = await self._run_hedged(_request)
+        if not isinstance(measurements, list):
+            raise SMAApiClientError("received invalid response: not a list")
+        return [
+            cv
+            for measurement in measurements
+            for cv in ChannelValues.from_dict(measurement, latest_only=True)
+        ]
+
+    async def _run_hedged(self, request: Callable[[], Awaitable[list[dict]]]) -> list[dict]:
+        """Run an idempotent request, hedged if hedging is enabled."""
+        if self.hedger is None:
+            return await request()
+        return await self.hedger.run(request)
+
+    @property
+    def _live_measurements_headers(self) -> dict:
+        """Get the headers of a measurements request, rebuilt only when the session changes."""
+        key = (self._auth_data, self._session_id)
+        if self._cached_headers is None or self._cached_headers[0] != key:
+            self._cached_headers = (
+                key,
+                {
+                    **self._auth_headers,
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                },
+            )
+        return self._cached_headers[1]
 
     def _parse_measurements(self, measurements: list[dict]) -> list[ChannelValues]:
         """Convert raw measurements response to python model."""
@@ -294,12 +508,23 @@ class SMAApiClient(SMABaseClient):
         headers: dict | None = None,
         as_json: bool = True,
     ) -> aiohttp.ClientResponse:
-        """Make a request to an API endpoint, handling re-auth and retries."""
+        """Make a request to an API endpoint, handling re-auth and retries.
+
+        while the host is offline, requests fail without being sent, except when a probe is due
+        and the host responds to it.
+        """
         make_request_impl = super().make_request
+        await self._check_offline()
+
+        # set if an attempt got no response from the host, even if the deadline ended the request
+        host_failed = False
 
         async def _make_request_w(
             tries: int = 0, did_reauth: bool = False
         ) -> aiohttp.ClientResponse:
+            nonlocal host_failed, headers
+            # session the request is sent with, to tell if it is still current on an auth error
+            session = (self._auth_data, self._session_id)
             try:
                 self._logger.debug(f"requesting {endpoint} ({tries})")
                 return await make_request_impl(method, endpoint, data, headers, as_json)
@@ -318,8 +543,10 @@ class SMAApiClient(SMABaseClient):
                     )
 
                     try:
-                        await self.logout()
-                        await self.login()
+                        await self._reauthenticate(session)
+                    except SMAApiDeadlineExceededError:
+                        # re-login ran out of time, credentials may still be valid
+                        raise
                     except SMAApiClientError as reauth_exception:
                         # re-login failed, raise original exception
                         self._logger.debug(
@@ -327,20 +554,76 @@ class SMAApiClient(SMABaseClient):
                         )
                         raise exception from None
 
-                    # re-login ok, try again
+                    # re-login ok, try again with the new session
+                    if headers is not None and "Authorization" in headers:
+                        headers = {**headers, **self._auth_headers}
                     return await _make_request_w(tries=tries + 1, did_reauth=True)
                 else:
                     raise exception
+            except SMAApiDeadlineExceededError as exception:
+                # no time left for a retry
+                host_failed = host_failed or exception.request_timed_out
+                raise
             except (
                 SMAApiCommunicationError,
                 SMAApiParsingError,
                 SMAApiClientError,
             ) as exception:
                 # on other API errors, retry up to the configured number of times
+                if isinstance(exception, SMAApiCommunicationError):
+                    host_failed = True
                 if tries <= self._request_retries:
                     self._logger.debug("SMA API error (%s), retrying", exception)
                     return await _make_request_w(tries=tries + 1, did_reauth=did_reauth)
                 else:
                     raise exception
 
-        return await _make_request_w()
+        try:
+            response = await _make_request_w()
+        except SMAApiDeadlineExceededError:
+            # the request was cut short. this only counts against the host
+            # if it did not respond to an attempt, not if there was no time left to send one
+            if host_failed:
+                self._record_communication_error()
+            raise
+        except SMAApiCommunicationError:
+            self._record_communication_error()
+            raise
+        except SMAApiClientError:
+            # the host responded
+            self.health.record_success()
+            raise
+
+        self.health.record_success()
+        return response
+
+    def _record_communication_error(self) -> None:
+        """Count a communication error towards marking the host offline."""
+        if self.health.record_error(time.monotonic()):
+            self._logger.warning(
+                "%s is offline after %s communication errors, probing every %s s or less",
+                self._host,
+                self.health.consecutive_errors,
+                self.health.max_backoff,
+            )
+
+    async def _check_offline(self) -> None:
+        """Probe the host if it is offline and a probe is due.
+
+        :raises SMAApiCommunicationError: if the host is still offline
+        """
+        if not self.health.offline:
+            return
+
+        now = time.monotonic()
+        if not self.health.probe_due(now):
+            raise SMAApiCommunicationError(
+                f"{self._host} is offline, next probe in {self.health.time_until_probe(now):.0f} s"
+            )
+
+        if not await self.probe(PROBE_TIMEOUT):
+            self.health.record_probe_failure(time.monotonic())
+            raise SMAApiCommunicationError(f"{self._host} is offline, probe failed")
+
+        self._logger.info("%s is back online", self._host)
+        self.health.record_success()
@@ -0,0 +1,226 @@
+"""SMA query cost estimation."""
+from __future__ import annotations
+
+import json
+import time
+
+from .client import SMAApiClient
+from .model import LiveMeasurementQueryItem
+
+
+class QueryCost:
+    """estimated cost of polling a live measurement query."""
+
+    # number of channels in the query
+    channel_count: int
+
+    # number of requests per poll
+    requests_per_poll: int
+
+    # size of the request and response body of a poll, in bytes.
+    # averaged over the polls if not all polls query the same channels
+    request_size: float
+    response_size: float
+
+    # measured time of a poll, in seconds. averaged like the sizes
+    latency: float
+
+    # poll interval, in seconds
+    update_interval: float
+
+    def __init__(
+        self,
+        channel_count: int,
+        requests_per_poll: int,
+        request_size: float,
+        response_size: float,
+        latency: float,
+        update_interval: float,
+    ) -> None:
+        """Initialize query cost."""
+        self.channel_count = channel_count
+        self.requests_per_poll = requests_per_poll
+        self.request_size = request_size
+        self.response_size = response_size
+        self.latency = latency
+        self.update_interval = update_interval
+
+    @property
+    def requests_per_hour(self) -> float:
+        """Get the number of requests per hour."""
+        return self.requests_per_poll * 3600 / self.update_interval
+
+    @property
+    def bytes_per_hour(self) -> float:
+        """Get the number of bytes transferred per hour, request and response bodies only."""
+        return (
+            (self.request_size + self.response_size)
+            * self.requests_per_poll
+            * 3600
+            / self.update_interval
+        )
+
+    @property
+    def poll_time_fraction(self) -> float:
+        """Get the fraction of the update interval spent polling."""
+        return self.latency / self.update_interval
+
+    def exceeds(self, fraction: float) -> bool:
+        """Check if polling takes longer than the given fraction of the update interval."""
+        return self.poll_time_fraction > fraction
+
+
+class PollingCost:
+    """estimated cost of all polling of a host: the regular query and the high-frequency query."""
+
+    # cost of the regular (coordinator) polls, None if all channels are high-frequency
+    regular: QueryCost | None
+
+    # cost of the high-frequency query, None if there are no high-frequency channels
+    high_frequency: QueryCost | None
+
+    def __init__(
+        self, regular: QueryCost | None, high_frequency: QueryCost | None
+    ) -> None:
+        """Initialize polling cost."""
+        self.regular = regular
+        self.high_frequency = high_frequency
+
+    @property
+    def queries(self) -> list[QueryCost]:
+        """Get the costs of the queries that are polled."""
+        return [q for q in (self.regular, self.high_frequency) if q is not None]
+
+    @property
+    def requests_per_hour(self) -> float:
+        """Get the total number of requests per hour."""
+        return sum(q.requests_per_hour for q in self.queries)
+
+    @property
+    def bytes_per_hour(self) -> float:
+        """Get the total number of bytes transferred per hour, request and response bodies only."""
+        return sum(q.bytes_per_hour for q in self.queries)
+
+    def exceeds(self, fraction: float) -> bool:
+        """Check if any query takes longer than the given fraction of its update interval."""
+        return any(q.exceeds(fraction) for q in self.queries)
+
+
+async def measure_query_cost(
+    client: SMAApiClient,
+    query: list[LiveMeasurementQueryItem],
+    update_interval: float,
+) -> QueryCost:
+    """Estimate the cost of polling a query by running it once.
+
+    the client must be logged in.
+
+    :param update_interval: poll interval, in seconds
+    :raises SMAApiClientError: if the sample query fails
+    """
+    # the whole query is sent in a single measurements/live request
+    request_size = len(json.dumps([item.to_dict() for item in query]).encode())
+
+    start = time.monotonic()
+    (_, response_size) = await client.measure_live_measurements(query)
+    latency = time.monotonic() - start
+
+    return QueryCost(
+        channel_count=len(query),
+        requests_per_poll=1,
+        request_size=request_size,
+        response_size=response_size,
+        latency=latency,
+        update_interval=update_interval,
+    )
+
+
+async def measure_tiered_query_cost(
+    client: SMAApiClient,
+    query: list[LiveMeasurementQueryItem],
+    update_interval: float,
+    slow_query: list[LiveMeasurementQueryItem],
+    slow_update_interval: float,
+) -> QueryCost:
+    """Estimate the cost of polling channels in a fast and a slow tier, as the poll scheduler does.
+
+    polls are sent at the update interval with the fast tier channels, and the slow tier channels are
+    merged into one poll per slow update interval. the fast and the merged query are run once each,
+    and sizes and latency are averaged over the polls by how often each query is sent.
+
+    the client must be logged in.
+
+    :param update_interval: poll interval of the fast tier, in seconds
+    :param slow_update_interval: poll interval of the slow tier, in seconds
+    :raises SMAApiClientError: if a sample query fails
+    """
+    if len(slow_query) == 0:
+        return await measure_query_cost(client, query, update_interval)
+    if len(query) == 0:
+        return await measure_query_cost(client, slow_query, slow_update_interval)
+
+    merged_query = query + slow_query
+    if slow_update_interval <= update_interval:
+        # all channels are polled every time
+        return await measure_query_cost(client, merged_query, update_interval)
+
+    fast = await measure_query_cost(client, query, update_interval)
+    merged = await measure_query_cost(client, merged_query, slow_update_interval)
+
+    # fraction of the polls that include the slow tier channels
+    merged_fraction = update_interval / slow_update_interval
+
+    def _average(fast_value: float, merged_value: float) -> float:
+        return fast_value * (1 - merged_fraction) + merged_value * merged_fraction
+
+    return QueryCost(
+        channel_count=len(merged_query),
+        requests_per_poll=1,
+        request_size=_average(fast.request_size, merged.request_size),
+        response_size=_average(fast.response_size, merged.response_size),
+        latency=_average(fast.latency, merged.latency),
+        update_interval=update_interval,
+    )
+
+
+async def measure_polling_cost(
+    client: SMAApiClient,
+    query: list[LiveMeasurementQueryItem],
+    update_interval: float,
+    high_frequency_query: list[LiveMeasurementQueryItem],
+    high_frequency_interval: float,
+    slow_query: list[LiveMeasurementQueryItem] | None = None,
+    slow_update_interval: float | None = None,
+) -> PollingCost:
+    """Estimate the cost of polling the regular and the high-frequency channels, running each query once.
+
+    the client must be logged in. channels must only be in one of the queries,
+    high-frequency and slow tier channels are not part of the regular query.
+
+    :param update_interval: poll interval of the regular query, in seconds
+    :param high_frequency_interval: poll interval of the high-frequency query, in seconds
+    :param slow_query: channels of the slow tier, see measure_tiered_query_cost()
+    :param slow_update_interval: poll interval of the slow tier, in seconds
+    :raises SMAApiClientError: if a sample query fails
+    """
+    slow_query = slow_query or []
+    return PollingCost(
+        regular=(
+            await measure_tiered_query_cost(
+                client,
+                query,
+                update_interval,
+                slow_query,
+                slow_update_interval or update_interval,
+            )
+            if len(query) + len(slow_query) > 0
+            else None
+        ),
+        high_frequency=(
+            await measure_query_cost(
+                client, high_frequency_query, high_frequency_interval
+            )
+            if len(high_frequency_query) > 0
+            else None
+        ),
+    )
@@ -0,0 +1,36 @@
+"""SMA request deadlines: limit the total time of an operation spanning multiple requests."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+import contextlib
+from contextvars import ContextVar
+import time
+
+# monotonic time by which the current operation must be done, None if there is no deadline
+_deadline: ContextVar[float | None] = ContextVar("sma_deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Limit the requests made in this context, including login, re-auth and retries, to a total time.
+
+    each request only gets the remaining time as its timeout.
+    nested deadlines can only shorten the remaining time, never extend it.
+
+    :param seconds: time budget of the operation, in seconds
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """Get the time left until the deadline of the current operation in seconds, or None if there is none."""
+    at = _deadline.get()
+    if at is None:
+        return None
+    return at - time.monotonic()
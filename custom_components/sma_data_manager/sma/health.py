@@ -0,0 +1,90 @@
+"""SMA host health: detect an unreachable host and schedule probes while it is offline."""
+from __future__ import annotations
+
+
+class HostHealth:
+    """tracks whether a host is reachable.
+
+    the host is marked offline after a number of consecutive communication errors.
+    while offline, requests are replaced by cheap probes, scheduled on an exponential backoff.
+    the host is back online as soon as a probe or request succeeds.
+
+    times are monotonic timestamps in seconds, as returned by time.monotonic().
+    """
+
+    # consecutive communication errors before the host is marked offline
+    error_threshold: int
+
+    # bounds of the time between probes while offline, in seconds
+    min_backoff: float
+    max_backoff: float
+
+    # number of communication errors since the last successful request
+    consecutive_errors: int = 0
+
+    # time the host was marked offline, None while online
+    offline_since: float | None = None
+
+    # time of the next probe, None while online
+    next_probe: float | None = None
+
+    # number of probes sent since the host was marked offline
+    probes: int = 0
+
+    # time between the last probe and the next one, in seconds
+    _backoff: float
+
+    def __init__(
+        self,
+        error_threshold: int = 3,
+        min_backoff: float = 5,
+        max_backoff: float = 300,
+    ) -> None:
+        """Initialize host health."""
+        self.error_threshold = error_threshold
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._backoff = min_backoff
+
+    @property
+    def offline(self) -> bool:
+        """Check if the host is offline."""
+        return self.offline_since is not None
+
+    def record_success(self) -> None:
+        """Record that the host responded, marking it online."""
+        self.consecutive_errors = 0
+        self.offline_since = None
+        self.next_probe = None
+        self.probes = 0
+        self._backoff = self.min_backoff
+
+    def record_error(self, now: float) -> bool:
+        """Record a communication error.
+
+        :return: True if the host was marked offline by this error
+        """
+        self.consecutive_errors += 1
+        if self.offline or self.consecutive_errors < self.error_threshold:
+            return False
+
+        self.offline_since = now
+        self._backoff = self.min_backoff
+        self.next_probe = now + self._backoff
+        return True
+
+    def probe_due(self, now: float) -> bool:
+        """Check if the next probe is due. always False while online."""
+        return self.next_probe is not None and now >= self.next_probe
+
+    def record_probe_failure(self, now: float) -> None:
+        """Record a failed probe, doubling the time until the next one."""
+        self.probes += 1
+        self._backoff = min(self._backoff * 2, self.max_backoff)
+        self.next_probe = now + self._backoff
+
+    def time_until_probe(self, now: float) -> float | None:
+        """Get the time until the next probe in seconds, or None while online."""
+        if self.next_probe is None:
+            return None
+        return max(self.next_probe - now, 0)
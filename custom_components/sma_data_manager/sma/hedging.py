@@ -0,0 +1,115 @@
+"""SMA request hedging: send a duplicate of a slow idempotent request and use the first response."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+import time
+from typing import TypeVar
+
+from .latency import LatencyTracker
+
+T = TypeVar("T")
+
+
+class RequestHedger:
+    """hedges idempotent requests against tail latency.
+
+    if a request did not complete within a percentile of the recent request durations,
+    a duplicate is sent. the first successful response is used and the other request is cancelled.
+    hedges are capped to a fraction of all requests, so a slow device does not get twice the load.
+    """
+
+    # percentile of recent durations after which a request is hedged, 0 - 100
+    percentile: float
+
+    # maximum number of hedges, as a fraction of all requests
+    max_extra_load: float
+
+    # minimum number of recent durations before requests are hedged
+    min_samples: int
+
+    # durations of recent requests, in seconds
+    latency: LatencyTracker
+
+    # number of requests
+    requests: int = 0
+
+    # number of duplicate requests sent
+    hedges: int = 0
+
+    # number of duplicate requests that responded first
+    wins: int = 0
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        max_extra_load: float = 0.05,
+        min_samples: int = 20,
+    ) -> None:
+        """Initialize request hedger."""
+        self.percentile = percentile
+        self.max_extra_load = max_extra_load
+        self.min_samples = min_samples
+        self.latency = LatencyTracker()
+
+    @property
+    def hedge_delay(self) -> float | None:
+        """Get the time after which a request is hedged in seconds, or None while there are too few durations."""
+        if self.latency.count < self.min_samples:
+            return None
+        return self.latency.percentile(self.percentile)
+
+    @property
+    def hedge_rate(self) -> float:
+        """Get the fraction of requests that were hedged."""
+        return self.hedges / self.requests if self.requests > 0 else 0
+
+    async def run(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run a request, hedging it if it is slow.
+
+        :param request: makes the request. called a second time for the hedge, so it must be idempotent
+        """
+        self.requests += 1
+        delay = self.hedge_delay
+        if delay is None or self.hedges >= self.max_extra_load * self.requests:
+            start = time.monotonic()
+            result = await request()
+            self.latency.add(time.monotonic() - start)
+            return result
+
+        primary = asyncio.ensure_future(self._timed(request))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if len(done) == 0:
+                self.hedges += 1
+                hedge = asyncio.ensure_future(self._timed(request))
+                pending = {primary, hedge}
+            while True:
+                if len(done) == 0:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                # use the first success, or the error of the last request if all failed
+                succeeded = [task for task in done if task.exception() is None]
+                if len(succeeded) > 0 or len(pending) == 0:
+                    task = succeeded[0] if len(succeeded) > 0 else done.pop()
+                    (result, duration) = task.result()
+                    self.latency.add(duration)
+                    if task is not primary:
+                        self.wins += 1
+                    return result
+                done = set()
+        finally:
+            for task in pending:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+
+    async def _timed(self, request: Callable[[], Awaitable[T]]) -> tuple[T, float]:
+        """Run a request, returning its result and duration."""
+        start = time.monotonic()
+        result = await request()
+        return (result, time.monotonic() - start)
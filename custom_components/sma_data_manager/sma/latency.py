@@ -0,0 +1,69 @@
+"""SMA latency tracking: moving average and percentiles of request durations."""
+from __future__ import annotations
+
+from collections import deque
+import math
+
+
+class LatencyTracker:
+    """tracks the durations of recent requests.
+
+    keeps an exponential moving average of all durations and a window of the most recent
+    durations for percentiles.
+    """
+
+    # weight of a new duration in the moving average
+    alpha: float
+
+    # moving average of the durations, in seconds. None until the first duration is added
+    average: float | None = None
+
+    # most recent durations, in seconds
+    _window: deque[float]
+
+    def __init__(self, alpha: float = 0.2, window: int = 100) -> None:
+        """Initialize latency tracker.
+
+        :param alpha: weight of a new duration in the moving average
+        :param window: number of recent durations kept for percentiles
+        """
+        self.alpha = alpha
+        self.average = None
+        self._window = deque(maxlen=window)
+
+    @property
+    def count(self) -> int:
+        """Get the number of durations in the window."""
+        return len(self._window)
+
+    def add(self, duration: float) -> None:
+        """Add the duration of a request, in seconds."""
+        self._window.append(duration)
+        self.average = (
+            duration
+            if self.average is None
+            else self.alpha * duration + (1 - self.alpha) * self.average
+        )
+
+    def percentile(self, percentile: float) -> float | None:
+        """Get a percentile of the recent durations (nearest rank), or None if there are none.
+
+        :param percentile: the percentile, 0 - 100
+        """
+        if len(self._window) == 0:
+            return None
+
+        ordered = sorted(self._window)
+        rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def min_gap(self, max_duty_cycle: float) -> float:
+        """Get the minimum time between the end of a request and the start of the next, in seconds.
+
+        keeps the average fraction of time spent in requests at or below the max duty cycle.
+
+        :param max_duty_cycle: maximum fraction of time spent in requests, 0 - 1
+        """
+        if self.average is None:
+            return 0
+        return self.average * (1 - max_duty_cycle) / max_duty_cycle
@@ -1,5 +1,6 @@
 """SMA Api model classes."""
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import json
 
 
 class SMAApiClientError(Exception):
@@ -10,6 +11,18 @@ class SMAApiCommunicationError(SMAApiClientError):
     """Exception to indicate a communication error."""
 
 
+class SMAApiDeadlineExceededError(SMAApiCommunicationError):
+    """Exception to indicate that the deadline of an operation passed before a request completed."""
+
+    # True if the request was sent, but the host did not respond within the remaining time
+    request_timed_out: bool
+
+    def __init__(self, message: str, request_timed_out: bool = False) -> None:
+        """Initialize deadline exceeded error."""
+        super().__init__(message)
+        self.request_timed_out = request_timed_out
+
+
 class SMAApiAuthenticationError(SMAApiClientError):
     """Exception to indicate an authentication error."""
 
@@ -29,21 +42,34 @@ class AuthTokenInfo:
     granted_at: datetime
 
     def __init__(
-        self, access_token: str, refresh_token: str, token_type: str, expires_in: int
+        self,
+        access_token: str,
+        refresh_token: str,
+        token_type: str,
+        expires_in: int,
+        granted_at: datetime | None = None,
     ) -> None:
-        """Initialize auth token info."""
+        """Initialize auth token info.
+
+        :param granted_at: time the token was granted, defaults to now
+        """
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.token_type = token_type
         self.expires_in = expires_in
 
-        self.granted_at = datetime.now()
+        # absolute (UTC) time, so the expiry stays valid when the token is persisted
+        self.granted_at = granted_at if granted_at is not None else datetime.now(timezone.utc)
+
+    @property
+    def expires_at(self) -> datetime:
+        """Get the (UTC) time the token expires."""
+        return self.granted_at + timedelta(seconds=self.expires_in)
 
     @property
     def time_until_expiration(self) -> timedelta:
         """Get the time until the token expires."""
-        expires_at = self.granted_at + timedelta(seconds=self.expires_in)
-        return expires_at - datetime.now()
+        return self.expires_at - datetime.now(timezone.utc)
 
     @property
     def seconds_until_expiration(self) -> int:
@@ -57,7 +83,11 @@ class AuthTokenInfo:
 
     @classmethod
     def from_dict(cls, data: dict) -> "AuthTokenInfo":
-        """Create from dict, verify required fields and their types."""
+        """Create from dict, verify required fields and their types.
+
+        the optional field 'expires_at' (as written by to_dict()) restores the absolute expiry time,
+        otherwise the token is assumed to be granted now.
+        """
         if not isinstance(data, dict):
             raise SMAApiParsingError("auth token info is not a dict")
 
@@ -87,13 +117,40 @@ class AuthTokenInfo:
                 "field 'expires_in' in auth token info is not an int"
             )
 
+        granted_at = None
+        if "expires_at" in data:
+            if not isinstance(data["expires_at"], str):
+                raise SMAApiParsingError(
+                    "field 'expires_at' in auth token info is not a string"
+                )
+            try:
+                expires_at = datetime.fromisoformat(data["expires_at"])
+            except ValueError as exception:
+                raise SMAApiParsingError(
+                    "field 'expires_at' in auth token info is not a valid time"
+                ) from exception
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            granted_at = expires_at - timedelta(seconds=data["expires_in"])
+
         return cls(
             access_token=data["access_token"],
             refresh_token=data["refresh_token"],
             token_type=data["token_type"],
             expires_in=data["expires_in"],
+            granted_at=granted_at,
         )
 
+    def to_dict(self) -> dict:
+        """Convert to dict, including the absolute expiry time."""
+        return {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "token_type": self.token_type,
+            "expires_in": self.expires_in,
+            "expires_at": self.expires_at.isoformat(),
+        }
+
 
 class TimeValuePair:
     """a single value at a single point in time."""
@@ -129,6 +186,23 @@ class TimeValuePair:
 
         return cls(time=data["time"], value=data["value"])
 
+    def to_dict(self) -> dict:
+        """Convert to dict. inverse of from_dict()."""
+        return {"time": self.time, "value": self.value}
+
+    def timestamp(self) -> float | None:
+        """Get the time as POSIX timestamp, or None if it is not a valid ISO 8601 time.
+
+        times without timezone are assumed to be UTC.
+        """
+        try:
+            parsed = datetime.fromisoformat(self.time.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
 
 class ChannelValues:
     """a value of a single channel of a single component."""
@@ -153,6 +227,17 @@ class ChannelValues:
             )
         return self.values[-1]
 
+    def to_dict(self) -> dict:
+        """Convert to dict, in the format of a single-value channel.
+
+        inverse of from_dict(). array channels are already split into one ChannelValues per index.
+        """
+        return {
+            "channelId": self.channel_id,
+            "componentId": self.component_id,
+            "values": [value.to_dict() for value in self.values],
+        }
+
     @classmethod
     def __parse_dict(cls, data: dict) -> tuple[str, str, list]:
         """Parse channel info and values from dict.
@@ -183,8 +268,11 @@ class ChannelValues:
         return (data["channelId"], data["componentId"], data["values"])
 
     @classmethod
-    def from_dict(cls, data: dict) -> list["ChannelValues"]:
-        """Create from dict, verify required fields and their types."""
+    def from_dict(cls, data: dict, latest_only: bool = False) -> list["ChannelValues"]:
+        """Create from dict, verify required fields and their types.
+
+        :param latest_only: only parse the latest value, skipping older values
+        """
 
         # parse channel info and values from dict
         channelId, componentId, values = cls.__parse_dict(data)
@@ -220,7 +308,8 @@ class ChannelValues:
         else:
             # single-value channel:
             # convert all values to TimeValuePair
-            values = [TimeValuePair.from_dict(v) for v in data["values"]]
+            raw_values = values[-1:] if latest_only else values
+            values = [TimeValuePair.from_dict(v) for v in raw_values]
 
             # create ChannelValue
             return [
@@ -231,6 +320,21 @@ class ChannelValues:
                 )
             ]
 
+
+class PreparedLiveMeasurementQuery:
+    """a live measurement query, encoded once for repeated requests."""
+
+    items: list["LiveMeasurementQueryItem"]
+
+    # json encoded request body
+    body: bytes
+
+    def __init__(self, items: list["LiveMeasurementQueryItem"]) -> None:
+        """Initialize prepared query, encoding the request body."""
+        self.items = items
+        self.body = json.dumps([item.to_dict() for item in items]).encode()
+
+
 class ComponentInfo:
     """information about a component (e.g. a device)."""
 
@@ -305,12 +409,37 @@ class ComponentInfo:
         if not isinstance(data["name"], str):
             raise SMAApiParsingError("field 'name' in component info is not a string")
 
+        # serial number and firmware version are optional,
+        # they are only present in dicts created by to_dict()
+        serial_number = data.get("serialNumber", None)
+        if serial_number is not None and not isinstance(serial_number, str):
+            raise SMAApiParsingError(
+                "field 'serialNumber' in component info is not a string"
+            )
+        firmware_version = data.get("firmwareVersion", None)
+        if firmware_version is not None and not isinstance(firmware_version, str):
+            raise SMAApiParsingError(
+                "field 'firmwareVersion' in component info is not a string"
+            )
+
         return cls(
             component_id=data["componentId"],
             component_type=data["componentType"],
             name=data["name"],
+            serial_number=serial_number,
+            firmware_version=firmware_version,
         )
 
+    def to_dict(self) -> dict:
+        """Convert to dict, including extra info. inverse of from_dict()."""
+        return {
+            "componentId": self.component_id,
+            "componentType": self.component_type,
+            "name": self.name,
+            "serialNumber": self.serial_number,
+            "firmwareVersion": self.firmware_version,
+        }
+
 
 class LiveMeasurementQueryItem:
     """item for live measurement query."""
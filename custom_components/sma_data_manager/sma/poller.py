@@ -0,0 +1,151 @@
+"""SMA high-frequency poller: poll a few channels every few seconds or faster."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import contextlib
+
+from .client import SMAApiClient
+from .model import ChannelValues, LiveMeasurementQueryItem, SMAApiClientError
+
+
+class HighFrequencyPoller:
+    """polls a small set of channels on a fixed time grid.
+
+    the query is encoded once, login is only called when the token is about to expire,
+    and the poll of the next tick is scheduled before the values of the current tick are handed out,
+    so a slow consumer does not delay the next poll.
+    ticks that are missed because a request took too long are skipped, not made up for.
+    ticks can also be yielded to other requests to the same host, e.g. a running regular poll.
+    on errors, polling backs off exponentially and resumes on the grid after the next success.
+    """
+
+    # time between polls, in seconds
+    interval: float
+
+    # maximum time between polls while requests fail, in seconds
+    max_backoff: float
+
+    # number of successful polls
+    polls: int = 0
+
+    # number of ticks skipped because the previous request was still running
+    skipped_ticks: int = 0
+
+    # number of failed polls
+    errors: int = 0
+
+    # number of ticks yielded because yield_tick returned True
+    yielded_ticks: int = 0
+
+    _client: SMAApiClient
+    _on_values: Callable[[list[ChannelValues]], None]
+    _on_error: Callable[[SMAApiClientError], None] | None
+    _yield_tick: Callable[[], bool] | None
+    _task: asyncio.Task | None = None
+
+    def __init__(
+        self,
+        client: SMAApiClient,
+        query: list[LiveMeasurementQueryItem],
+        interval: float,
+        on_values: Callable[[list[ChannelValues]], None],
+        on_error: Callable[[SMAApiClientError], None] | None = None,
+        max_backoff: float = 60,
+        yield_tick: Callable[[], bool] | None = None,
+    ) -> None:
+        """Initialize high-frequency poller.
+
+        :param on_values: called with the latest values of each poll
+        :param on_error: called with the error of each failed poll
+        :param yield_tick: called at each tick, the tick is skipped if it returns True
+        """
+        self._client = client
+        self._query = client.prepare_live_measurements(query)
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._on_values = on_values
+        self._on_error = on_error
+        self._yield_tick = yield_tick
+
+    @property
+    def running(self) -> bool:
+        """Check if the poller is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start polling, in a task on the running event loop."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling and wait for the poll task to finish."""
+        if self._task is None:
+            return
+
+        task, self._task = self._task, None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def _fetch(self, at: float) -> list[ChannelValues] | None:
+        """Wait until the given loop time, then poll once.
+
+        :returns: the values, or None if the tick was yielded
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(max(at - loop.time(), 0))
+
+        if self._yield_tick is not None and self._yield_tick():
+            return None
+
+        if self._client.needs_login:
+            await self._client.login()
+        return await self._client.get_prepared_live_measurements(self._query)
+
+    async def _run(self) -> None:
+        """Poll until cancelled."""
+        loop = asyncio.get_running_loop()
+        tick = loop.time()
+        pending = loop.create_task(self._fetch(tick))
+        failures = 0
+        try:
+            while True:
+                try:
+                    values = await pending
+                except SMAApiClientError as exception:
+                    self.errors += 1
+                    failures += 1
+                    if self._on_error is not None:
+                        self._on_error(exception)
+
+                    # back off, then restart the grid
+                    tick = loop.time() + min(
+                        self.interval * 2**failures, self.max_backoff
+                    )
+                    pending = loop.create_task(self._fetch(tick))
+                    continue
+
+                if values is None:
+                    # yielded, poll again at the next tick
+                    self.yielded_ticks += 1
+                    tick += self.interval
+                    pending = loop.create_task(self._fetch(tick))
+                    continue
+
+                self.polls += 1
+                failures = 0
+
+                # skip ticks that already passed
+                tick += self.interval
+                now = loop.time()
+                if tick < now:
+                    missed = int((now - tick) // self.interval) + 1
+                    self.skipped_ticks += missed
+                    tick += missed * self.interval
+
+                # schedule the next tick before handing out the values of this one
+                pending = loop.create_task(self._fetch(tick))
+                self._on_values(values)
+        finally:
+            pending.cancel()
@@ -0,0 +1,145 @@
+"""SMA rate limiting: a token bucket per host, shared by all clients of the host."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+import contextlib
+from contextvars import ContextVar
+import heapq
+import itertools
+import time
+
+# request priorities, lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# priority of the requests made in the current context
+_priority: ContextVar[int] = ContextVar("sma_priority", default=PRIORITY_BACKGROUND)
+
+
+@contextlib.contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Set the priority of the requests made in this context.
+
+    :param priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    """Get the priority of the requests made in the current context."""
+    return _priority.get()
+
+
+class TokenBucketLimiter:
+    """limits the request rate using a token bucket.
+
+    each request takes a token. tokens refill at a fixed rate, up to the burst size.
+    requests waiting for a token are served by priority, then in order of arrival.
+    """
+
+    # tokens added per second. 0 disables the limit
+    rate: float
+
+    # maximum number of tokens, i.e. requests that can be made at once after a quiet period
+    burst: float
+
+    # number of requests that had to wait for a token, not counting requests cancelled while waiting
+    throttled: int = 0
+
+    # total time requests waited for a token, in seconds. same requests as throttled
+    throttle_time: float = 0
+
+    _tokens: float
+    _updated: float
+
+    # waiting requests, as (priority, arrival, future).
+    # the result of the future tells if a token was taken for the request
+    _waiters: list[tuple[int, int, asyncio.Future]]
+    _arrivals: Iterator[int]
+    _wakeup: asyncio.TimerHandle | None = None
+
+    def __init__(self, rate: float = 0, burst: float = 1) -> None:
+        """Initialize token bucket limiter."""
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._arrivals = itertools.count()
+
+    def configure(self, rate: float, burst: float) -> None:
+        """Change rate and burst size. waiting requests are served at the new rate."""
+        self._refill()
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = min(self._tokens, self.burst)
+        self._release()
+
+    async def acquire(self, priority: int | None = None) -> None:
+        """Wait for a token.
+
+        :param priority: priority of the request, defaults to the priority of the current context
+        """
+        if priority is None:
+            priority = current_priority()
+
+        if self.rate <= 0:
+            return
+
+        self._refill()
+        if len(self._waiters) == 0 and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        self._schedule_wakeup()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled() and future.result():
+                # cancelled after a token was handed out, e.g. by a deadline.
+                # no request is made, so return the token for the next waiting request
+                self._tokens = min(self._tokens + 1, self.burst)
+                self._release()
+            raise
+
+        self.throttled += 1
+        self.throttle_time += time.monotonic() - start
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * self.rate, self.burst)
+        self._updated = now
+
+    def _release(self) -> None:
+        """Hand out available tokens to waiting requests, by priority."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._refill()
+        while len(self._waiters) > 0 and (self.rate <= 0 or self._tokens >= 1):
+            (_, _, future) = heapq.heappop(self._waiters)
+            if future.done():
+                # cancelled while waiting
+                continue
+            if self.rate > 0:
+                self._tokens -= 1
+            future.set_result(self.rate > 0)
+        self._schedule_wakeup()
+
+    def _schedule_wakeup(self) -> None:
+        """Schedule the next release for when a token is available."""
+        if self._wakeup is not None or len(self._waiters) == 0:
+            return
+        delay = max((1 - self._tokens) / self.rate, 0) if self.rate > 0 else 0
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
@@ -0,0 +1,80 @@
+"""SMA name resolution: cache resolved addresses and keep using them while the resolver fails."""
+from __future__ import annotations
+
+import socket
+import time
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import DefaultResolver
+
+from .latency import LatencyTracker
+
+
+class CachingResolver(AbstractResolver):
+    """resolver that caches addresses for a fixed time.
+
+    once the cached addresses of a host expired, it is resolved again.
+    if that fails, the last resolved addresses are used until resolution succeeds again,
+    so a local DNS or mDNS hiccup does not turn into a communication error.
+    """
+
+    # time resolved addresses are used without resolving again, in seconds
+    ttl: float
+
+    # durations of recent resolutions, in seconds
+    resolution_time: LatencyTracker
+
+    # number of lookups answered from the cache
+    cache_hits: int = 0
+
+    # number of lookups answered with expired addresses because resolution failed
+    stale_hits: int = 0
+
+    # number of failed resolutions
+    failures: int = 0
+
+    _resolver: AbstractResolver
+
+    # resolved addresses and the time they were resolved, by (host, port, family)
+    _cache: dict[tuple[str, int, int], tuple[list[dict], float]]
+
+    def __init__(self, ttl: float = 300, resolver: AbstractResolver | None = None) -> None:
+        """Initialize caching resolver.
+
+        :param resolver: resolver used on cache misses, defaults to the aiohttp default resolver
+        """
+        self.ttl = ttl
+        self.resolution_time = LatencyTracker()
+        self._resolver = resolver if resolver is not None else DefaultResolver()
+        self._cache = {}
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> list[dict]:
+        """Resolve a host, using cached addresses if they are recent enough or resolution fails."""
+        key = (host, port, family)
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.ttl:
+            self.cache_hits += 1
+            return cached[0]
+
+        start = time.monotonic()
+        try:
+            addresses = await self._resolver.resolve(host, port, family)
+        except OSError:
+            self.failures += 1
+            if cached is None:
+                raise
+
+            # keep using the last known addresses
+            self.stale_hits += 1
+            return cached[0]
+
+        end = time.monotonic()
+        self.resolution_time.add(end - start)
+        self._cache[key] = (addresses, end)
+        return addresses
+
+    async def close(self) -> None:
+        """Close the underlying resolver."""
+        await self._resolver.close()
@@ -0,0 +1,144 @@
+"""SMA poll scheduling: poll items at individual intervals, merging due items into one poll."""
+from __future__ import annotations
+
+from .known_channels import (
+    CUMULATIVE_MODE_COUNTER,
+    CUMULATIVE_MODE_NONE,
+    CUMULATIVE_MODE_TOTAL,
+    UNIT_ENUM,
+    UNIT_WATT_HOUR,
+    get_known_channel,
+)
+
+# poll tiers. channels in the fast tier are polled at the update interval,
+# channels in the slow tier at the slow update interval
+POLL_TIER_FAST = "fast"
+POLL_TIER_SLOW = "slow"
+POLL_TIERS = [POLL_TIER_FAST, POLL_TIER_SLOW]
+
+# items due within this time, in seconds, are polled early with the current poll.
+# this merges items whose due times are close and absorbs scheduling jitter
+DUE_TOLERANCE = 1.0
+
+# minimum delay between polls, in seconds
+MIN_POLL_DELAY = 1.0
+
+
+def default_poll_tier(channel_id: str) -> str:
+    """Get the default poll tier of a channel.
+
+    counters, totals and enum (status) channels change slowly and are polled in the slow tier.
+    all other channels, including unknown channels, are polled in the fast tier.
+    """
+    known_channel = get_known_channel(channel_id)
+    if known_channel is None:
+        return POLL_TIER_FAST
+
+    if known_channel.get("cumulative_mode", CUMULATIVE_MODE_NONE) in (
+        CUMULATIVE_MODE_TOTAL,
+        CUMULATIVE_MODE_COUNTER,
+    ) or known_channel["unit"] in (UNIT_ENUM, UNIT_WATT_HOUR):
+        return POLL_TIER_SLOW
+    return POLL_TIER_FAST
+
+
+class PollScheduler:
+    """schedules items with individual poll intervals.
+
+    times are monotonic timestamps in seconds, as returned by time.monotonic().
+    items that were never polled are due immediately.
+    """
+
+    # poll interval by item, in seconds
+    _intervals: dict[str, float]
+
+    # time of the last poll by item
+    _last_polled: dict[str, float]
+
+    # items that are scheduled, but not polled until they are resumed
+    _paused: set[str]
+
+    def __init__(self) -> None:
+        """Initialize poll scheduler."""
+        self._intervals = {}
+        self._last_polled = {}
+        self._paused = set()
+
+    @property
+    def items(self) -> list[str]:
+        """Get all scheduled items."""
+        return list(self._intervals)
+
+    def set_items(self, intervals: dict[str, float]) -> None:
+        """Set the scheduled items and their poll intervals.
+
+        items that stay scheduled keep their last poll time.
+        """
+        self._intervals = dict(intervals)
+        self._last_polled = {
+            item: last_polled
+            for item, last_polled in self._last_polled.items()
+            if item in self._intervals
+        }
+        self._paused &= self._intervals.keys()
+
+    @property
+    def paused(self) -> set[str]:
+        """Get the paused items."""
+        return set(self._paused)
+
+    def set_paused(self, items: set[str]) -> None:
+        """Set the paused items, resuming all others.
+
+        paused items are never due. resumed items are due once their interval passed since their last poll.
+        """
+        self._paused = {item for item in items if item in self._intervals}
+
+    def get_interval(self, item: str) -> float | None:
+        """Get the poll interval of an item, or None if it is not scheduled."""
+        return self._intervals.get(item)
+
+    def set_interval(self, item: str, interval: float) -> None:
+        """Change the poll interval of a scheduled item."""
+        if item not in self._intervals:
+            raise KeyError(f"item {item} is not scheduled")
+        self._intervals[item] = interval
+
+    def due_time(self, item: str) -> float | None:
+        """Get the time an item is due next, or None if it was never polled."""
+        last_polled = self._last_polled.get(item)
+        if last_polled is None:
+            return None
+        return last_polled + self._intervals[item]
+
+    def due(self, now: float) -> list[str]:
+        """Get the items due at the given time, in schedule order."""
+        return [
+            item
+            for item in self._intervals
+            if item not in self._paused
+            and (
+                (due_time := self.due_time(item)) is None
+                or due_time <= now + DUE_TOLERANCE
+            )
+        ]
+
+    def mark_polled(self, items: list[str], now: float) -> None:
+        """Record that items were polled at the given time."""
+        for item in items:
+            if item in self._intervals:
+                self._last_polled[item] = now
+
+    def next_due(self, now: float, default: float) -> float:
+        """Get the time until the next item is due, in seconds.
+
+        :param default: delay to use if no items are scheduled, or all are paused
+        """
+        active = [item for item in self._intervals if item not in self._paused]
+        if len(active) == 0:
+            return default
+
+        due_times = [self.due_time(item) for item in active]
+        if None in due_times:
+            return MIN_POLL_DELAY
+        return max(min(due_times) - now, MIN_POLL_DELAY)
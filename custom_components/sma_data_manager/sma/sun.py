@@ -0,0 +1,72 @@
+"""SMA sun position: decide when PV channels are worth polling."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import math
+
+
+def solar_elevation(latitude: float, longitude: float, when: datetime) -> float:
+    """Get the approximate elevation of the sun above the horizon, in degrees.
+
+    uses the NOAA general solar position equations, accurate to well below a degree.
+    refraction is not accounted for.
+
+    :param latitude: latitude of the observer, in degrees (north positive)
+    :param longitude: longitude of the observer, in degrees (east positive)
+    :param when: time of the observation, timezone-aware
+    """
+    when = when.astimezone(timezone.utc)
+    hour = when.hour + when.minute / 60 + when.second / 3600
+    day_of_year = when.timetuple().tm_yday
+
+    # fractional year, in radians
+    gamma = 2 * math.pi / 365 * (day_of_year - 1 + (hour - 12) / 24)
+
+    # equation of time (minutes) and solar declination (radians)
+    eqtime = 229.18 * (
+        0.000075
+        + 0.001868 * math.cos(gamma)
+        - 0.032077 * math.sin(gamma)
+        - 0.014615 * math.cos(2 * gamma)
+        - 0.040849 * math.sin(2 * gamma)
+    )
+    declination = (
+        0.006918
+        - 0.399912 * math.cos(gamma)
+        + 0.070257 * math.sin(gamma)
+        - 0.006758 * math.cos(2 * gamma)
+        + 0.000907 * math.sin(2 * gamma)
+        - 0.002697 * math.cos(3 * gamma)
+        + 0.00148 * math.sin(3 * gamma)
+    )
+
+    # true solar time (minutes) and hour angle (radians)
+    true_solar_time = hour * 60 + eqtime + 4 * longitude
+    hour_angle = math.radians(true_solar_time / 4 - 180)
+
+    lat = math.radians(latitude)
+    cos_zenith = math.sin(lat) * math.sin(declination) + math.cos(lat) * math.cos(
+        declination
+    ) * math.cos(hour_angle)
+    zenith = math.acos(min(max(cos_zenith, -1.0), 1.0))
+    return 90 - math.degrees(zenith)
+
+
+class DaylightWindow:
+    """daylight at a location, with a margin around sunrise and sunset."""
+
+    latitude: float
+    longitude: float
+
+    # degrees the sun may be below the horizon to still count as daylight
+    margin: float
+
+    def __init__(self, latitude: float, longitude: float, margin: float = 5.0) -> None:
+        """Initialize daylight window."""
+        self.latitude = latitude
+        self.longitude = longitude
+        self.margin = margin
+
+    def is_daylight(self, when: datetime) -> bool:
+        """Check if it is daylight at the given time."""
+        return solar_elevation(self.latitude, self.longitude, when) > -self.margin
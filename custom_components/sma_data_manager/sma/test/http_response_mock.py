@@ -1,4 +1,5 @@
 """utility to mock http responses by aiohttp."""
+import json
 
 
 class CookieMock:
@@ -44,3 +45,7 @@ class ClientResponseMock:
         """Return mock data."""
         return self.data
 
+
+    async def read(self) -> bytes:
+        """Return mock data as json encoded body."""
+        return json.dumps(self.data).encode()
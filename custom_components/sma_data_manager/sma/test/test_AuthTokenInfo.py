@@ -1,5 +1,6 @@
 """unit tests for model.AuthTokenInfo."""
 
+from datetime import datetime, timedelta, timezone
 import pytest
 from ..model import AuthTokenInfo, SMAApiParsingError
 
@@ -38,3 +39,25 @@ def test_from_dict_invalid_dict():
 
 
 
+
+def test_to_dict_from_dict_keeps_expiry():
+    """Test that AuthTokenInfo.to_dict() and from_dict() keep the absolute expiry time."""
+    granted_at = datetime.now(timezone.utc) - timedelta(seconds=3000)
+    token = AuthTokenInfo("abc", "def", "Bearer", 3600, granted_at=granted_at)
+
+    restored = AuthTokenInfo.from_dict(token.to_dict())
+
+    assert restored.refresh_token == "def"
+    assert restored.expires_at == token.expires_at
+    assert 590 < restored.seconds_until_expiration <= 600
+
+def test_from_dict_invalid_expires_at():
+    """Test that AuthTokenInfo.from_dict() raises an exception if expires_at is invalid."""
+    with pytest.raises(SMAApiParsingError):
+        AuthTokenInfo.from_dict({
+            "access_token": "abc",
+            "refresh_token": "def",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "expires_at": "yesterday",
+        })
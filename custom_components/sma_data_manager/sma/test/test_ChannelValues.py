@@ -101,3 +101,32 @@ def test_from_dict_invalid_dict():
 
     with pytest.raises(SMAApiParsingError):
         ChannelValues.from_dict({})
+
+def test_to_dict_roundtrip():
+    """Test that ChannelValues.to_dict() can be parsed by ChannelValues.from_dict()."""
+
+    # prepare array channel dict, which is split into one ChannelValues per index
+    channel_values_dict = {
+        "channelId": "TheArrayChannelId[]",
+        "componentId": "The:Component-Id",
+        "values": [
+            {
+                "time": "2024-02-01T11:25:46Z",
+                "values": [300, 400]
+            }
+        ]
+    }
+    channel_values = ChannelValues.from_dict(channel_values_dict)
+
+    # convert to dict and back
+    parsed = [ChannelValues.from_dict(cv.to_dict()) for cv in channel_values]
+
+    # check result
+    assert len(parsed) == 2
+    assert len(parsed[0]) == 1
+    assert parsed[0][0].channel_id == "TheArrayChannelId[0]"
+    assert parsed[0][0].component_id == "The:Component-Id"
+    assert parsed[0][0].latest_value().time == "2024-02-01T11:25:46Z"
+    assert parsed[0][0].latest_value().value == 300
+    assert parsed[1][0].channel_id == "TheArrayChannelId[1]"
+    assert parsed[1][0].latest_value().value == 400
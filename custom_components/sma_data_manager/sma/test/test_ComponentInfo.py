@@ -60,3 +60,37 @@ def test_add_extra():
     assert component_info.serial_number == "TheSerial"
     assert component_info.firmware_version == "TheFirmwareVersion"
 
+
+def test_to_dict_roundtrip():
+    """Test that ComponentInfo.to_dict() can be parsed by ComponentInfo.from_dict(), including extra info."""
+
+    # prepare component info object with extra info
+    component_info = ComponentInfo(
+        component_id="The:Component-Id",
+        component_type="TheComponentType",
+        name="The Name",
+        serial_number="TheSerial",
+        firmware_version="TheFirmwareVersion",
+    )
+
+    # convert to dict and back
+    parsed = ComponentInfo.from_dict(component_info.to_dict())
+
+    # check result
+    assert parsed.component_id == "The:Component-Id"
+    assert parsed.component_type == "TheComponentType"
+    assert parsed.name == "The Name"
+    assert parsed.serial_number == "TheSerial"
+    assert parsed.firmware_version == "TheFirmwareVersion"
+    assert parsed.to_dict() == component_info.to_dict()
+
+def test_from_dict_invalid_extra():
+    """Test that ComponentInfo.from_dict() raises an exception if the optional extra info is invalid."""
+
+    with pytest.raises(SMAApiParsingError):
+        ComponentInfo.from_dict({
+            "componentId": "The:Component-Id",
+            "componentType": "TheComponentType",
+            "name": "The Name",
+            "serialNumber": 1234,
+        })
@@ -34,3 +34,10 @@ def test_from_dict_invalid_dict():
 
     with pytest.raises(SMAApiParsingError):
         TimeValuePair.from_dict({})
+
+def test_timestamp():
+    """Test that TimeValuePair.timestamp() parses the time."""
+    assert TimeValuePair(time="2024-02-01T11:25:46Z", value=1).timestamp() == 1706786746
+    assert TimeValuePair(time="2024-02-01T12:25:46+01:00", value=1).timestamp() == 1706786746
+    assert TimeValuePair(time="2024-02-01T11:25:46", value=1).timestamp() == 1706786746
+    assert TimeValuePair(time="not a time", value=1).timestamp() is None
@@ -0,0 +1,45 @@
+"""unit test for SMA adaptive polling."""
+import pytest
+
+from ..adaptive import ChangeRateAdapter
+
+
+def test_change_rate_adapter():
+    """Test that intervals shrink on changes and grow while values stay the same."""
+    adapter = ChangeRateAdapter(min_interval=10, max_interval=100)
+
+    # changed: interval halves, down to the minimum
+    assert adapter.next_interval(40, changed=True) == 20
+    assert adapter.next_interval(15, changed=True) == 10
+
+    # unchanged: interval grows, up to the maximum
+    assert adapter.next_interval(40, changed=False) == 60
+    assert adapter.next_interval(80, changed=False) == 100
+
+    # intervals outside the bounds are clamped
+    assert adapter.clamp(5) == 10
+    assert adapter.clamp(500) == 100
+    assert adapter.clamp(50) == 50
+
+
+def test_change_rate_adapter_initial():
+    """Test that changing items speed up below their initial interval, down to the minimum."""
+    adapter = ChangeRateAdapter(min_interval=10, max_interval=100)
+
+    # the configured interval of a channel is above the minimum
+    assert adapter.next_interval(30, changed=True, initial=30) == 15
+    assert adapter.next_interval(15, changed=True, initial=30) == 10
+    assert adapter.next_interval(30, changed=False, initial=30) == 45
+
+    # an initial interval above the maximum is kept while the value stays the same
+    assert adapter.next_interval(300, changed=False, initial=300) == 300
+    assert adapter.next_interval(300, changed=True, initial=300) == 150
+
+    # an initial interval below the minimum is kept while the value changes
+    assert adapter.next_interval(5, changed=True, initial=5) == 5
+
+
+def test_change_rate_adapter_invalid_bounds():
+    """Test that invalid bounds are rejected."""
+    with pytest.raises(ValueError):
+        ChangeRateAdapter(min_interval=100, max_interval=10)
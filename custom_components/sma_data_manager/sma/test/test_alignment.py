@@ -0,0 +1,32 @@
+"""unit test for SMA poll alignment."""
+from ..alignment import DeviceCadence
+
+
+def test_device_cadence_period():
+    """Test inferring the device update period from value timestamps."""
+    cadence = DeviceCadence()
+    assert cadence.period is None
+    assert cadence.align(1000, lag=1) is None
+
+    # device updates every 5 seconds at phase 2, polls miss some updates
+    cadence.observe(1002)
+    cadence.observe(1002)  # same value polled twice
+    cadence.observe(1012)
+    assert cadence.period is None
+    cadence.observe(1017)
+    cadence.observe(1015)  # older value, ignored
+
+    assert cadence.period == 5
+    assert cadence.last_update == 1017
+
+
+def test_device_cadence_align():
+    """Test aligning polls to just after the next device update."""
+    cadence = DeviceCadence()
+    for timestamp in (1002, 1007, 1012):
+        cadence.observe(timestamp)
+
+    # next device update at or after the target, plus the lag
+    assert cadence.align(1030, lag=1) == 1033
+    assert cadence.align(1033, lag=1) == 1033
+    assert cadence.align(1033.5, lag=1) == 1038
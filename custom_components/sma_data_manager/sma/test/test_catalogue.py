@@ -0,0 +1,157 @@
+"""unit tests for the SMA channel catalogue."""
+import asyncio
+from unittest import mock
+import pytest
+
+from ..catalogue import ChannelCatalogue, ChannelCatalogueCache, fetch_channel_catalogue
+from ..known_channels import DEVICE_KIND_BATTERY, DEVICE_KIND_GRID, DEVICE_KIND_OTHER, DEVICE_KIND_PV
+from ..model import ChannelValues, ComponentInfo, TimeValuePair, SMAApiCommunicationError
+
+
+def test_from_measurements():
+    """Test that ChannelCatalogue.from_measurements() resolves component names and skips channels without value."""
+
+    components = [
+        ComponentInfo(component_id="plant0", component_type="Plant", name="The Plant"),
+        ComponentInfo(component_id="inv1", component_type="Inverter", name="The Inverter"),
+    ]
+    measurements = [
+        ChannelValues(channel_id="ch1", component_id="inv1", values=[TimeValuePair(time="2024-02-01T11:30:00Z", value=10)]),
+        ChannelValues(channel_id="ch2", component_id="inv1", values=[TimeValuePair(time="2024-02-01T11:30:00Z", value=None)]),
+        ChannelValues(channel_id="ch3", component_id="inv1", values=[]),
+        ChannelValues(channel_id="ch1", component_id="unknown", values=[TimeValuePair(time="2024-02-01T11:30:00Z", value=20)]),
+    ]
+
+    catalogue = ChannelCatalogue.from_measurements(components, measurements)
+
+    assert len(catalogue.entries) == 2
+
+    assert catalogue.entries[0].component_id == "inv1"
+    assert catalogue.entries[0].component_name == "The Inverter"
+    assert catalogue.entries[0].channel_id == "ch1"
+
+    # unknown component has no name
+    assert catalogue.entries[1].component_id == "unknown"
+    assert catalogue.entries[1].component_name is None
+
+
+def test_cache_ttl():
+    """Test that ChannelCatalogueCache only returns a catalogue until its ttl expired or it is invalidated."""
+
+    cache = ChannelCatalogueCache(ttl=60)
+    assert cache.get() is None
+
+    with mock.patch("time.monotonic", return_value=1000.0):
+        catalogue = ChannelCatalogue(entries=[])
+        cache.set(catalogue)
+
+    # still valid
+    with mock.patch("time.monotonic", return_value=1059.0):
+        assert cache.get() is catalogue
+
+    # expired
+    with mock.patch("time.monotonic", return_value=1061.0):
+        assert cache.get() is None
+
+    # explicit invalidation
+    with mock.patch("time.monotonic", return_value=1000.0):
+        assert cache.get() is catalogue
+        cache.invalidate()
+        assert cache.get() is None
+
+
+class LiveMeasurementsClientMock:
+    """mock client that returns one channel per component, after a per-component delay."""
+
+    delays: dict[str, float]
+    failing: set[str]
+
+    def __init__(self, delays: dict[str, float], failing: set[str] = set()):
+        """Initialize mock client."""
+        self.delays = delays
+        self.failing = failing
+
+    async def get_all_live_measurements(self, component_ids: list[str]) -> list[ChannelValues]:
+        """Return a single channel value for the (single) requested component."""
+        assert len(component_ids) == 1
+        component_id = component_ids[0]
+
+        await asyncio.sleep(self.delays[component_id])
+        if component_id in self.failing:
+            raise SMAApiCommunicationError(f"timeout fetching {component_id}")
+
+        return [ChannelValues(channel_id="ch", component_id=component_id, values=[TimeValuePair(time="2024-02-01T11:30:00Z", value=1)])]
+
+
+COMPONENTS = [
+    ComponentInfo(component_id="inv1", component_type="Inverter", name="Inverter 1"),
+    ComponentInfo(component_id="inv2", component_type="Inverter", name="Inverter 2"),
+    ComponentInfo(component_id="inv3", component_type="Inverter", name="Inverter 3"),
+]
+
+
+@pytest.mark.asyncio
+async def test_fetch_channel_catalogue_complete():
+    """Test that all components are fetched concurrently, and the catalogue is in component order."""
+
+    client = LiveMeasurementsClientMock(delays={"inv1": 0.03, "inv2": 0.01, "inv3": 0.02})
+    catalogue = await fetch_channel_catalogue(client, COMPONENTS, timeout=1)
+
+    assert catalogue.is_complete
+    assert [e.component_id for e in catalogue.entries] == ["inv1", "inv2", "inv3"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_channel_catalogue_partial():
+    """Test that slow and failing components are left out of the catalogue."""
+
+    client = LiveMeasurementsClientMock(delays={"inv1": 0.01, "inv2": 10, "inv3": 0.01}, failing={"inv3"})
+    catalogue = await fetch_channel_catalogue(client, COMPONENTS, timeout=0.1)
+
+    assert not catalogue.is_complete
+    assert [e.component_id for e in catalogue.entries] == ["inv1"]
+    assert sorted(catalogue.missing_component_ids) == ["inv2", "inv3"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_channel_catalogue_all_failed():
+    """Test that an error is raised if no component could be fetched."""
+
+    client = LiveMeasurementsClientMock(delays={"inv1": 0.01, "inv2": 0.01, "inv3": 0.01}, failing={"inv1", "inv2", "inv3"})
+    with pytest.raises(SMAApiCommunicationError):
+        await fetch_channel_catalogue(client, COMPONENTS, timeout=1)
+
+
+def test_filter():
+    """Test grouping and filtering of the catalogue by component, device kind and prefix."""
+
+    components = [
+        ComponentInfo(component_id="inv1", component_type="Inverter", name="Inverter 1"),
+        ComponentInfo(component_id="bat1", component_type="Battery", name="Battery 1"),
+    ]
+    value = [TimeValuePair(time="2024-02-01T11:30:00Z", value=1)]
+    catalogue = ChannelCatalogue.from_measurements(components, [
+        ChannelValues(channel_id="Measurement.DcMs.Vol[0]", component_id="inv1", values=value),
+        ChannelValues(channel_id="Measurement.GridMs.TotW", component_id="inv1", values=value),
+        ChannelValues(channel_id="Measurement.Unknown.Channel", component_id="inv1", values=value),
+        ChannelValues(channel_id="Measurement.Bat.ChaStt", component_id="bat1", values=value),
+    ])
+
+    # precomputed indices
+    assert catalogue.component_names == {"inv1": "Inverter 1", "bat1": "Battery 1"}
+    assert catalogue.count_by_component() == {"inv1": 3, "bat1": 1}
+    assert catalogue.count_by_device_kind() == {DEVICE_KIND_PV: 1, DEVICE_KIND_GRID: 1, DEVICE_KIND_OTHER: 1, DEVICE_KIND_BATTERY: 1}
+
+    # no filter
+    assert len(catalogue.filter()) == 4
+
+    # by component
+    assert [e.channel_id for e in catalogue.filter(component_id="bat1")] == ["Measurement.Bat.ChaStt"]
+
+    # by device kind
+    assert [e.channel_id for e in catalogue.filter(device_kind=DEVICE_KIND_PV)] == ["Measurement.DcMs.Vol[0]"]
+    assert catalogue.filter(component_id="bat1", device_kind=DEVICE_KIND_PV) == []
+
+    # by prefix, case-insensitive
+    assert [e.channel_id for e in catalogue.filter(prefix="measurement.gridms")] == ["Measurement.GridMs.TotW"]
+    assert [e.channel_id for e in catalogue.filter(component_id="inv1", prefix="Measurement.DcMs")] == ["Measurement.DcMs.Vol[0]"]
@@ -1,10 +1,12 @@
 """unit test for SMA client implementation."""
+import asyncio
 from unittest import mock
 import pytest
 from urllib.parse import quote
 
+from ..base_client import SMABaseClient
 from ..client import LOGIN_RESULT_ALREADY_LOGGED_IN, LOGIN_RESULT_NEW_TOKEN, LOGIN_RESULT_TOKEN_REFRESHED, SMAApiClient
-from ..model import LiveMeasurementQueryItem
+from ..model import AuthTokenInfo, LiveMeasurementQueryItem, SMAApiAuthenticationError, SMAApiClientError, SMAApiCommunicationError
 
 from .http_response_mock import ClientResponseMock
 
@@ -129,9 +131,9 @@ async def test_client_auth():
         assert did_delete_token is False
 
         # logout
-        # TODO: logout test does not work...
-        #await sma.logout()
-        #assert did_delete_token is True
+        await sma.logout()
+        assert did_delete_token is True
+        assert sma.has_session is False
 
 
 
@@ -639,3 +641,279 @@ async def test_client_get_live_measurements_array():
         assert measurements[1].values[0].time == "2024-02-01T11:30:00Z"
         assert measurements[1].values[0].value == 20
 
+
+
+
+@pytest.mark.asyncio
+async def test_client_concurrent_login():
+    """Test that concurrent SMAApiClient.login calls share a single token request."""
+
+    # mock for make_request
+    token_requests = 0
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        nonlocal token_requests
+
+        # POST /api/v1/token (login)
+        if method == "POST" and endpoint == "token":
+            token_requests += 1
+
+            # yield to the other login calls while the request is "in flight"
+            await asyncio.sleep(0.01)
+            return ClientResponseMock(
+                data={
+                    "access_token": "acc-token-1",
+                    "refresh_token": "ref-token-1",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                },
+                cookies=[
+                    ("JSESSIONID", "session-id"),
+                ]
+            )
+
+        raise Exception(f"unexpected endpoint: {endpoint}")
+
+    # create the client
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.MagicMock(),
+        use_ssl=False,
+    )
+
+    # patch make_request
+    with mock.patch.object(sma, "make_request", wraps=make_request_mock):
+        results = await asyncio.gather(sma.login(), sma.login(), sma.login())
+
+        # only the first login gets a new token, the others re-use it
+        assert token_requests == 1
+        assert results.count(LOGIN_RESULT_NEW_TOKEN) == 1
+        assert results.count(LOGIN_RESULT_ALREADY_LOGGED_IN) == 2
+
+
+@pytest.mark.asyncio
+async def test_client_restored_session_refreshes_token():
+    """Test that a restored session with an expired token is refreshed instead of logging in again."""
+    grant_types = []
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        if method == "POST" and endpoint == "token":
+            grant_types.append(data["grant_type"])
+            assert headers["Cookie"] == "JSESSIONID=session-id"
+            assert data["refresh_token"] == "ref-token-1"
+            return ClientResponseMock(
+                data={
+                    "access_token": "acc-token-2",
+                    "refresh_token": "ref-token-2",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                },
+            )
+
+        raise Exception(f"unexpected endpoint: {endpoint}")
+
+    # session of a previous run, the access token expired in the meantime
+    previous = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.MagicMock(),
+        use_ssl=False,
+    )
+    previous.restore_session({
+        "session_id": "session-id",
+        "auth": {
+            "access_token": "acc-token-1",
+            "refresh_token": "ref-token-1",
+            "token_type": "Bearer",
+            "expires_in": 300,
+            "expires_at": "2020-01-01T00:00:00+00:00",
+        },
+    })
+    exported = previous.export_session()
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.MagicMock(),
+        use_ssl=False,
+    )
+    sma.restore_session(exported)
+    on_session_changed = mock.Mock()
+    sma.on_session_changed = on_session_changed
+
+    with mock.patch.object(sma, "make_request", wraps=make_request_mock):
+        assert await sma.login() == LOGIN_RESULT_TOKEN_REFRESHED
+
+    assert grant_types == ["refresh_token"]
+    assert on_session_changed.call_count == 1
+    assert sma.export_session()["auth"]["refresh_token"] == "ref-token-2"
+    assert sma.export_session()["session_id"] == "session-id"
+
+
+@pytest.mark.asyncio
+async def test_client_session_lifecycle():
+    """Test that a session is logged out before it is replaced, and that a closed client opens no new session."""
+    requests = []
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        if method == "POST" and endpoint == "token":
+            requests.append(data["grant_type"])
+            if data["grant_type"] == "refresh_token":
+                raise SMAApiAuthenticationError("refresh token expired")
+            return ClientResponseMock(
+                data={
+                    "access_token": "acc-token-2",
+                    "refresh_token": "ref-token-2",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                },
+                cookies=[
+                    ("JSESSIONID", "session-id-2"),
+                ]
+            )
+
+        if method == "DELETE":
+            # logout uses the session that is logged out
+            requests.append((endpoint, headers["Cookie"]))
+            return ClientResponseMock(data={}, cookies=[])
+
+        raise Exception(f"unexpected endpoint: {endpoint}")
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.MagicMock(),
+        use_ssl=False,
+    )
+    sma.restore_session({
+        "session_id": "session-id-1",
+        "auth": {
+            "access_token": "acc-token-1",
+            "refresh_token": "ref-token-1",
+            "token_type": "Bearer",
+            "expires_in": 300,
+            "expires_at": "2020-01-01T00:00:00+00:00",
+        },
+    })
+
+    with mock.patch.object(sma, "make_request", wraps=make_request_mock):
+        # refresh fails, the old session is logged out before logging in again
+        assert await sma.login() == LOGIN_RESULT_NEW_TOKEN
+        assert requests == [
+            "refresh_token",
+            (f"refreshtoken?refreshToken={quote('ref-token-1')}", "JSESSIONID=session-id-1"),
+            "password",
+        ]
+        assert sma.sessions_opened == 1
+        assert sma.sessions_closed == 1
+
+        # closing logs out the current session, and no new session is opened afterwards
+        requests.clear()
+        await sma.close()
+        assert sma.has_session is False
+        assert sma.sessions_closed == 2
+        with pytest.raises(SMAApiClientError):
+            await sma.login()
+        assert requests == [
+            (f"refreshtoken?refreshToken={quote('ref-token-2')}", "JSESSIONID=session-id-2"),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_client_refresh_timeout_keeps_session():
+    """Test that a refresh failing with a communication error keeps the session instead of logging in again."""
+    requests = []
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        if method == "POST" and endpoint == "token":
+            requests.append(data["grant_type"])
+            raise SMAApiCommunicationError("timeout")
+
+        raise Exception(f"unexpected endpoint: {endpoint}")
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.MagicMock(),
+        use_ssl=False,
+    )
+    session = {
+        "session_id": "session-id-1",
+        "auth": {
+            "access_token": "acc-token-1",
+            "refresh_token": "ref-token-1",
+            "token_type": "Bearer",
+            "expires_in": 300,
+            "expires_at": "2020-01-01T00:00:00+00:00",
+        },
+    }
+    sma.restore_session(session)
+
+    with mock.patch.object(sma, "make_request", wraps=make_request_mock), pytest.raises(SMAApiCommunicationError):
+        await sma.login()
+
+    # no logout and no password grant, the session is kept for the next attempt
+    assert requests == ["refresh_token"]
+    assert sma.sessions_closed == 0
+    assert sma.sessions_opened == 0
+    assert sma.export_session() == session
+
+
+@pytest.mark.asyncio
+async def test_client_concurrent_reauth():
+    """Test that concurrent requests rejected with the same session share one re-authentication."""
+    requests = []
+
+    async def base_make_request_mock(self, method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for SMABaseClient.make_request."""
+        if endpoint == "token":
+            requests.append("password")
+            await asyncio.sleep(0.01)
+            return ClientResponseMock(
+                data={
+                    "access_token": "acc-token-2",
+                    "refresh_token": "ref-token-2",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                },
+                cookies=[
+                    ("JSESSIONID", "session-id-2"),
+                ]
+            )
+        if method == "DELETE":
+            requests.append(("logout", headers["Cookie"]))
+            return ClientResponseMock(data={}, cookies=[])
+
+        # measurements: the first session was dropped by the device
+        requests.append(("measurements", headers["Cookie"]))
+        await asyncio.sleep(0.01)
+        if headers["Cookie"] == "JSESSIONID=session-id-1":
+            raise SMAApiAuthenticationError("Invalid credentials")
+        return ClientResponseMock(data=[])
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.MagicMock(),
+        use_ssl=False,
+    )
+    sma._auth_data = AuthTokenInfo("acc-token-1", "ref-token-1", "Bearer", 3600)
+    sma._session_id = "session-id-1"
+
+    query = [LiveMeasurementQueryItem(component_id="plant0", channel_id="Measurement.GridMs.TotW")]
+    with mock.patch.object(SMABaseClient, "make_request", base_make_request_mock):
+        await asyncio.gather(sma.get_live_measurements(query), sma.get_live_measurements(query))
+
+    # one logout of the rejected session, one new session, and both requests retried with it
+    assert requests.count(("logout", "JSESSIONID=session-id-1")) == 1
+    assert requests.count("password") == 1
+    assert requests.count(("measurements", "JSESSIONID=session-id-2")) == 2
+    assert sma.sessions_opened == 1
+    assert sma.sessions_closed == 1
@@ -0,0 +1,168 @@
+"""unit test for SMA query cost estimation."""
+import json
+from unittest import mock
+import pytest
+
+from ..client import SMAApiClient
+from ..cost import (
+    QueryCost,
+    measure_polling_cost,
+    measure_query_cost,
+    measure_tiered_query_cost,
+)
+from ..model import LiveMeasurementQueryItem
+
+from .http_response_mock import ClientResponseMock
+
+
+def test_query_cost():
+    """Test derived values of QueryCost."""
+    cost = QueryCost(
+        channel_count=10,
+        requests_per_poll=1,
+        request_size=100,
+        response_size=900,
+        latency=6,
+        update_interval=10,
+    )
+
+    assert cost.requests_per_hour == 360
+    assert cost.bytes_per_hour == 360_000
+    assert cost.poll_time_fraction == 0.6
+    assert cost.exceeds(0.5)
+    assert not cost.exceeds(0.75)
+
+
+@pytest.mark.asyncio
+async def test_measure_query_cost():
+    """Test measuring the cost of a query with a sample request."""
+    response_data = [
+        {
+            "channelId": "Measurement.Bat.ChaStt",
+            "componentId": "bat0",
+            "values": [{"time": "2024-02-01T11:30:00Z", "value": 50}],
+        }
+    ]
+
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        assert method == "POST"
+        assert endpoint == "measurements/live"
+        assert data == [{"componentId": "bat0", "channelId": "Measurement.Bat.ChaStt"}]
+        return ClientResponseMock(data=response_data)
+
+    client = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=None,
+        use_ssl=False,
+        request_timeout=10,
+        request_retries=0,
+    )
+    client._auth_data = mock.Mock(access_token="acc-token-1")
+    client._session_id = "session-id"
+
+    query = [LiveMeasurementQueryItem(component_id="bat0", channel_id="Measurement.Bat.ChaStt")]
+    with mock.patch.object(client, "make_request", wraps=make_request_mock), \
+         mock.patch("time.monotonic", side_effect=[100.0, 100.25]):
+        cost = await measure_query_cost(client, query, update_interval=5)
+
+    assert cost.channel_count == 1
+    assert cost.requests_per_poll == 1
+    assert cost.request_size == len(json.dumps([{"componentId": "bat0", "channelId": "Measurement.Bat.ChaStt"}]).encode())
+    assert cost.response_size == len(json.dumps(response_data).encode())
+    assert cost.latency == 0.25
+    assert cost.requests_per_hour == 720
+    assert not cost.exceeds(0.5)
+
+
+@pytest.mark.asyncio
+async def test_measure_polling_cost_with_high_frequency_channels():
+    """Test that high-frequency channels are measured separately and add their own request rate."""
+    queried = []
+
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        queried.append([item["channelId"] for item in data])
+        return ClientResponseMock(data=[])
+
+    client = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=None,
+        use_ssl=False,
+        request_timeout=10,
+        request_retries=0,
+    )
+    client._auth_data = mock.Mock(access_token="acc-token-1")
+    client._session_id = "session-id"
+
+    query = [LiveMeasurementQueryItem(component_id="bat0", channel_id="Measurement.Bat.ChaStt")]
+    high_frequency_query = [LiveMeasurementQueryItem(component_id="plant0", channel_id="Measurement.GridMs.TotW")]
+    with mock.patch.object(client, "make_request", wraps=make_request_mock):
+        cost = await measure_polling_cost(
+            client, query, update_interval=10, high_frequency_query=high_frequency_query, high_frequency_interval=1
+        )
+
+    # each channel is only sampled by the query that polls it
+    assert queried == [["Measurement.Bat.ChaStt"], ["Measurement.GridMs.TotW"]]
+    assert cost.regular.channel_count == 1
+    assert cost.high_frequency.channel_count == 1
+    assert cost.high_frequency.requests_per_hour == 3600
+    assert cost.requests_per_hour == 360 + 3600
+
+    # only high-frequency channels selected
+    with mock.patch.object(client, "make_request", wraps=make_request_mock):
+        cost = await measure_polling_cost(
+            client, [], update_interval=10, high_frequency_query=high_frequency_query, high_frequency_interval=0.5
+        )
+    assert cost.regular is None
+    assert cost.requests_per_hour == 7200
+
+
+@pytest.mark.asyncio
+async def test_measure_tiered_query_cost():
+    """Test that slow tier channels are weighted by how often they are merged into a poll."""
+    queried = []
+
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        queried.append([item["channelId"] for item in data])
+        return ClientResponseMock(data=[])
+
+    client = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=None,
+        use_ssl=False,
+        request_timeout=10,
+        request_retries=0,
+    )
+    client._auth_data = mock.Mock(access_token="acc-token-1")
+    client._session_id = "session-id"
+
+    query = [LiveMeasurementQueryItem(component_id="plant0", channel_id="Measurement.GridMs.TotW")]
+    slow_query = [
+        LiveMeasurementQueryItem(component_id="plant0", channel_id=f"Measurement.Counter{i}")
+        for i in range(3)
+    ]
+    with mock.patch.object(client, "make_request", wraps=make_request_mock), \
+         mock.patch("time.monotonic", side_effect=[0.0, 1.0, 10.0, 15.0]):
+        cost = await measure_tiered_query_cost(
+            client, query, update_interval=10, slow_query=slow_query, slow_update_interval=40
+        )
+
+    # the fast and the merged query are sampled
+    assert [len(q) for q in queried] == [1, 4]
+
+    # one in four polls includes the slow channels
+    assert cost.channel_count == 4
+    assert cost.requests_per_hour == 360
+    fast_size = len(json.dumps([item.to_dict() for item in query]).encode())
+    merged_size = len(json.dumps([item.to_dict() for item in query + slow_query]).encode())
+    assert cost.request_size == fast_size * 0.75 + merged_size * 0.25
+    assert cost.latency == 1 * 0.75 + 5 * 0.25
+    assert cost.bytes_per_hour < 360 * (merged_size + cost.response_size)
@@ -0,0 +1,103 @@
+"""unit test for SMA request deadlines."""
+import asyncio
+from unittest import mock
+import aiohttp
+import pytest
+
+from ..client import SMAApiClient
+from ..deadline import deadline, remaining_time
+from ..model import SMAApiDeadlineExceededError
+
+
+def test_deadline_nesting():
+    """Test that nested deadlines can shorten, but not extend the remaining time."""
+    assert remaining_time() is None
+
+    with mock.patch("time.monotonic", return_value=100), deadline(10):
+        assert remaining_time() == 10
+
+        with deadline(5):
+            assert remaining_time() == 5
+        with deadline(20):
+            assert remaining_time() == 10
+
+        assert remaining_time() == 10
+
+    assert remaining_time() is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_stops_retries():
+    """Test that requests are not retried once the deadline passed."""
+    requests = []
+
+    async def request_mock(method: str, url: str, headers: dict|None = None, json: dict|None = None, data: dict|None = None):
+        """Mock for ClientSession.request, failing after 4 seconds."""
+        requests.append(url)
+        now.append(now[-1] + 4)
+        raise aiohttp.ClientError("connection reset")
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.Mock(request=request_mock),
+        use_ssl=False,
+        request_timeout=10,
+        request_retries=3,
+    )
+
+    now = [100]
+    with mock.patch("time.monotonic", side_effect=lambda: now[-1]), deadline(10), \
+         pytest.raises(SMAApiDeadlineExceededError):
+        await sma.make_request("GET", "navigation")
+
+    # 1 + 3 retries, but only the 3 that start before the deadline are sent
+    assert len(requests) == 3
+
+    # the attempts that were sent failed, so this counts as one communication error
+    assert sma.health.consecutive_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_timeout_marks_host_offline():
+    """Test that requests timing out at the deadline still count towards marking the host offline."""
+
+    async def request_mock(method: str, url: str, headers: dict|None = None, json: dict|None = None, data: dict|None = None):
+        """Mock for ClientSession.request, never responding."""
+        await asyncio.sleep(1)
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.Mock(request=request_mock),
+        use_ssl=False,
+        request_timeout=10,
+        request_retries=3,
+    )
+
+    for _ in range(sma.health.error_threshold):
+        with deadline(0.01), pytest.raises(SMAApiDeadlineExceededError):
+            await sma.make_request("GET", "navigation")
+
+    assert sma.health.offline
+
+
+@pytest.mark.asyncio
+async def test_deadline_before_sending_does_not_count():
+    """Test that a deadline passing before a request is sent says nothing about the host."""
+    request_mock = mock.AsyncMock()
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.Mock(request=request_mock),
+        use_ssl=False,
+    )
+
+    with deadline(-1), pytest.raises(SMAApiDeadlineExceededError):
+        await sma.make_request("GET", "navigation")
+
+    request_mock.assert_not_called()
+    assert sma.health.consecutive_errors == 0
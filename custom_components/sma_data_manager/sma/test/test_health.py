@@ -0,0 +1,116 @@
+"""unit test for SMA host health tracking."""
+from unittest import mock
+import pytest
+
+from ..base_client import SMABaseClient
+from ..client import SMAApiClient
+from ..health import HostHealth
+from ..model import SMAApiCommunicationError
+
+
+def test_offline_after_consecutive_errors():
+    """Test that the host is marked offline after consecutive errors only."""
+    health = HostHealth(error_threshold=3, min_backoff=5, max_backoff=300)
+
+    assert not health.record_error(0)
+    health.record_success()
+    assert not health.record_error(1)
+    assert not health.record_error(2)
+    assert not health.offline
+    assert health.time_until_probe(2) is None
+
+    assert health.record_error(3)
+    assert health.offline
+    assert health.offline_since == 3
+
+    # further errors do not mark it offline again
+    assert not health.record_error(4)
+
+
+def test_probe_backoff():
+    """Test the exponential probe backoff and recovery."""
+    health = HostHealth(error_threshold=1, min_backoff=5, max_backoff=30)
+    health.record_error(100)
+
+    assert not health.probe_due(104)
+    assert health.probe_due(105)
+    assert health.time_until_probe(101) == 4
+
+    health.record_probe_failure(105)
+    assert health.next_probe == 115
+    health.record_probe_failure(115)
+    assert health.next_probe == 135
+    health.record_probe_failure(135)
+    assert health.next_probe == 165
+    health.record_probe_failure(165)
+    assert health.next_probe == 195
+    assert health.probes == 4
+
+    health.record_success()
+    assert not health.offline
+    assert not health.probe_due(1000)
+
+    # backoff restarts at the minimum
+    health.record_error(1000)
+    assert health.next_probe == 1005
+
+
+@pytest.mark.asyncio
+async def test_client_offline():
+    """Test that an offline client fails fast and resumes when a probe succeeds."""
+    requests = []
+
+    async def base_make_request_mock(self, method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for SMABaseClient.make_request, failing while the host is down."""
+        requests.append(endpoint)
+        if host_down:
+            raise SMAApiCommunicationError("timeout")
+        return "response"
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=None,
+        use_ssl=False,
+        request_timeout=10,
+        request_retries=1,
+    )
+    sma.health = HostHealth(error_threshold=2, min_backoff=5, max_backoff=300)
+
+    host_down = True
+    probe = mock.AsyncMock(return_value=False)
+    with mock.patch.object(SMABaseClient, "make_request", base_make_request_mock), \
+         mock.patch.object(sma, "probe", probe), \
+         mock.patch("time.monotonic", return_value=100):
+        for _ in range(2):
+            with pytest.raises(SMAApiCommunicationError):
+                await sma.make_request("GET", "navigation")
+        assert sma.health.offline
+        assert len(requests) == 6
+
+        # offline: no request, no probe until due
+        with pytest.raises(SMAApiCommunicationError):
+            await sma.make_request("GET", "navigation")
+        assert len(requests) == 6
+        probe.assert_not_called()
+
+    # probe due, but fails
+    with mock.patch.object(SMABaseClient, "make_request", base_make_request_mock), \
+         mock.patch.object(sma, "probe", probe), \
+         mock.patch("time.monotonic", return_value=105):
+        with pytest.raises(SMAApiCommunicationError):
+            await sma.make_request("GET", "navigation")
+        assert len(requests) == 6
+        assert probe.call_count == 1
+        assert sma.health.next_probe == 115
+
+    # probe succeeds, request is sent right away
+    host_down = False
+    probe.return_value = True
+    with mock.patch.object(SMABaseClient, "make_request", base_make_request_mock), \
+         mock.patch.object(sma, "probe", probe), \
+         mock.patch("time.monotonic", return_value=115):
+        assert await sma.make_request("GET", "navigation") == "response"
+        assert not sma.health.offline
+        assert len(requests) == 7
@@ -0,0 +1,88 @@
+"""unit test for SMA request hedging."""
+import asyncio
+import pytest
+
+from ..hedging import RequestHedger
+from ..model import SMAApiCommunicationError
+
+
+def create_hedger(max_extra_load: float = 1) -> RequestHedger:
+    """Create a hedger that learned a p95 latency of 10 ms."""
+    hedger = RequestHedger(percentile=95, max_extra_load=max_extra_load, min_samples=5)
+    for _ in range(5):
+        hedger.latency.add(0.01)
+    return hedger
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_samples():
+    """Test that requests are not hedged until enough durations are known."""
+    hedger = RequestHedger(min_samples=5)
+    calls = []
+
+    async def request():
+        calls.append(1)
+        return "result"
+
+    assert hedger.hedge_delay is None
+    assert await hedger.run(request) == "result"
+    assert len(calls) == 1
+    assert hedger.hedges == 0
+    assert hedger.latency.count == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_slow_request():
+    """Test that a slow request is hedged, the hedge wins and the slow request is cancelled."""
+    hedger = create_hedger()
+    delays = [1, 0]
+    cancelled = []
+
+    async def request():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert await hedger.run(request) == 0
+    assert hedger.hedges == 1
+    assert hedger.wins == 1
+    assert cancelled == [1]
+    assert hedger.hedge_rate == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_failure():
+    """Test that a failing hedge does not fail the request."""
+    hedger = create_hedger()
+    delays = [0.05, 0]
+
+    async def request():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        if delay == 0:
+            raise SMAApiCommunicationError("hedge failed")
+        return delay
+
+    assert await hedger.run(request) == 0.05
+    assert hedger.hedges == 1
+    assert hedger.wins == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_load_cap():
+    """Test that hedges are capped to a fraction of all requests."""
+    hedger = create_hedger(max_extra_load=0.5)
+
+    async def request():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    for _ in range(4):
+        await hedger.run(request)
+
+    assert hedger.requests == 4
+    assert 1 <= hedger.hedges <= 2
@@ -1,5 +1,29 @@
 """Tests for the SMA Data Manager known_channels module."""
-from ..known_channels import DEVICE_KIND_GRID, DEVICE_KIND_PV, UNIT_VOLT, UNIT_WATT, get_known_channel
+from ..known_channels import (
+    DEVICE_KIND_GRID,
+    DEVICE_KIND_BATTERY,
+    DEVICE_KIND_PV,
+    DEVICE_KIND_OTHER,
+    UNIT_PLAIN_NUMBER,
+    UNIT_VOLT,
+    UNIT_AMPERE,
+    UNIT_WATT,
+    UNIT_WATT_HOUR,
+    UNIT_CELSIUS,
+    UNIT_HERTZ,
+    UNIT_VOLT_AMPERE_REACTIVE,
+    UNIT_SECOND,
+    UNIT_PERCENT,
+    UNIT_ENUM,
+    CUMULATIVE_MODE_NONE,
+    CUMULATIVE_MODE_COUNTER,
+    CUMULATIVE_MODE_TOTAL,
+    CUMULATIVE_MODE_MINIMUM,
+    CUMULATIVE_MODE_MAXIMUM,
+    get_known_channel,
+    load_known_channels,
+    normalize_channel_id,
+)
 
 
 def test_known_channel_normal():
@@ -34,3 +58,100 @@ def test_known_channel_array():
     assert ch123 is not None
     assert ch123["device_kind"] == DEVICE_KIND_PV
     assert ch123["unit"] == UNIT_VOLT
+
+def test_known_channel_unknown():
+    """Test that unknown channels return None."""
+
+    assert get_known_channel("Measurement.Does.Not.Exist") is None
+    assert get_known_channel("Measurement.Does.Not.Exist[4]") is None
+
+def test_normalize_channel_id():
+    """Test that concrete channel ids are normalized to their channel family."""
+
+    assert normalize_channel_id("Measurement.GridMs.TotW") == "Measurement.GridMs.TotW"
+    assert normalize_channel_id("Measurement.DcMs.Vol[0]") == "Measurement.DcMs.Vol[]"
+    assert normalize_channel_id("Measurement.DcMs.Vol[123]") == "Measurement.DcMs.Vol[]"
+    assert normalize_channel_id("Measurement.DcMs.Vol[]") == "Measurement.DcMs.Vol[]"
+
+def test_known_channel_shared_entry():
+    """Test that all channels of a family resolve to the same shared entry."""
+
+    assert get_known_channel("Measurement.DcMs.Vol[0]") is get_known_channel("Measurement.DcMs.Vol[1]")
+    assert get_known_channel("Measurement.DcMs.Vol[0]") is get_known_channel("Measurement.DcMs.Vol[0]")
+
+def test_load_known_channels():
+    """Test that the packaged known channels table is valid.
+
+    all entries must use the UNIT_*, DEVICE_KIND_* and CUMULATIVE_MODE_* constants,
+    and enum_values must be resolved to dicts with int keys.
+    """
+
+    known_channels = load_known_channels()
+    assert len(known_channels) > 0
+
+    for channel_id, entry in known_channels.items():
+        assert isinstance(entry["name"], str), channel_id
+        assert entry["unit"] in (
+            UNIT_PLAIN_NUMBER,
+            UNIT_VOLT,
+            UNIT_AMPERE,
+            UNIT_WATT,
+            UNIT_WATT_HOUR,
+            UNIT_CELSIUS,
+            UNIT_HERTZ,
+            UNIT_VOLT_AMPERE_REACTIVE,
+            UNIT_SECOND,
+            UNIT_PERCENT,
+            UNIT_ENUM,
+        ), channel_id
+        assert entry["device_kind"] in (
+            DEVICE_KIND_GRID,
+            DEVICE_KIND_BATTERY,
+            DEVICE_KIND_PV,
+            DEVICE_KIND_OTHER,
+        ), channel_id
+        assert entry.get("cumulative_mode", CUMULATIVE_MODE_NONE) in (
+            CUMULATIVE_MODE_NONE,
+            CUMULATIVE_MODE_COUNTER,
+            CUMULATIVE_MODE_TOTAL,
+            CUMULATIVE_MODE_MINIMUM,
+            CUMULATIVE_MODE_MAXIMUM,
+        ), channel_id
+
+        if entry["unit"] == UNIT_ENUM:
+            assert isinstance(entry["enum_values"], dict), channel_id
+            assert all(isinstance(key, int) for key in entry["enum_values"]), channel_id
+
+        if channel_id.endswith("*"):
+            assert entry["unit"] == UNIT_PLAIN_NUMBER, channel_id
+
+    # the table is only loaded once
+    assert load_known_channels() is known_channels
+
+def test_known_channel_family_default():
+    """Test that channels without an exact entry fall back to their family default.
+
+    exact entries must still take precedence over the family default.
+    """
+
+    # exact entry
+    ch_exact = get_known_channel("Measurement.GridMs.TotW")
+    assert ch_exact is not None
+    assert ch_exact["unit"] == UNIT_WATT
+
+    # sibling without exact entry uses the family default
+    ch_sibling = get_known_channel("Measurement.GridMs.SomethingNew")
+    assert ch_sibling is not None
+    assert ch_sibling["device_kind"] == DEVICE_KIND_GRID
+    assert ch_sibling["unit"] == UNIT_PLAIN_NUMBER
+
+    # deeper channels and array channels also use the family default
+    ch_deep = get_known_channel("Measurement.Bat.Some.Deep.Channel[2]")
+    assert ch_deep is not None
+    assert ch_deep["device_kind"] == DEVICE_KIND_BATTERY
+
+    # the family prefix itself is not matched by its family default
+    assert get_known_channel("Measurement.GridMs") is None
+
+    # unrelated families are not matched
+    assert get_known_channel("Measurement.Unknown.TotW") is None
@@ -0,0 +1,39 @@
+"""unit test for SMA latency tracking."""
+from ..latency import LatencyTracker
+
+
+def test_latency_average():
+    """Test the moving average of durations."""
+    tracker = LatencyTracker(alpha=0.5)
+    assert tracker.average is None
+    assert tracker.min_gap(0.5) == 0
+
+    tracker.add(2)
+    assert tracker.average == 2
+    tracker.add(4)
+    assert tracker.average == 3
+
+    # at most half of the time polling: wait as long as a poll takes
+    assert tracker.min_gap(0.5) == 3
+
+    # at most a quarter of the time polling: wait three times as long
+    assert tracker.min_gap(0.25) == 9
+
+
+def test_latency_percentile():
+    """Test percentiles of recent durations."""
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile(95) is None
+
+    for duration in range(1, 21):
+        tracker.add(duration)
+
+    # only the 10 most recent durations (11 - 20) are kept
+    assert tracker.count == 10
+    assert tracker.percentile(0) == 11
+    assert tracker.percentile(50) == 15
+    assert tracker.percentile(95) == 20
+    assert tracker.percentile(100) == 20
+
+    # the moving average trails the increasing durations
+    assert 15 < tracker.average < 20
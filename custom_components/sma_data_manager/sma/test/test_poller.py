@@ -0,0 +1,156 @@
+"""unit test for the SMA high-frequency poller."""
+import asyncio
+import async_timeout
+from datetime import timedelta
+from unittest import mock
+import pytest
+
+from ..client import SMAApiClient
+from ..model import LiveMeasurementQueryItem, SMAApiCommunicationError
+from ..poller import HighFrequencyPoller
+
+from .http_response_mock import ClientResponseMock
+
+
+async def wait_for(condition, timeout: float = 2) -> None:
+    """Wait until a condition is met, failing the test after the timeout."""
+    async with async_timeout.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+def create_client() -> SMAApiClient:
+    """Create a logged-in client."""
+    client = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=None,
+        use_ssl=False,
+        request_timeout=10,
+        request_retries=0,
+    )
+    client._auth_data = mock.Mock(
+        access_token="acc-token-1", time_until_expiration=timedelta(hours=1)
+    )
+    client._session_id = "session-id"
+    return client
+
+
+@pytest.mark.asyncio
+async def test_poll_prepared_query():
+    """Test that the poller sends the prepared query and hands out the latest values."""
+    requests = []
+
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        requests.append((endpoint, data, as_json))
+        return ClientResponseMock(data=[
+            {
+                "channelId": "Measurement.GridMs.TotW",
+                "componentId": "Plant:1",
+                "values": [
+                    {"time": "2024-02-01T11:30:00Z", "value": 100},
+                    {"time": "2024-02-01T11:30:01Z", "value": 200},
+                ],
+            }
+        ])
+
+    client = create_client()
+    received = []
+    poller = HighFrequencyPoller(
+        client=client,
+        query=[LiveMeasurementQueryItem(component_id="Plant:1", channel_id="Measurement.GridMs.TotW")],
+        interval=0.01,
+        on_values=received.append,
+    )
+    with mock.patch.object(client, "make_request", wraps=make_request_mock):
+        poller.start()
+        await asyncio.sleep(0.055)
+        await poller.stop()
+
+    assert not poller.running
+    assert poller.polls >= 3
+    assert poller.errors == 0
+    assert len(received) == poller.polls
+
+    # request body is encoded once and sent as-is
+    assert requests[0] == (
+        "measurements/live",
+        b'[{"componentId": "Plant:1", "channelId": "Measurement.GridMs.TotW"}]',
+        False,
+    )
+
+    # only the latest value is parsed
+    assert len(received[0]) == 1
+    assert len(received[0][0].values) == 1
+    assert received[0][0].latest_value().value == 200
+
+
+@pytest.mark.asyncio
+async def test_poll_backoff():
+    """Test that the poller backs off on errors and resumes on success."""
+    results = [SMAApiCommunicationError("offline"), SMAApiCommunicationError("offline")]
+
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request, failing twice."""
+        if len(results) > 0:
+            raise results.pop(0)
+        return ClientResponseMock(data=[])
+
+    client = create_client()
+    errors = []
+    poller = HighFrequencyPoller(
+        client=client,
+        query=[LiveMeasurementQueryItem(component_id="Plant:1", channel_id="Measurement.GridMs.TotW")],
+        interval=0.02,
+        on_values=lambda values: None,
+        on_error=errors.append,
+    )
+    with mock.patch.object(client, "make_request", wraps=make_request_mock):
+        poller.start()
+
+        # backoff after two failures: 0.04 s + 0.08 s
+        await wait_for(lambda: poller.errors == 2)
+        assert poller.polls == 0
+
+        await wait_for(lambda: poller.polls >= 1)
+        await poller.stop()
+
+    assert len(errors) == 2
+    assert poller.polls >= 1
+
+
+@pytest.mark.asyncio
+async def test_poll_yields_to_running_poll():
+    """Test that ticks are yielded while another poll of the host is running."""
+    requests = []
+
+    async def make_request_mock(method: str, endpoint: str, data: dict|None = None, headers: dict|None = None, as_json: bool = True):
+        """Mock for make_request."""
+        requests.append(endpoint)
+        return ClientResponseMock(data=[])
+
+    client = create_client()
+    poll_lock = asyncio.Lock()
+    poller = HighFrequencyPoller(
+        client=client,
+        query=[LiveMeasurementQueryItem(component_id="Plant:1", channel_id="Measurement.GridMs.TotW")],
+        interval=0.01,
+        on_values=lambda values: None,
+        yield_tick=poll_lock.locked,
+    )
+    with mock.patch.object(client, "make_request", wraps=make_request_mock):
+        async with poll_lock:
+            poller.start()
+            await wait_for(lambda: poller.yielded_ticks >= 2)
+
+            # no requests while the regular poll is running
+            assert len(requests) == 0
+
+        await wait_for(lambda: poller.polls >= 1)
+        await poller.stop()
+
+    # polling resumes once it is done
+    assert poller.polls >= 1
+    assert len(requests) == poller.polls
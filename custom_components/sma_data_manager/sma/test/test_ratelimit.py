@@ -0,0 +1,108 @@
+"""unit test for SMA rate limiting."""
+import asyncio
+import pytest
+
+from ..ratelimit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    TokenBucketLimiter,
+    current_priority,
+    request_priority,
+)
+
+
+def test_request_priority():
+    """Test setting the request priority of a context."""
+    assert current_priority() == PRIORITY_BACKGROUND
+    with request_priority(PRIORITY_INTERACTIVE):
+        assert current_priority() == PRIORITY_INTERACTIVE
+    assert current_priority() == PRIORITY_BACKGROUND
+
+
+@pytest.mark.asyncio
+async def test_burst_and_rate():
+    """Test that the burst is served at once, then requests are spaced at the rate."""
+    limiter = TokenBucketLimiter(rate=50, burst=3)
+
+    start = asyncio.get_running_loop().time()
+    for _ in range(3):
+        await limiter.acquire()
+    assert asyncio.get_running_loop().time() - start < 0.01
+    assert limiter.throttled == 0
+
+    for _ in range(2):
+        await limiter.acquire()
+    assert asyncio.get_running_loop().time() - start >= 0.035
+    assert limiter.throttled == 2
+
+
+@pytest.mark.asyncio
+async def test_unlimited():
+    """Test that a rate of 0 does not limit requests."""
+    limiter = TokenBucketLimiter(rate=0, burst=1)
+    for _ in range(100):
+        await limiter.acquire()
+    assert limiter.throttled == 0
+
+
+@pytest.mark.asyncio
+async def test_priority():
+    """Test that interactive requests overtake waiting background requests."""
+    limiter = TokenBucketLimiter(rate=100, burst=1)
+    await limiter.acquire()
+
+    order = []
+
+    async def request(name: str, priority: int):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    background = [
+        asyncio.ensure_future(request(f"background{i}", PRIORITY_BACKGROUND))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    interactive = asyncio.ensure_future(request("interactive", PRIORITY_INTERACTIVE))
+    await asyncio.gather(*background, interactive)
+
+    assert order == ["interactive", "background0", "background1", "background2"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_returns_token():
+    """Test that a request cancelled after it got its token returns it to the next request."""
+    limiter = TokenBucketLimiter(rate=100, burst=1)
+    await limiter.acquire()
+
+    first = asyncio.ensure_future(limiter.acquire())
+    second = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # hand out the token to the first request, then cancel it before it resumes
+    limiter._tokens = 1
+    limiter._release()
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    # the second request is served with the returned token without waiting for a refill
+    start = asyncio.get_running_loop().time()
+    await second
+    assert asyncio.get_running_loop().time() - start < 0.005
+    assert limiter.throttled == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_not_throttled():
+    """Test that requests cancelled while waiting are not counted as throttled."""
+    limiter = TokenBucketLimiter(rate=1, burst=1)
+    await limiter.acquire()
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.throttled == 0
+    assert limiter.throttle_time == 0
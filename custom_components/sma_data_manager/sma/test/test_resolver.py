@@ -0,0 +1,93 @@
+"""unit test for SMA name resolution caching."""
+import socket
+from unittest import mock
+import pytest
+
+from ..resolver import CachingResolver
+
+ADDRESSES = [
+    {
+        "hostname": "sma.local",
+        "host": "192.168.1.10",
+        "port": 443,
+        "family": socket.AF_INET,
+        "proto": 0,
+        "flags": socket.AI_NUMERICHOST,
+    }
+]
+
+
+def make_inner_resolver(*results) -> mock.Mock:
+    """Create a resolver that returns or raises the given results in order."""
+
+    async def _resolve(host, port, family):
+        result = results[min(inner.resolve.call_count, len(results)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    inner = mock.Mock(resolve=mock.Mock(side_effect=_resolve))
+    return inner
+
+
+@pytest.mark.asyncio
+async def test_cache_hit():
+    """Test that addresses are resolved once while they are recent."""
+    inner = make_inner_resolver(ADDRESSES)
+    resolver = CachingResolver(ttl=300, resolver=inner)
+
+    with mock.patch("time.monotonic", return_value=0):
+        assert await resolver.resolve("sma.local", 443) == ADDRESSES
+    with mock.patch("time.monotonic", return_value=299):
+        assert await resolver.resolve("sma.local", 443) == ADDRESSES
+
+    assert inner.resolve.call_count == 1
+    assert resolver.cache_hits == 1
+    assert resolver.resolution_time.count == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_addresses_are_resolved_again():
+    """Test that addresses are resolved again once the ttl passed."""
+    inner = make_inner_resolver(ADDRESSES)
+    resolver = CachingResolver(ttl=300, resolver=inner)
+
+    with mock.patch("time.monotonic", return_value=0):
+        await resolver.resolve("sma.local", 443)
+    with mock.patch("time.monotonic", return_value=301):
+        await resolver.resolve("sma.local", 443)
+
+    assert inner.resolve.call_count == 2
+    assert resolver.cache_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_addresses_on_error():
+    """Test that the last known addresses are used while resolution fails."""
+    inner = make_inner_resolver(ADDRESSES, socket.gaierror("lookup failed"))
+    resolver = CachingResolver(ttl=300, resolver=inner)
+
+    with mock.patch("time.monotonic", return_value=0):
+        await resolver.resolve("sma.local", 443)
+    with mock.patch("time.monotonic", return_value=301):
+        assert await resolver.resolve("sma.local", 443) == ADDRESSES
+    with mock.patch("time.monotonic", return_value=302):
+        assert await resolver.resolve("sma.local", 443) == ADDRESSES
+
+    # resolution is retried on every lookup until it succeeds again
+    assert inner.resolve.call_count == 3
+    assert resolver.failures == 2
+    assert resolver.stale_hits == 2
+
+
+@pytest.mark.asyncio
+async def test_error_without_cached_addresses():
+    """Test that resolution errors are raised if there are no known addresses."""
+    inner = make_inner_resolver(socket.gaierror("lookup failed"))
+    resolver = CachingResolver(ttl=300, resolver=inner)
+
+    with pytest.raises(OSError):
+        await resolver.resolve("sma.local", 443)
+
+    assert resolver.failures == 1
+    assert resolver.stale_hits == 0
@@ -0,0 +1,82 @@
+"""unit test for SMA poll scheduling."""
+from ..scheduler import DUE_TOLERANCE, MIN_POLL_DELAY, POLL_TIER_FAST, POLL_TIER_SLOW, PollScheduler, default_poll_tier
+
+
+def test_default_poll_tier():
+    """Test default poll tiers derived from the known channels."""
+
+    # power changes quickly
+    assert default_poll_tier("Measurement.GridMs.TotW") == POLL_TIER_FAST
+
+    # totals, counters and enums change slowly
+    assert default_poll_tier("Measurement.Metering.GridMs.TotWhOut.Bat") == POLL_TIER_SLOW
+    assert default_poll_tier("Measurement.Operation.Health") == POLL_TIER_SLOW
+
+    # unknown channels are polled in the fast tier
+    assert default_poll_tier("Measurement.Unknown.Channel") == POLL_TIER_FAST
+
+
+def test_scheduler_due():
+    """Test that items are due at their interval, merged into a single poll."""
+    scheduler = PollScheduler()
+    scheduler.set_items({"fast": 10, "slow": 30})
+
+    # never polled items are due immediately
+    assert scheduler.due(0) == ["fast", "slow"]
+    assert scheduler.next_due(0, default=60) == MIN_POLL_DELAY
+    scheduler.mark_polled(["fast", "slow"], 0)
+
+    # fast is due after its interval
+    assert scheduler.due(5) == []
+    assert scheduler.next_due(5, default=60) == 5
+    assert scheduler.due(10) == ["fast"]
+    scheduler.mark_polled(["fast"], 10)
+    scheduler.mark_polled(["fast"], 20)
+
+    # both are due at 30, and polled together
+    assert scheduler.due(30) == ["fast", "slow"]
+
+    # items due within the tolerance are polled early
+    assert scheduler.due(30 - DUE_TOLERANCE) == ["fast", "slow"]
+
+
+def test_scheduler_set_items():
+    """Test that changing items keeps the last poll time of remaining items."""
+    scheduler = PollScheduler()
+    scheduler.set_items({"a": 10, "b": 10})
+    scheduler.mark_polled(["a", "b"], 0)
+
+    scheduler.set_items({"a": 20, "c": 10})
+    assert scheduler.items == ["a", "c"]
+    assert scheduler.due(5) == ["c"]
+    assert scheduler.due_time("a") == 20
+
+    scheduler.set_interval("a", 5)
+    assert scheduler.due(5) == ["a", "c"]
+
+    # no items
+    scheduler.set_items({})
+    assert scheduler.due(100) == []
+    assert scheduler.next_due(100, default=60) == 60
+
+
+def test_scheduler_paused():
+    """Test that paused items are not due until resumed."""
+    scheduler = PollScheduler()
+    scheduler.set_items({"pv": 10, "grid": 10})
+    scheduler.mark_polled(["pv", "grid"], 0)
+
+    scheduler.set_paused({"pv"})
+    assert scheduler.due(10) == ["grid"]
+    scheduler.mark_polled(["grid"], 10)
+    assert scheduler.next_due(10, default=60) == 10
+
+    # all paused, fall back to the default delay
+    scheduler.set_paused({"pv", "grid"})
+    assert scheduler.due(100) == []
+    assert scheduler.next_due(100, default=60) == 60
+
+    # resumed items are due immediately if their interval passed
+    scheduler.set_paused(set())
+    assert scheduler.due(100) == ["pv", "grid"]
+    assert scheduler.paused == set()
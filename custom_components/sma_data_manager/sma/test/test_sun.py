@@ -0,0 +1,31 @@
+"""unit test for SMA sun position."""
+from datetime import datetime, timezone
+
+from ..sun import DaylightWindow, solar_elevation
+
+
+def test_solar_elevation():
+    """Test solar elevation at well-known positions."""
+
+    # equinox, sun almost overhead at noon on the equator, far below the horizon at midnight
+    assert solar_elevation(0, 0, datetime(2024, 3, 20, 12, 0, tzinfo=timezone.utc)) > 85
+    assert solar_elevation(0, 0, datetime(2024, 3, 20, 0, 0, tzinfo=timezone.utc)) < -85
+
+    # summer solstice in berlin: about 61 degrees at solar noon (~11:10 UTC)
+    assert abs(solar_elevation(52.52, 13.40, datetime(2024, 6, 21, 11, 10, tzinfo=timezone.utc)) - 61) < 1
+
+    # winter solstice in berlin: about 14 degrees at solar noon
+    assert abs(solar_elevation(52.52, 13.40, datetime(2024, 12, 21, 11, 0, tzinfo=timezone.utc)) - 14) < 1
+
+
+def test_daylight_window():
+    """Test daylight detection with a margin."""
+    berlin = DaylightWindow(52.52, 13.40, margin=5)
+
+    assert berlin.is_daylight(datetime(2024, 6, 21, 11, 0, tzinfo=timezone.utc))
+    assert not berlin.is_daylight(datetime(2024, 6, 21, 23, 0, tzinfo=timezone.utc))
+
+    # sunset in berlin on the summer solstice is around 19:33 UTC.
+    # shortly after, the sun is less than 5 degrees below the horizon
+    assert berlin.is_daylight(datetime(2024, 6, 21, 19, 45, tzinfo=timezone.utc))
+    assert not DaylightWindow(52.52, 13.40, margin=0).is_daylight(datetime(2024, 6, 21, 19, 45, tzinfo=timezone.utc))
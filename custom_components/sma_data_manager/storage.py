@@ -0,0 +1,149 @@
+"""persistent storage for SMA config entries."""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER, STORAGE_VERSION
+
+from .sma.model import ChannelValues, ComponentInfo, SMAApiParsingError
+
+
+class SMATopologyStore:
+    """persistent cache of the discovered plant topology (components) of a config entry."""
+
+    _store: Store
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize topology store."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.topology")
+
+    async def async_load(self) -> list[ComponentInfo] | None:
+        """Load the cached components.
+
+        :return: the cached components, or None if nothing (valid) is cached.
+        """
+        data = await self._store.async_load()
+        if not isinstance(data, dict) or not isinstance(data.get("components"), list):
+            return None
+
+        try:
+            return [ComponentInfo.from_dict(c) for c in data["components"]]
+        except SMAApiParsingError as exception:
+            LOGGER.warning("ignoring invalid cached topology: %s", exception)
+            return None
+
+    async def async_save(self, components: list[ComponentInfo]) -> None:
+        """Save the components."""
+        await self._store.async_save(
+            {"components": [component.to_dict() for component in components]}
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached components."""
+        await self._store.async_remove()
+
+
+class SMASnapshotStore:
+    """persistent snapshot of the last successfully fetched channel values of a config entry."""
+
+    _store: Store
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize snapshot store."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+
+    async def async_load(self, channel_fqids: list[str]) -> list[ChannelValues] | None:
+        """Load the snapshot.
+
+        :param channel_fqids: the currently selected channels.
+        :return: the snapshot values, or None if nothing (valid) is stored or
+            the snapshot was taken for a different channel selection.
+        """
+        data = await self._store.async_load()
+        if not isinstance(data, dict) or not isinstance(data.get("values"), list):
+            return None
+
+        if data.get("channels") != sorted(channel_fqids):
+            LOGGER.debug("ignoring snapshot taken for a different channel selection")
+            return None
+
+        try:
+            return [
+                channel_values
+                for cv in data["values"]
+                for channel_values in ChannelValues.from_dict(cv)
+            ]
+        except SMAApiParsingError as exception:
+            LOGGER.warning("ignoring invalid snapshot: %s", exception)
+            return None
+
+    @callback
+    def async_delay_save(
+        self, channel_fqids: list[str], values: list[ChannelValues], delay: float
+    ) -> None:
+        """Save the latest value of each channel, after a delay.
+
+        multiple saves within the delay are coalesced into one write.
+        """
+
+        def _data_to_save() -> dict:
+            return {
+                "channels": sorted(channel_fqids),
+                "values": [
+                    ChannelValues(
+                        channel_id=cv.channel_id,
+                        component_id=cv.component_id,
+                        values=[cv.latest_value()],
+                    ).to_dict()
+                    for cv in values
+                    if len(cv.values) > 0
+                ],
+            }
+
+        self._store.async_delay_save(_data_to_save, delay)
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot."""
+        await self._store.async_remove()
+
+
+class SMASessionStore:
+    """persistent device session (session id and tokens) of a config entry.
+
+    stored privately, like the credentials in the config entry.
+    """
+
+    _store: Store
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize session store."""
+        self._store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.session", private=True
+        )
+
+    async def async_load(self) -> dict | None:
+        """Load the session.
+
+        :return: the session as exported by the client, or None if none is stored.
+        """
+        data = await self._store.async_load()
+        if not isinstance(data, dict) or not isinstance(data.get("session"), dict):
+            return None
+        return data["session"]
+
+    @callback
+    def async_delay_save(
+        self, session_func: Callable[[], dict | None], delay: float = 0
+    ) -> None:
+        """Save the session returned by session_func, after a delay.
+
+        :param session_func: returns the session to save, or None to clear the stored session.
+        """
+        self._store.async_delay_save(lambda: {"session": session_func()}, delay)
+
+    async def async_remove(self) -> None:
+        """Remove the session."""
+        await self._store.async_remove()
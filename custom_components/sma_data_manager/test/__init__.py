@@ -0,0 +1 @@
+"""SMA Data Manager integration unit tests."""
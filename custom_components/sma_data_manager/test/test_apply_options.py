@@ -0,0 +1,78 @@
+"""unit test for applying changed options to a running config entry."""
+from unittest import mock
+import pytest
+
+from .. import _async_apply_options
+from ..const import (
+    CONF_HOST,
+    OPT_REQUEST_TIMEOUT,
+    OPT_SENSOR_CHANNELS,
+    OPT_UPDATE_INTERVAL,
+)
+from ..sma.client import SMAApiClient
+from ..util import SMAEntryData
+
+
+def create_entry_data(data: dict, options: dict) -> SMAEntryData:
+    """Create the data of a running entry, with a mocked coordinator."""
+    client = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=None,
+        use_ssl=False,
+        request_timeout=10,
+    )
+    coordinator = mock.Mock(async_refresh=mock.AsyncMock())
+    return SMAEntryData(
+        client=client,
+        coordinator=coordinator,
+        all_components=[],
+        applied_data=dict(data),
+        applied_options=dict(options),
+        catalogue_cache=mock.Mock(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_apply_options_in_place():
+    """Test that changed options update the running client and coordinator without a reload."""
+    data = {CONF_HOST: "sma.local"}
+    old_options = {
+        OPT_SENSOR_CHANNELS: ["Measurement.GridMs.TotW@Plant:1"],
+        OPT_UPDATE_INTERVAL: 30,
+        OPT_REQUEST_TIMEOUT: 10,
+    }
+    new_options = {
+        OPT_SENSOR_CHANNELS: [
+            "Measurement.GridMs.TotW@Plant:1",
+            "Measurement.Bat.ChaStt@Plant:1",
+        ],
+        OPT_UPDATE_INTERVAL: 15,
+        OPT_REQUEST_TIMEOUT: 5,
+    }
+    entry_data = create_entry_data(data, old_options)
+    entry = mock.Mock(entry_id="entry", data=data, options=new_options)
+
+    assert await _async_apply_options(mock.Mock(), entry, entry_data)
+
+    assert entry_data.applied_options == new_options
+    assert entry_data.client.request_timeout == 5
+
+    coordinator = entry_data.coordinator
+    coordinator.set_channels.assert_called_once_with(new_options[OPT_SENSOR_CHANNELS])
+    assert coordinator.set_tiers.call_args.args[0] == 15
+    coordinator.async_refresh.assert_awaited_once()
+    coordinator.async_start_high_frequency.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_apply_options_needs_reload():
+    """Test that a changed connection is not applied in place."""
+    options = {OPT_UPDATE_INTERVAL: 30}
+    entry_data = create_entry_data({CONF_HOST: "sma.local"}, options)
+    entry = mock.Mock(entry_id="entry", data={CONF_HOST: "sma2.local"}, options=options)
+
+    assert not await _async_apply_options(mock.Mock(), entry, entry_data)
+
+    entry_data.coordinator.async_refresh.assert_not_awaited()
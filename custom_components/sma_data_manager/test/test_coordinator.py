@@ -0,0 +1,29 @@
+"""unit test for the SMA update coordinator."""
+from unittest import mock
+
+from ..coordinator import SMAUpdateCoordinator
+
+
+def create_coordinator(channel_fqids: list[str]) -> SMAUpdateCoordinator:
+    """Create a coordinator for the channels, with a mocked client."""
+    return SMAUpdateCoordinator(
+        hass=mock.Mock(),
+        client=mock.Mock(host="sma.local"),
+        channel_fqids=channel_fqids,
+        update_interval_seconds=30,
+    )
+
+
+def test_night_pauses_pv_channels_only():
+    """Test that only known PV channels are paused at night, not unknown DC channels."""
+    pv_power = "Measurement.GridMs.TotW.Pv@Plant:1"
+    dc_voltage = "Measurement.DcMs.Vol[]@Plant:1"
+    unknown_dc = "Measurement.DcMs.Unknown@Plant:1"
+    grid_power = "Measurement.GridMs.TotW@Plant:1"
+    coordinator = create_coordinator([pv_power, dc_voltage, unknown_dc, grid_power])
+
+    night = mock.Mock(is_daylight=mock.Mock(return_value=False))
+    coordinator.set_daylight_window(night, night_update_interval=0)
+
+    assert coordinator.is_night
+    assert coordinator.scheduler.paused == {pv_power, dc_voltage}
@@ -0,0 +1,102 @@
+"""unit test for the HTTP sessions of SMA hosts."""
+from unittest import mock
+import pytest
+
+from ..const import CONF_VERIFY_SSL, DOMAIN
+from ..session import (
+    async_find_host_resolver,
+    async_get_host_limiter,
+    async_get_host_session,
+    async_release_host,
+)
+
+
+def create_hass() -> mock.Mock:
+    """Create a minimal Home Assistant mock with an empty data dict."""
+    return mock.Mock(data={})
+
+
+def add_loaded_entry(hass: mock.Mock, entry_id: str, host: str, verify_ssl: bool) -> None:
+    """Add the data of a loaded entry using a host."""
+    hass.data.setdefault(DOMAIN, {})[entry_id] = mock.Mock(
+        client=mock.Mock(host=host),
+        applied_data={CONF_VERIFY_SSL: verify_ssl},
+    )
+
+
+@pytest.mark.asyncio
+async def test_session_shared_per_host():
+    """Test that clients of the same host share a session."""
+    hass = create_hass()
+
+    session = async_get_host_session(hass, "a.local", False)
+    assert async_get_host_session(hass, "a.local", False) is session
+    assert async_get_host_session(hass, "b.local", False) is not session
+
+    await async_release_host(hass, "a.local")
+    await async_release_host(hass, "b.local")
+
+
+@pytest.mark.asyncio
+async def test_release_host_closes_unused_sessions():
+    """Test that sessions are closed once no loaded entry uses them."""
+    hass = create_hass()
+    add_loaded_entry(hass, "entry-1", "a.local", False)
+    used = async_get_host_session(hass, "a.local", False)
+    unused = async_get_host_session(hass, "a.local", True)
+
+    # e.g. after an options flow used the host with other ssl settings
+    await async_release_host(hass, "a.local")
+    assert not used.closed
+    assert unused.closed
+
+    # the last entry of the host was unloaded
+    hass.data[DOMAIN].pop("entry-1")
+    await async_release_host(hass, "a.local")
+    assert used.closed
+
+    # a new session is created on demand
+    session = async_get_host_session(hass, "a.local", False)
+    assert session is not used
+    assert not session.closed
+    await async_release_host(hass, "a.local")
+
+
+@pytest.mark.asyncio
+async def test_limiter_shared_per_host_and_dropped():
+    """Test that clients of a host share a rate limiter until no loaded entry uses the host."""
+    hass = create_hass()
+    add_loaded_entry(hass, "entry-1", "a.local", True)
+
+    limiter = async_get_host_limiter(hass, "a.local")
+    limiter.configure(rate=5, burst=10)
+    assert async_get_host_limiter(hass, "a.local") is limiter
+    assert async_get_host_limiter(hass, "b.local") is not limiter
+
+    # still used by the loaded entry
+    await async_release_host(hass, "a.local")
+    assert async_get_host_limiter(hass, "a.local") is limiter
+
+    # dropped with the last entry, the next one starts unlimited
+    hass.data[DOMAIN].pop("entry-1")
+    await async_release_host(hass, "a.local")
+    assert async_get_host_limiter(hass, "a.local").rate == 0
+
+
+@pytest.mark.asyncio
+async def test_resolver_found_without_creating_and_dropped():
+    """Test that looking up a resolver does not create it, and that it is dropped with the last entry."""
+    hass = create_hass()
+    assert async_find_host_resolver(hass, "a.local") is None
+    assert async_find_host_resolver(hass, "a.local") is None
+
+    add_loaded_entry(hass, "entry-1", "a.local", False)
+    async_get_host_session(hass, "a.local", False)
+    resolver = async_find_host_resolver(hass, "a.local")
+    assert resolver is not None
+
+    hass.data[DOMAIN].pop("entry-1")
+    with mock.patch.object(resolver, "close", mock.AsyncMock()) as close:
+        await async_release_host(hass, "a.local")
+    close.assert_awaited_once()
+    assert async_find_host_resolver(hass, "a.local") is None
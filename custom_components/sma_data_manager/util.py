@@ -1,24 +1,46 @@
 """integration utilities."""
+import uuid
 
 from typing import TYPE_CHECKING
+
+from .sma.model import LiveMeasurementQueryItem
+
 if TYPE_CHECKING:
     from .coordinator import SMAUpdateCoordinator
+    from .sma.catalogue import ChannelCatalogueCache
+    from .sma.client import SMAApiClient
     from .sma.model import ComponentInfo
 
 class SMAEntryData:
     """data stored in domain entry of hass.data."""
 
+    client: "SMAApiClient"
     coordinator: "SMAUpdateCoordinator"
     all_components: list["ComponentInfo"]
 
+    # config entry data and options the entry is currently running with
+    applied_data: dict
+    applied_options: dict
+
+    # channel catalogue shown in the options flow
+    catalogue_cache: "ChannelCatalogueCache"
+
     def __init__(
         self,
+        client: "SMAApiClient",
         coordinator: "SMAUpdateCoordinator",
         all_components: list["ComponentInfo"],
+        applied_data: dict,
+        applied_options: dict,
+        catalogue_cache: "ChannelCatalogueCache",
     ) -> None:
         """Initialize."""
+        self.client = client
         self.coordinator = coordinator
         self.all_components = all_components
+        self.applied_data = applied_data
+        self.applied_options = applied_options
+        self.catalogue_cache = catalogue_cache
 
 
 def channel_parts_to_fqid(component_id: str, channel_id: str) -> str:
@@ -43,3 +65,28 @@ def channel_fqid_to_parts(fqid: str) -> (str, str):
         raise ValueError(f"Invalid channel fqid: {fqid}")
 
     return (split[1], split[0])
+
+
+def channel_fqids_to_query(fqids: list[str]) -> list[LiveMeasurementQueryItem]:
+    """Convert channel fqids (channel@component) to a live measurement query.
+
+    :param fqids: The channel fqids to query.
+    :return: a query item for each channel fqid, in order.
+    """
+    query = []
+    for fqid in fqids:
+        (component_id, channel_id) = channel_fqid_to_parts(fqid)
+        query.append(
+            LiveMeasurementQueryItem(component_id=component_id, channel_id=channel_id)
+        )
+    return query
+
+
+def component_device_id(entry_id: str, component_id: str) -> str:
+    """Get the (stable) device id of a component in a config entry.
+
+    :param entry_id: The config entry id.
+    :param component_id: The component_id of the component.
+    :return: the device id used for the device registry identifier.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_X500, f"{entry_id}{component_id}"))